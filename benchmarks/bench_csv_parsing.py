@@ -0,0 +1,111 @@
+"""Benchmark DOF CSV parsing: row-wise DataFrame.apply (previous implementation) vs columnar parsing"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "qgis3_plugin"))
+
+from faa_dof_manager.load_dof import get_csv_columns, prepare_csv  # pylint: disable=wrong-import-position
+from synthetic_dof import obstacle_type_mapping, write_csv  # pylint: disable=wrong-import-position
+
+# Same as dof.dof_conf settings for file_type = 'csv'
+CSV_CONFIG = {
+    "csv_table_map": {
+        "VERIFIED STATUS": "verif_status_code",
+        "CITY": "city",
+        "QUANTITY": "quantity",
+        "AGL": "agl",
+        "AMSL": "amsl",
+        "LIGHTING": "lighting_code",
+        "MARKING": "marking_code",
+        "FAA STUDY": "faa_study_number",
+        "ACTION": "action",
+        "JDATE": "julian_date"
+    },
+    "coordinates_map": {
+        "LATDEC": "lat",
+        "LONDEC": "lon"
+    },
+    "parsed_map": {
+        "oas_ident": "OAS",
+        "accuracy": "ACCURACY",
+        "obstacle_type": "TYPE"
+    }
+}
+
+
+def prepare_csv_rowwise(
+        df: pd.DataFrame,
+        csv_config: dict[str, Any],
+        mapping: dict[str, int]
+) -> pd.DataFrame:
+    """Previous, row-wise implementation of CSV data preparation (reference for speed and output)"""
+    df = df.apply(lambda col: col.str.strip() if col.dtype == "object" else col)
+    df.rename(columns=csv_config["csv_table_map"], inplace=True)
+    df.rename(columns=csv_config["coordinates_map"], inplace=True)
+
+    oas_code_column = csv_config["parsed_map"]["oas_ident"]
+    df["oas_code"] = df.apply(lambda row: row[oas_code_column].split("-")[0], axis=1)
+    df["obst_number"] = df.apply(lambda row: row[oas_code_column].split("-")[1], axis=1)
+    df.drop(columns=[oas_code_column], inplace=True)
+
+    accuracy_column = csv_config["parsed_map"]["accuracy"]
+    accuracy_invalid_mask = df[accuracy_column].str.strip().str.len() != 2
+    df = df.drop(df[accuracy_invalid_mask].index)
+    df["hor_acc_code"] = df.apply(lambda row: int(row[accuracy_column][0]), axis=1)
+    df["vert_acc_code"] = df.apply(lambda row: row[accuracy_column][1], axis=1)
+    df.drop(columns=[accuracy_column], inplace=True)
+
+    obstacle_type_column = csv_config["parsed_map"]["obstacle_type"]
+    df["type_id"] = df.apply(lambda row: mapping[row[obstacle_type_column]], axis=1)
+    df.drop(columns=[obstacle_type_column], inplace=True)
+    return df
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse script arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-r",
+        "--rows",
+        type=int,
+        required=False,
+        default=500_000,
+        help="Number of obstacles in synthetic CSV file, default: 500000"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main script loop"""
+    args = parse_args()
+    mapping = obstacle_type_mapping()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "DOF.csv"
+        write_csv(path, args.rows)
+        df = pd.read_csv(path, usecols=get_csv_columns(CSV_CONFIG), skipinitialspace=True)
+
+    start = time.perf_counter()
+    expected = prepare_csv_rowwise(df.copy(), CSV_CONFIG, mapping)
+    rowwise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = prepare_csv(df.copy(), CSV_CONFIG, mapping)
+    columnar_time = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(actual, expected)
+    print(f"rows:     {args.rows}")
+    print(f"row-wise: {rowwise_time:.2f} s")
+    print(f"columnar: {columnar_time:.2f} s")
+    print(f"speedup:  {rowwise_time / columnar_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
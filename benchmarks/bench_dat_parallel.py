@@ -0,0 +1,77 @@
+"""Benchmark DOF DAT parsing: serial read_fwf vs parsing byte ranges in 1..N worker processes"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "qgis3_plugin"))
+
+from faa_dof_manager.load_dof import (  # pylint: disable=wrong-import-position
+    read_dat_chunks,
+    read_dat_chunks_parallel
+)
+from synthetic_dof import write_dat  # pylint: disable=wrong-import-position
+
+# Same as dof.dof_conf settings for file_type = 'dat'
+DAT_FIELDS = {
+    "oas_code": [1, 2],
+    "obst_number": [4, 9],
+    "verif_status_code": [11, 11],
+    "city": [19, 34],
+    "lat_src": [36, 47],
+    "lon_src": [49, 61],
+    "obst_type": [63, 80],
+    "quantity": [82, 82],
+    "agl": [84, 88],
+    "amsl": [90, 94],
+    "lighting_code": [96, 96],
+    "hor_acc_code": [98, 98],
+    "vert_acc_code": [100, 100],
+    "marking_code": [102, 102],
+    "faa_study_number": [104, 117],
+    "action": [119, 119],
+    "julian_date": [121, 127]
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse script arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000, help="Number of obstacles in synthetic DAT file")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="Maximum number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Number of rows in chunk")
+    return parser.parse_args()
+
+
+def main():
+    """Main script loop"""
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "DOF.dat"
+        write_dat(path, args.rows)
+
+        start = time.perf_counter()
+        expected = list(read_dat_chunks(path, DAT_FIELDS, chunk_size=args.chunk_size))
+        serial_time = time.perf_counter() - start
+        print(f"rows:      {args.rows}")
+        print(f"serial:    {serial_time:.2f} s")
+
+        for workers in range(1, args.max_workers + 1):
+            start = time.perf_counter()
+            actual = list(read_dat_chunks_parallel(path, DAT_FIELDS, chunk_size=args.chunk_size, workers=workers))
+            parallel_time = time.perf_counter() - start
+
+            assert len(actual) == len(expected)
+            for actual_chunk, expected_chunk in zip(actual, expected):
+                pd.testing.assert_frame_equal(actual_chunk, expected_chunk)
+            print(f"workers {workers:>2}: {parallel_time:.2f} s, speedup {serial_time / parallel_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark DOF DAT readers: pandas.read_fwf vs memory-mapped scanner (throughput and peak RSS).
+Each reader is run in a fresh interpreter, so peak RSS of one reader does not affect the other.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "qgis3_plugin"))
+
+from faa_dof_manager.load_dof import (  # pylint: disable=wrong-import-position
+    DAT_HEADER_ROWS,
+    get_dat_colspecs,
+    read_dat_chunks
+)
+from faa_dof_manager.dat_scanner import read_dat_chunks_mmap  # pylint: disable=wrong-import-position
+from bench_dat_parallel import DAT_FIELDS  # pylint: disable=wrong-import-position
+from synthetic_dof import write_dat  # pylint: disable=wrong-import-position
+
+ENGINES = ("read_fwf", "mmap")
+
+
+def peak_rss_mb() -> float | None:
+    """Return peak resident set size of the process (MB), None if not available (Windows)"""
+    status = Path("/proc/self/status")
+    if status.exists():
+        # Linux: ru_maxrss is inherited from parent process across exec, VmHWM is not
+        for line in status.read_text(encoding="utf-8").splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: kilobytes, macOS: bytes
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def read(path: Path, engine: str, chunk_size: int) -> dict[str, float | None]:
+    """Read all chunks of the file.
+
+    :param path: path to the DAT file
+    :param engine: DAT reader engine
+    :param chunk_size: number of rows in chunk
+    :return: number of rows, time (seconds), peak RSS (MB)
+    """
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    if engine == "mmap":
+        chunks = read_dat_chunks_mmap(path=path,
+                                      colspecs=get_dat_colspecs(DAT_FIELDS),
+                                      integer_fields=[],
+                                      skiprows=DAT_HEADER_ROWS,
+                                      chunk_size=chunk_size)
+    else:
+        chunks = read_dat_chunks(path=path, dat_fields=DAT_FIELDS, chunk_size=chunk_size)
+    rows = sum(len(chunk) for chunk in chunks)
+    return {
+        "rows": rows,
+        "seconds": time.perf_counter() - start,
+        "rss_before": rss_before,
+        "rss_peak": peak_rss_mb()
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse script arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000, help="Number of obstacles in synthetic DAT file")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Number of rows in chunk")
+    parser.add_argument("--engine", choices=ENGINES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    """Main script loop"""
+    args = parse_args()
+    if args.engine:
+        # Single measurement in a fresh interpreter
+        print(json.dumps(read(args.path, args.engine, args.chunk_size)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "DOF.dat"
+        write_dat(path, args.rows)
+        size_mb = path.stat().st_size / 1024 ** 2
+        print(f"rows: {args.rows}, file size: {size_mb:.1f} MB")
+        for engine in ENGINES:
+            result = subprocess.run(
+                [sys.executable, __file__, "--engine", engine, "--path", str(path),
+                 "--chunk-size", str(args.chunk_size)],
+                capture_output=True, text=True, check=True
+            )
+            r = json.loads(result.stdout)
+            rss = (f"peak RSS {r['rss_peak']:.0f} MB (+{r['rss_peak'] - r['rss_before']:.0f} MB while reading)"
+                   if r["rss_peak"] is not None else "peak RSS n/a")
+            print(f"{engine:>8}: {r['seconds']:.2f} s, {r['rows'] / r['seconds']:,.0f} rows/s, "
+                  f"{size_mb / r['seconds']:.1f} MB/s, {rss}")
+
+
+if __name__ == "__main__":
+    main()
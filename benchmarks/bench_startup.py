@@ -0,0 +1,120 @@
+"""Benchmark plugin startup: import time of plugin module and time to first dialog show.
+Heavy modules (pandas, geopandas, ...) must not be imported at startup, they are imported when DOF import starts.
+Exit code is 1 if any heavy module is imported at startup or startup takes longer than --max-import-ms.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PLUGIN_PATH = Path(__file__).resolve().parents[1] / "qgis3_plugin"
+# Modules imported only when DOF import starts
+HEAVY_MODULES = ["numpy", "pandas", "geopandas", "shapely", "pyproj", "sqlalchemy"]
+
+# Executed in a fresh interpreter, so modules imported by previous measurements are not cached
+IMPORT_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {plugin_path!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+DIALOG_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {plugin_path!r})
+from qgis.core import QgsApplication
+app = QgsApplication([], True)
+app.initQgis()
+start = time.perf_counter()
+from faa_dof_manager.db_utils import DBUtils
+from faa_dof_manager.db_values_map import DBValuesMapping
+from faa_dof_manager.faa_dof_manager_dialog import FAADOFManagerDialog
+db_utils = DBUtils(host="", database="", user="", password="")
+dlg = FAADOFManagerDialog(db_mapping=DBValuesMapping(db_utils=db_utils), db_utils=db_utils, layers=None)
+dlg.set_single_mode_drop_down_lists()
+dlg.show()
+app.processEvents()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_script(script: str) -> dict | None:
+    """Run measurement script in a fresh interpreter.
+
+    :param script: measurement script
+    :return: measurement (seconds, heavy modules imported), None if script failed
+    """
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "measurement failed")
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(script: str, repeat: int) -> dict | None:
+    """Return best (minimum) time of repeated measurements.
+
+    :param script: measurement script
+    :param repeat: number of measurements
+    :return: best measurement, None if script failed
+    """
+    results = []
+    for _ in range(repeat):
+        result = run_script(script)
+        if result is None:
+            return None
+        results.append(result)
+    return min(results, key=lambda r: r["seconds"])
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse script arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--module",
+        default="faa_dof_manager.faa_dof_manager",
+        help="Module imported by QGIS when plugin is loaded"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements (best is reported)")
+    parser.add_argument("--max-import-ms", type=float, help="Fail if module import takes longer")
+    return parser.parse_args()
+
+
+def main():
+    """Main script loop"""
+    args = parse_args()
+    failed = False
+
+    result = measure(IMPORT_SCRIPT.format(plugin_path=str(PLUGIN_PATH), module=args.module, heavy=HEAVY_MODULES),
+                     args.repeat)
+    if result is None:
+        print(f"import {args.module}: cannot import (QGIS Python environment required)")
+        sys.exit(1)
+    print(f"import {args.module}: {result['seconds'] * 1000:.0f} ms")
+    if result["heavy"]:
+        print(f"  heavy modules imported at startup: {', '.join(result['heavy'])}")
+        failed = True
+    if args.max_import_ms is not None and result["seconds"] * 1000 > args.max_import_ms:
+        print(f"  slower than {args.max_import_ms:.0f} ms")
+        failed = True
+
+    result = measure(DIALOG_SCRIPT.format(plugin_path=str(PLUGIN_PATH), heavy=HEAVY_MODULES), args.repeat)
+    if result is None:
+        print("first dialog show: skipped (QGIS application cannot be started)")
+    else:
+        print(f"first dialog show: {result['seconds'] * 1000:.0f} ms")
+        if result["heavy"]:
+            print(f"  heavy modules imported by dialog: {', '.join(result['heavy'])}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Generate synthetic DOF (Digital Obstacle File) data files in CSV/DAT format for benchmarks"""
+from __future__ import annotations
+
+import argparse
+import random
+from pathlib import Path
+
+OAS_CODES = ["01", "02", "04", "05", "06", "12", "13", "36", "48", "CA", "MX", "PR"]
+OBSTACLE_TYPES = ["ANTENNA", "BLDG", "CRANE", "POLE", "STACK", "T-L TWR", "TOWER", "WINDMILL"]
+CSV_HEADER = ("OAS,VERIFIED STATUS,COUNTRY,STATE,CITY,LATDEC,LONDEC,DMSLAT,DMSLON,TYPE,QUANTITY,"
+              "AGL,AMSL,LIGHTING,ACCURACY,MARKING,FAA STUDY,ACTION,JDATE")
+DAT_HEADER = [
+    "  CURRENCY DATE = 10/13/24",
+    "",
+    "OAS#    V CITY             LATITUDE     LONGITUDE    OBSTACLE            # AGL   AMSL  LT H V M FAA#           ACTION",
+    "------------------------------------------------------------------------------------------------------------------------------",
+]
+
+
+def obstacle_type_mapping() -> dict[str, int]:
+    """Return mapping between synthetic obstacle types and obstacle type ids.
+
+    :return: obstacle type mapping as used by loaders
+    """
+    return {obst_type: obst_id for obst_id, obst_type in enumerate(OBSTACLE_TYPES, start=1)}
+
+
+def to_dms(dd: float, hemispheres: str, degree_width: int) -> str:
+    """Return coordinate in DOF DMS format, example: 32 00 04.00N.
+
+    :param dd: coordinate in decimal degrees
+    :param hemispheres: hemisphere letters (positive, negative), example: NS
+    :param degree_width: number of digits for degrees
+    :return: coordinate in DMS format
+    """
+    h = hemispheres[0] if dd >= 0 else hemispheres[1]
+    dd = abs(dd)
+    d = int(dd)
+    m = int((dd - d) * 60)
+    s = round((dd - d - m / 60) * 3600, 2)
+    if s >= 60:
+        s = 59.99
+    return f"{d:0{degree_width}d} {m:02d} {s:05.2f}{h}"
+
+
+def generate_rows(rows: int, seed: int = 0) -> list[dict[str, object]]:
+    """Return synthetic obstacle records.
+
+    :param rows: number of records
+    :param seed: random seed (same seed generates same data)
+    :return: obstacle records
+    """
+    rnd = random.Random(seed)
+    records = []
+    for i in range(rows):
+        lat = round(rnd.uniform(18, 65), 6)
+        lon = round(rnd.uniform(-170, -65), 6)
+        agl = rnd.randint(20, 2000)
+        records.append({
+            "oas_code": rnd.choice(OAS_CODES),
+            "obst_number": f"{i % 1000000:06d}",
+            "verif_status": rnd.choice("OU"),
+            "city": rnd.choice(["ACKERVILLE", "BIRMINGHAM", "SAN JUAN", "NEW YORK", "HOUSTON"]),
+            "lat": lat,
+            "lon": lon,
+            "obst_type": rnd.choice(OBSTACLE_TYPES),
+            "quantity": rnd.randint(1, 9),
+            "agl": agl,
+            "amsl": agl + rnd.randint(0, 5000),
+            "lighting": rnd.choice("RDHMSFCWLNU"),
+            "hor_acc": rnd.randint(1, 9),
+            "vert_acc": rnd.choice("ABCDEFGHI"),
+            "marking": rnd.choice("PWMFSNU"),
+            "faa_study": f"2013ASO{rnd.randint(0, 99999):05d}OE",
+            "action": rnd.choice("ACD"),
+            "jdate": f"20{rnd.randint(10, 24)}{rnd.randint(1, 365):03d}",
+        })
+    return records
+
+
+def write_csv(path: Path, rows: int, seed: int = 0) -> None:
+    """Write synthetic DOF CSV file.
+
+    :param path: output file path
+    :param rows: number of obstacles
+    :param seed: random seed
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(CSV_HEADER + "\n")
+        for r in generate_rows(rows, seed):
+            f.write(
+                f"{r['oas_code']}-{r['obst_number']},{r['verif_status']},US,XX,{r['city']},"
+                f"{r['lat']},{r['lon']},{to_dms(r['lat'], 'NS', 2)},{to_dms(r['lon'], 'EW', 3)},"
+                f"{r['obst_type']},{r['quantity']},{r['agl']},{r['amsl']},{r['lighting']},"
+                f"{r['hor_acc']}{r['vert_acc']},{r['marking']},{r['faa_study']},{r['action']},{r['jdate']}\n"
+            )
+
+
+def write_dat(path: Path, rows: int, seed: int = 0) -> None:
+    """Write synthetic DOF DAT (fixed width) file.
+
+    :param path: output file path
+    :param rows: number of obstacles
+    :param seed: random seed
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(DAT_HEADER) + "\n")
+        for r in generate_rows(rows, seed):
+            f.write(
+                f"{r['oas_code']}-{r['obst_number']} {r['verif_status']} US XX {r['city']:<16} "
+                f"{to_dms(r['lat'], 'NS', 2)} {to_dms(r['lon'], 'EW', 3)} {r['obst_type']:<18} "
+                f"{r['quantity']} {r['agl']:05d} {r['amsl']:05d} {r['lighting']} {r['hor_acc']} "
+                f"{r['vert_acc']} {r['marking']} {r['faa_study']} {r['action']} {r['jdate']}\n"
+            )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse script arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["csv", "dat"],
+        required=True,
+        help="Output file format"
+    )
+    parser.add_argument(
+        "-r",
+        "--rows",
+        type=int,
+        required=False,
+        default=500_000,
+        help="Number of obstacles, default: 500000"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        required=True,
+        help="Path to the output file"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main script loop"""
+    args = parse_args()
+    if args.format == "csv":
+        write_csv(Path(args.output), args.rows)
+    else:
+        write_dat(Path(args.output), args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""add obstacle indexes
+
+Revision ID: 3c7a9e51d2b4
+Revises: f88636747b86
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7a9e51d2b4'
+down_revision: Union[str, None] = 'f88636747b86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Foreign key columns used by vw_obstacle joins
+FOREIGN_KEY_COLUMNS = [
+    "verif_status_code",
+    "type_id",
+    "lighting_code",
+    "marking_code",
+    "hor_acc_code",
+    "vert_acc_code"
+]
+
+
+def upgrade() -> None:
+    # Primary key (oas_code, obst_number) is created with the obstacle table
+    op.create_index(
+        "idx_obstacle_natural_key",
+        "obstacle",
+        ["oas_code", "obst_number", "valid_from"],
+        unique=True,
+        schema=SCHEMA
+    )
+    op.create_index(
+        "idx_obstacle_location",
+        "obstacle",
+        ["location"],
+        postgresql_using="gist",
+        schema=SCHEMA
+    )
+    for column in FOREIGN_KEY_COLUMNS:
+        op.create_index(
+            f"idx_obstacle_{column}",
+            "obstacle",
+            [column],
+            schema=SCHEMA
+        )
+
+
+def downgrade() -> None:
+    for column in FOREIGN_KEY_COLUMNS:
+        op.drop_index(f"idx_obstacle_{column}", table_name="obstacle", schema=SCHEMA)
+    op.drop_index("idx_obstacle_location", table_name="obstacle", schema=SCHEMA)
+    op.drop_index("idx_obstacle_natural_key", table_name="obstacle", schema=SCHEMA)
@@ -0,0 +1,43 @@
+"""add import log
+
+Revision ID: 5d2e8b7a1c40
+Revises: 3c7a9e51d2b4
+Create Date: 2026-10-18 13:05:47.218306
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8b7a1c40'
+down_revision: Union[str, None] = '3c7a9e51d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_log",
+        sa.Column("id", sa.INTEGER, primary_key=True),
+        sa.Column("file_type", sa.CHAR(3), nullable=False),
+        sa.Column("file_name", sa.VARCHAR(255), nullable=False),
+        sa.Column("source_hash", sa.CHAR(64), nullable=False),
+        sa.Column("file_size", sa.BIGINT, nullable=True),
+        sa.Column("currency_date", sa.DATE, nullable=True),
+        sa.Column("rows_read", sa.INTEGER, nullable=False),
+        sa.Column("rows_loaded", sa.INTEGER, nullable=False),
+        sa.Column("duration_seconds", sa.NUMERIC(10, 3), nullable=False),
+        sa.Column("import_user", sa.VARCHAR(63), nullable=False, server_default=sa.text("current_user")),
+        sa.Column("import_timestamp", sa.TIMESTAMP, nullable=False, server_default=sa.text("now()")),
+        schema=SCHEMA
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("import_log", schema=SCHEMA)
@@ -0,0 +1,66 @@
+"""add daily change file settings
+
+Revision ID: 7b1f4c2e9a63
+Revises: 5d2e8b7a1c40
+Create Date: 2026-10-18 14:21:09.540172
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1f4c2e9a63'
+down_revision: Union[str, None] = '5d2e8b7a1c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    metadata = sa.MetaData()
+    tbl_dof_conf = sa.Table("dof_conf", metadata, schema=SCHEMA, autoload_with=bind)
+    op.bulk_insert(
+        tbl_dof_conf,
+        [
+            {
+                "file_type": "ddf",
+                "revision_date": "2026-10-18",
+                "settings": {
+                    "fields": {
+                        "oas_code": [1, 2],
+                        "obst_number": [4, 9],
+                        "verif_status_code": [11, 11],
+                        "city": [19, 34],
+                        "lat_src": [36, 47],
+                        "lon_src": [49, 61],
+                        "obst_type": [63, 80],
+                        "quantity": [82, 82],
+                        "agl": [84, 88],
+                        "amsl": [90, 94],
+                        "lighting_code": [96, 96],
+                        "hor_acc_code": [98, 98],
+                        "vert_acc_code": [100, 100],
+                        "marking_code": [102, 102],
+                        "faa_study_number": [104, 117],
+                        "action": [119, 119],
+                        "julian_date": [121, 127]
+                    },
+                    "actions": {
+                        "added": "A",
+                        "changed": "C",
+                        "dismantled": "D"
+                    }
+                }
+            }
+        ]
+    )
+
+
+def downgrade() -> None:
+    op.execute(f"DELETE FROM {SCHEMA}.dof_conf WHERE file_type = 'ddf';")
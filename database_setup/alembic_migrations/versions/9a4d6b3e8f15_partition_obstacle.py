@@ -0,0 +1,106 @@
+"""partition obstacle table by oas code
+
+Revision ID: 9a4d6b3e8f15
+Revises: 7b1f4c2e9a63
+Create Date: 2026-10-18 15:42:18.903611
+
+"""
+import os
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d6b3e8f15'
+down_revision: Union[str, None] = '7b1f4c2e9a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Column, referenced table (column) of obstacle table foreign keys
+FOREIGN_KEYS = {
+    "oas_code": ("oas", "code"),
+    "verif_status_code": ("verif_status", "code"),
+    "type_id": ("obstacle_type", "id"),
+    "lighting_code": ("lighting", "code"),
+    "marking_code": ("marking", "code"),
+    "hor_acc_code": ("horizontal_acc", "code"),
+    "vert_acc_code": ("vertical_acc", "code")
+}
+# Foreign key columns used by vw_obstacle joins
+FOREIGN_KEY_COLUMNS = [
+    "verif_status_code",
+    "type_id",
+    "lighting_code",
+    "marking_code",
+    "hor_acc_code",
+    "vert_acc_code"
+]
+
+
+def get_obstacle_view_sql() -> str:
+    """Return statement creating vw_obstacle view (last statement of ddl_views.sql)"""
+    sql_views_script = Path().resolve() / "sql" / "ddl_views.sql"
+    with open(sql_views_script, "r", encoding="utf-8") as f:
+        content = f.read()
+    return content[content.index("create or replace view dof.vw_obstacle"):]
+
+
+def create_constraints_indexes() -> None:
+    """Create obstacle table primary key, foreign keys and indexes (the same as before partitioning)"""
+    op.create_primary_key("obstacle_pkey", "obstacle", ["oas_code", "obst_number"], schema=SCHEMA)
+    for column, (referred_table, referred_column) in FOREIGN_KEYS.items():
+        op.create_foreign_key(f"obstacle_{column}_fkey", "obstacle", referred_table, [column], [referred_column],
+                              source_schema=SCHEMA, referent_schema=SCHEMA)
+    op.create_index(
+        "idx_obstacle_natural_key",
+        "obstacle",
+        ["oas_code", "obst_number", "valid_from"],
+        unique=True,
+        schema=SCHEMA
+    )
+    op.create_index(
+        "idx_obstacle_location",
+        "obstacle",
+        ["location"],
+        postgresql_using="gist",
+        schema=SCHEMA
+    )
+    for column in FOREIGN_KEY_COLUMNS:
+        op.create_index(
+            f"idx_obstacle_{column}",
+            "obstacle",
+            [column],
+            schema=SCHEMA
+        )
+
+
+def upgrade() -> None:
+    op.execute(f"DROP VIEW {SCHEMA}.vw_obstacle;")
+    op.execute(f"ALTER TABLE {SCHEMA}.obstacle RENAME TO obstacle_unpartitioned;")
+    op.execute(f"CREATE TABLE {SCHEMA}.obstacle (LIKE {SCHEMA}.obstacle_unpartitioned INCLUDING DEFAULTS)\n"
+               f"PARTITION BY LIST (oas_code);")
+    op.execute(f"CREATE TABLE {SCHEMA}.obstacle_default PARTITION OF {SCHEMA}.obstacle DEFAULT;")
+    # Partitions of all oas codes are created before obstacles are copied, so rows are not moved between partitions
+    sql_partitions_script = Path().resolve() / "sql" / "ddl_partitions.sql"
+    with open(sql_partitions_script, "r", encoding="utf-8") as f:
+        op.execute(f.read())
+    op.execute(f"INSERT INTO {SCHEMA}.obstacle SELECT * FROM {SCHEMA}.obstacle_unpartitioned;")
+    op.drop_table("obstacle_unpartitioned", schema=SCHEMA)
+    # Indexes on partitioned table are created on each partition (also on partitions created later)
+    create_constraints_indexes()
+    op.execute(get_obstacle_view_sql())
+
+
+def downgrade() -> None:
+    op.execute(f"DROP VIEW {SCHEMA}.vw_obstacle;")
+    op.execute(f"ALTER TABLE {SCHEMA}.obstacle RENAME TO obstacle_partitioned;")
+    op.execute(f"CREATE TABLE {SCHEMA}.obstacle (LIKE {SCHEMA}.obstacle_partitioned INCLUDING DEFAULTS);")
+    op.execute(f"INSERT INTO {SCHEMA}.obstacle SELECT * FROM {SCHEMA}.obstacle_partitioned;")
+    op.drop_table("obstacle_partitioned", schema=SCHEMA)
+    op.execute(f"DROP FUNCTION {SCHEMA}.create_obstacle_partitions();")
+    create_constraints_indexes()
+    op.execute(get_obstacle_view_sql())
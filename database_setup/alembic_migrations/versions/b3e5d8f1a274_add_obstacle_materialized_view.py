@@ -0,0 +1,32 @@
+"""add obstacle materialized view
+
+Revision ID: b3e5d8f1a274
+Revises: 9a4d6b3e8f15
+Create Date: 2026-10-18 16:30:52.117840
+
+"""
+import os
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e5d8f1a274'
+down_revision: Union[str, None] = '9a4d6b3e8f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sql_script = Path().resolve() / "sql" / "ddl_materialized_views.sql"
+    with open(sql_script, "r", encoding="utf-8") as f:
+        op.execute(f.read())
+
+
+def downgrade() -> None:
+    op.execute(f"DROP FUNCTION IF EXISTS {SCHEMA}.refresh_mv_obstacle(boolean);")
+    op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {SCHEMA}.mv_obstacle;")
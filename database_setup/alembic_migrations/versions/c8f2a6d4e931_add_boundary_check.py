@@ -0,0 +1,33 @@
+"""add subdivided boundaries and location check report
+
+Revision ID: c8f2a6d4e931
+Revises: b3e5d8f1a274
+Create Date: 2026-10-18 17:14:26.653091
+
+"""
+import os
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a6d4e931'
+down_revision: Union[str, None] = 'b3e5d8f1a274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sql_script = Path().resolve() / "sql" / "ddl_boundaries.sql"
+    with open(sql_script, "r", encoding="utf-8") as f:
+        op.execute(f.read())
+
+
+def downgrade() -> None:
+    op.execute(f"DROP FUNCTION IF EXISTS {SCHEMA}.refresh_oas_boundary_subdivided(integer);")
+    op.drop_table("import_location_mismatch", schema=SCHEMA)
+    op.drop_table("oas_boundary_subdivided", schema=SCHEMA)
@@ -0,0 +1,32 @@
+"""add simplified boundaries
+
+Revision ID: d1b7e3c9f582
+Revises: c8f2a6d4e931
+Create Date: 2026-10-18 17:58:40.281964
+
+"""
+import os
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1b7e3c9f582'
+down_revision: Union[str, None] = 'c8f2a6d4e931'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sql_script = Path().resolve() / "sql" / "ddl_boundaries_simplified.sql"
+    with open(sql_script, "r", encoding="utf-8") as f:
+        op.execute(f.read())
+
+
+def downgrade() -> None:
+    op.execute(f"DROP FUNCTION IF EXISTS {SCHEMA}.refresh_oas_boundary_simplified(numeric[]);")
+    op.drop_table("oas_boundary_simplified", schema=SCHEMA)
@@ -0,0 +1,32 @@
+"""add obstacle clearance surfaces
+
+Revision ID: e4a9c2f7b316
+Revises: d1b7e3c9f582
+Create Date: 2026-10-18 19:12:05.517342
+
+"""
+import os
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c2f7b316'
+down_revision: Union[str, None] = 'd1b7e3c9f582'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sql_script = Path().resolve() / "sql" / "ddl_surfaces.sql"
+    with open(sql_script, "r", encoding="utf-8") as f:
+        op.execute(f.read())
+
+
+def downgrade() -> None:
+    op.drop_table("surface_penetration", schema=SCHEMA)
+    op.drop_table("surface", schema=SCHEMA)
@@ -0,0 +1,38 @@
+"""add obstacle worst-case height and horizontal buffer
+
+Revision ID: f2c6d8a4e719
+Revises: e4a9c2f7b316
+Create Date: 2026-10-18 20:03:47.906158
+
+"""
+import os
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+SCHEMA = os.environ.get('DB_SCHEMA')
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d8a4e719'
+down_revision: Union[str, None] = 'e4a9c2f7b316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("obstacle", sa.Column("worst_case_amsl", sa.NUMERIC(7, 2), nullable=True), schema=SCHEMA)
+    op.add_column("obstacle", sa.Column("horizontal_buffer", sa.NUMERIC(8, 1), nullable=True), schema=SCHEMA)
+    # Functions computing the columns, existing obstacles are filled in
+    sql_script = Path().resolve() / "sql" / "ddl_obstacle_buffers.sql"
+    with open(sql_script, "r", encoding="utf-8") as f:
+        op.execute(f.read())
+
+
+def downgrade() -> None:
+    op.execute(f"DROP FUNCTION IF EXISTS {SCHEMA}.refresh_obstacle_buffers(char, char);")
+    op.execute(f"DROP FUNCTION IF EXISTS {SCHEMA}.tolerance_ft(numeric, varchar);")
+    op.drop_column("obstacle", "horizontal_buffer", schema=SCHEMA)
+    op.drop_column("obstacle", "worst_case_amsl", schema=SCHEMA)
@@ -0,0 +1,129 @@
+"""Script to check (EXPLAIN) that obstacle lookups use indexes instead of sequential scans"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Any
+
+from dotenv import load_dotenv
+import psycopg2
+
+# Lookup name, query (parameters are taken from sample obstacle)
+LOOKUPS = {
+    "single obstacle (vw_obstacle)": (
+        "select *\n"
+        "from dof.vw_obstacle\n"
+        "where oas_code = %(oas_code)s\n"
+        "      and obst_number = %(obst_number)s;"
+    ),
+    "obstacles in map extent (location)": (
+        "select oas_code, obst_number\n"
+        "from dof.obstacle\n"
+        "where location && ST_Expand(%(location)s::geometry, 0.1)::geography;"
+    ),
+}
+
+
+def get_sample_obstacle(cur: Any) -> dict[str, Any] | None:
+    """Return key and location of any obstacle, used as lookup parameters.
+
+    :param cur: database cursor
+    :return: lookup parameters, None if obstacle table is empty
+    """
+    cur.execute("select oas_code, obst_number, location\n"
+                "from dof.obstacle\n"
+                "limit 1;")
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return dict(zip(["oas_code", "obst_number", "location"], row))
+
+
+def get_obstacle_relations(cur: Any) -> set[str]:
+    """Return names of obstacle table and its partitions (obstacle table is partitioned by oas_code).
+
+    :param cur: database cursor
+    :return: relation names
+    """
+    cur.execute("select c.relname\n"
+                "from pg_inherits i\n"
+                "     join pg_class c on c.oid = i.inhrelid\n"
+                "where i.inhparent = 'dof.obstacle'::regclass;")
+    return {"obstacle"} | {row[0] for row in cur.fetchall()}
+
+
+def get_scans(plan: dict[str, Any]) -> list[tuple[str, str]]:
+    """Return scans (node type, relation name) from query plan.
+
+    :param plan: query plan node (EXPLAIN FORMAT JSON)
+    :return: node type, relation name of all nodes scanning relations
+    """
+    scans = []
+    if "Relation Name" in plan:
+        scans.append((plan["Node Type"], plan["Relation Name"]))
+    for sub_plan in plan.get("Plans", []):
+        scans.extend(get_scans(sub_plan))
+    return scans
+
+
+def explain(cur: Any, query: str, params: dict[str, Any], obstacle_relations: set[str]) -> tuple[bool, str]:
+    """Explain query and check if obstacle table is scanned with index.
+
+    :param cur: database cursor
+    :param query: lookup query
+    :param params: lookup parameters
+    :param obstacle_relations: names of obstacle table and its partitions
+    :return: True if obstacle table (any partition) is not scanned sequentially, query plan (text)
+    """
+    cur.execute(f"explain (format json) {query}", params)
+    plan = cur.fetchone()[0][0]["Plan"]
+    # Other relations (e.g. obstacle_type joined in vw_obstacle) are small lookup tables, scanned sequentially
+    obstacle_scans = [node_type for node_type, relation in get_scans(plan) if relation in obstacle_relations]
+    cur.execute(f"explain {query}", params)
+    plan_text = "\n".join(row[0] for row in cur.fetchall())
+    return bool(obstacle_scans) and "Seq Scan" not in obstacle_scans, plan_text
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse script arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--no-seqscan",
+        action="store_true",
+        help="Disable sequential scans (enable_seqscan = off) to check indexes can be used "
+             "when table is too small for the planner to choose them"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main script loop"""
+    args = parse_args()
+    load_dotenv()
+    con = psycopg2.connect(
+        host=os.environ.get("DB_HOST"),
+        database=os.environ.get("DB_NAME"),
+        user=os.environ.get("DB_USER"),
+        password=os.environ.get("DB_PASS")
+    )
+    with con, con.cursor() as cur:
+        if args.no_seqscan:
+            cur.execute("set local enable_seqscan = off;")
+        params = get_sample_obstacle(cur)
+        if params is None:
+            print("Table dof.obstacle is empty, load obstacles before checking lookups.")
+            sys.exit(1)
+
+        obstacle_relations = get_obstacle_relations(cur)
+        all_indexed = True
+        for name, query in LOOKUPS.items():
+            indexed, plan_text = explain(cur, query, params, obstacle_relations)
+            all_indexed = all_indexed and indexed
+            print(f"{name}: {'index scan' if indexed else 'SEQUENTIAL SCAN'}\n{plan_text}\n")
+
+    sys.exit(0 if all_indexed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
 """Script to load countries and USA states spatial data into database"""
 import argparse
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import Union
 
 from dacite import from_dict
 import geopandas as gpd
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from yaml import safe_load
 
 SrcValue = str  # Country, USA state code/name in the source data file
@@ -36,12 +37,20 @@ class DataSetConfiguration:
     columns_map: dict[SrcValue, TargetValue]
 
 
+@dataclass(frozen=True)
+class DerivedBoundariesConfiguration:
+    """Keep settings for boundaries derived from loaded boundaries (subdivided, simplified)"""
+    subdivide_max_vertices: int = 256
+    simplify_tolerances: list[float] = field(default_factory=lambda: [0.001, 0.01, 0.05])
+
+
 @dataclass(frozen=True)
 class Configuration:
     """Keep script configuration"""
     db_settings: DBSettings
     countries: DataSetConfiguration
     us_states: DataSetConfiguration
+    derived_boundaries: DerivedBoundariesConfiguration = field(default_factory=DerivedBoundariesConfiguration)
 
 
 def load_config(cfg: Union[str, Path] = "load_countries_states_config.yml") -> Configuration:
@@ -94,6 +103,16 @@ def prepare_data(
     return data
 
 
+def get_engine(db_settings: DBSettings) -> Engine:
+    """Return SQLAlchemy engine for the target database.
+
+    :param db_settings: target database settings (schema, credentials)
+    :return: database engine
+    """
+    return create_engine(
+        "postgresql+psycopg2://{user}:{password}@{host}:5432/{database}".format(**asdict(db_settings.credentials)))
+
+
 def insert_data(
         data: gpd.GeoDataFrame,
         target_table: str,
@@ -113,8 +132,7 @@ def insert_data(
                 from dof.{target_table}_tmp;"""
     query_drop = f"drop table if exists dof.{target_table}_tmp;"
 
-    engine = create_engine(
-        "postgresql+psycopg2://{user}:{password}@{host}:5432/{database}".format(**asdict(db_settings.credentials)))
+    engine = get_engine(db_settings)
     with engine.connect() as con:
         con.execution_options(isolation_level="AUTOCOMMIT")
         data.to_postgis(
@@ -128,6 +146,29 @@ def insert_data(
         con.execute(text(query_drop))
 
 
+def refresh_derived_boundaries(
+        config: DerivedBoundariesConfiguration,
+        db_settings: DBSettings
+) -> None:
+    """Regenerate boundaries derived from loaded countries/USA states boundaries:
+    subdivided boundaries (point-in-polygon checks) and simplified boundaries (display at small scales).
+
+    :param config: derived boundaries settings
+    :param db_settings: target database settings (schema, credentials)
+    """
+    engine = get_engine(db_settings)
+    with engine.begin() as con:
+        parts = con.execute(
+            text(f"select {db_settings.schema}.refresh_oas_boundary_subdivided(:max_vertices);"),
+            {"max_vertices": config.subdivide_max_vertices}
+        ).scalar()
+        boundaries = con.execute(
+            text(f"select {db_settings.schema}.refresh_oas_boundary_simplified(cast(:tolerances as numeric[]));"),
+            {"tolerances": config.simplify_tolerances}
+        ).scalar()
+    print(f"Subdivided boundaries parts: {parts}, simplified boundaries: {boundaries}")
+
+
 def parse_args() -> argparse.Namespace:
     """Parse script arguments"""
     parser = argparse.ArgumentParser()
@@ -195,6 +236,11 @@ def main():
         db_settings=config.db_settings
     )
 
+    refresh_derived_boundaries(
+        config=config.derived_boundaries,
+        db_settings=config.db_settings
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -80,6 +80,9 @@ create table dof.obstacle (
 	insert_timestamp timestamp not null,
 	mod_timestamp timestamp null,
 	location geography(POINT, 4326),
+	worst_case_amsl numeric(7, 2) null,
+	horizontal_buffer numeric(8, 1) null,
+	primary key (oas_code, obst_number),
 	foreign key (oas_code) references dof.oas(code),
 	foreign key (verif_status_code) references dof.verif_status(code),
 	foreign key (type_id) references dof.obstacle_type(id),
@@ -87,11 +90,28 @@ create table dof.obstacle (
 	foreign key (marking_code) references dof.marking(code),
 	foreign key (hor_acc_code) references dof.horizontal_acc(code),
 	foreign key (vert_acc_code) references dof.vertical_acc(code)
-);
+) partition by list (oas_code);
+
+-- Obstacles of countries/states without partition, partitions are created by ddl_partitions.sql
+create table dof.obstacle_default partition of dof.obstacle default;
 
 
 create table dof.dof_conf (
     file_type character(3) primary key,
     revision_date date not null,
     settings json not null
+);
+
+create table dof.import_log (
+    id serial primary key,
+    file_type character(3) not null,
+    file_name varchar(255) not null,
+    source_hash character(64) not null,
+    file_size bigint null,
+    currency_date date null,
+    rows_read integer not null,
+    rows_loaded integer not null,
+    duration_seconds numeric(10, 3) not null,
+    import_user varchar(63) not null default current_user,
+    import_timestamp timestamp not null default now()
 );
\ No newline at end of file
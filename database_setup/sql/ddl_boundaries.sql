@@ -0,0 +1,42 @@
+/*
+* Subdivided country/USA state boundaries (at most max_vertices vertices per part) used for point-in-polygon checks,
+* report of imported obstacles located outside the boundary of their country/state (oas_code)
+*/
+create table dof.oas_boundary_subdivided (
+    id serial primary key,
+    oas_code char(2) not null,
+    geom geometry(MultiPolygon, 4326) not null,
+    foreign key (oas_code) references dof.oas(code)
+);
+
+create index idx_oas_boundary_subdivided_geom on dof.oas_boundary_subdivided using gist (geom);
+create index idx_oas_boundary_subdivided_oas_code on dof.oas_boundary_subdivided (oas_code);
+
+create table dof.import_location_mismatch (
+    oas_code char(2) not null,
+    obst_number char(6) not null,
+    location geometry(Point, 4326) not null,
+    check_timestamp timestamp not null default now()
+);
+
+create or replace function dof.refresh_oas_boundary_subdivided(max_vertices integer default 256)
+returns integer
+language plpgsql
+as $$
+declare
+    parts integer;
+begin
+    truncate dof.oas_boundary_subdivided;
+    insert into dof.oas_boundary_subdivided (oas_code, geom)
+    select b.oas_code,
+           ST_Multi(ST_Subdivide(b.boundary::geometry, max_vertices))
+    from (select oas_code, boundary from dof.country
+          union all
+          select oas_code, boundary from dof.us_state) b
+    where b.boundary is not null;
+    get diagnostics parts = row_count;
+    analyze dof.oas_boundary_subdivided;
+    return parts;
+end $$;
+
+select dof.refresh_oas_boundary_subdivided();
@@ -0,0 +1,37 @@
+/*
+* Simplified country/USA state boundaries for display at small scales, one boundary per simplification tolerance
+* (degrees), e.g. QGIS layer with filter "tolerance" = 0.01 and scale based visibility
+*/
+create table dof.oas_boundary_simplified (
+    oas_code char(2) not null,
+    tolerance numeric(8, 5) not null,
+    boundary geometry(MultiPolygon, 4326) not null,
+    primary key (oas_code, tolerance),
+    foreign key (oas_code) references dof.oas(code)
+);
+
+create index idx_oas_boundary_simplified_boundary on dof.oas_boundary_simplified using gist (boundary);
+
+create or replace function dof.refresh_oas_boundary_simplified(tolerances numeric[] default array[0.001, 0.01, 0.05])
+returns integer
+language plpgsql
+as $$
+declare
+    boundaries integer;
+begin
+    truncate dof.oas_boundary_simplified;
+    insert into dof.oas_boundary_simplified (oas_code, tolerance, boundary)
+    select b.oas_code,
+           t.tolerance,
+           ST_Multi(ST_SimplifyPreserveTopology(b.boundary::geometry, t.tolerance))
+    from (select oas_code, boundary from dof.country
+          union all
+          select oas_code, boundary from dof.us_state) b
+         cross join unnest(tolerances) as t(tolerance)
+    where b.boundary is not null;
+    get diagnostics boundaries = row_count;
+    analyze dof.oas_boundary_simplified;
+    return boundaries;
+end $$;
+
+select dof.refresh_oas_boundary_simplified();
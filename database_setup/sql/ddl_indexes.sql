@@ -0,0 +1,24 @@
+/*
+* Create obstacle table primary key and indexes
+*/
+do $$
+begin
+    if not exists (select 1
+                   from pg_constraint
+                   where conrelid = 'dof.obstacle'::regclass
+                         and contype = 'p') then
+        alter table dof.obstacle add primary key (oas_code, obst_number);
+    end if;
+end $$;
+
+create unique index if not exists idx_obstacle_natural_key on dof.obstacle (oas_code, obst_number, valid_from);
+
+create index if not exists idx_obstacle_location on dof.obstacle using gist (location);
+
+-- Foreign key columns used by vw_obstacle joins
+create index if not exists idx_obstacle_verif_status_code on dof.obstacle (verif_status_code);
+create index if not exists idx_obstacle_type_id on dof.obstacle (type_id);
+create index if not exists idx_obstacle_lighting_code on dof.obstacle (lighting_code);
+create index if not exists idx_obstacle_marking_code on dof.obstacle (marking_code);
+create index if not exists idx_obstacle_hor_acc_code on dof.obstacle (hor_acc_code);
+create index if not exists idx_obstacle_vert_acc_code on dof.obstacle (vert_acc_code);
@@ -0,0 +1,28 @@
+/*
+* Materialized obstacle view: dof.vw_obstacle data (joins, DMS coordinates text) computed once per refresh.
+* Defined on top of dof.vw_obstacle, columns of both views are the same (and obstacle location).
+* Refreshed by dof.refresh_mv_obstacle() after each import, concurrent refresh does not block readers
+* (requires unique index and populated view).
+*/
+create materialized view dof.mv_obstacle
+as
+	select v.*,
+		   o.location
+	from dof.vw_obstacle v
+		 join dof.obstacle o using (oas_code, obst_number);
+
+create unique index idx_mv_obstacle_key on dof.mv_obstacle (oas_code, obst_number);
+
+create index idx_mv_obstacle_location on dof.mv_obstacle using gist (location);
+
+create or replace function dof.refresh_mv_obstacle(concurrent boolean default true)
+returns void
+language plpgsql
+as $$
+begin
+    if concurrent and (select ispopulated from pg_matviews where schemaname = 'dof' and matviewname = 'mv_obstacle') then
+        refresh materialized view concurrently dof.mv_obstacle;
+    else
+        refresh materialized view dof.mv_obstacle;
+    end if;
+end $$;
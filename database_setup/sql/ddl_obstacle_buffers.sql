@@ -0,0 +1,44 @@
+/*
+* Worst-case obstacle height (amsl + vertical tolerance) and horizontal buffer (horizontal tolerance) in feet,
+* stored in obstacle table (worst_case_amsl, horizontal_buffer columns) so analysis queries read numeric columns
+* without joins and unit conversion. Import/merge computes them for imported obstacles,
+* dof.refresh_obstacle_buffers() recomputes them after obstacles or accuracy tables are changed otherwise.
+* Null if accuracy is unknown (tolerance unit NA)
+*/
+create or replace function dof.tolerance_ft(tolerance numeric, uom varchar)
+returns numeric
+language sql
+immutable
+as $$
+    select case uom
+               when 'ft' then tolerance
+               when 'NM' then round(tolerance * 1852 / 0.3048, 1)
+           end;
+$$;
+
+create or replace function dof.refresh_obstacle_buffers(oas_code char(2) default null,
+                                                        obst_number char(6) default null)
+returns integer
+language plpgsql
+as $$
+declare
+    obstacles integer;
+begin
+    update dof.obstacle o
+    set worst_case_amsl = o.amsl + dof.tolerance_ft(v.tolerance, vu.uom),
+        horizontal_buffer = dof.tolerance_ft(h.tolerance, hu.uom)
+    from dof.vertical_acc v
+         join dof.tolerance_uom vu on vu.id = v.tolerance_uom_id,
+         dof.horizontal_acc h
+         join dof.tolerance_uom hu on hu.id = h.tolerance_uom_id
+    where v.code = o.vert_acc_code
+          and h.code = o.hor_acc_code
+          and (refresh_obstacle_buffers.oas_code is null or o.oas_code = refresh_obstacle_buffers.oas_code)
+          and (refresh_obstacle_buffers.obst_number is null or o.obst_number = refresh_obstacle_buffers.obst_number)
+          and (o.worst_case_amsl is distinct from o.amsl + dof.tolerance_ft(v.tolerance, vu.uom)
+               or o.horizontal_buffer is distinct from dof.tolerance_ft(h.tolerance, hu.uom));
+    get diagnostics obstacles = row_count;
+    return obstacles;
+end $$;
+
+select dof.refresh_obstacle_buffers();
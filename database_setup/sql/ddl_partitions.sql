@@ -0,0 +1,30 @@
+/*
+* Create obstacle table partitions, one partition per country/state (oas code)
+* Obstacles of oas codes without partition are stored in default partition (dof.obstacle_default),
+* they are moved to the new partition when partition is created
+*/
+create or replace function dof.create_obstacle_partitions()
+returns integer
+language plpgsql
+as $$
+declare
+    oas_code char(2);
+    partition_name text;
+    created integer := 0;
+begin
+    for oas_code in select o.code
+                    from dof.oas o
+                    where to_regclass('dof.obstacle_' || lower(o.code)) is null
+                    order by o.code loop
+        partition_name := 'obstacle_' || lower(oas_code);
+        execute format('create table dof.%I (like dof.obstacle including defaults)', partition_name);
+        execute format('with moved as (delete from dof.obstacle_default where oas_code = %L returning *)
+                        insert into dof.%I select * from moved', oas_code, partition_name);
+        execute format('alter table dof.obstacle attach partition dof.%I for values in (%L)',
+                       partition_name, oas_code);
+        created := created + 1;
+    end loop;
+    return created;
+end $$;
+
+select dof.create_obstacle_partitions();
@@ -0,0 +1,31 @@
+/*
+* Obstacle clearance surfaces (approach, departure, obstacle identification surfaces) and obstacles penetrating them.
+* Surface is a sloped trapezoid along its centerline: starts at start_distance from origin (e.g. runway threshold)
+* with inner_half_width, widens by divergence per side and rises by slope, distances and elevation in feet
+*/
+create table dof.surface (
+    id serial primary key,
+    name varchar(100) not null unique,
+    origin geography(Point, 4326) not null,
+    bearing numeric(6, 3) not null,
+    elevation numeric(7, 2) not null,
+    start_distance numeric(9, 2) not null default 0,
+    length numeric(9, 2) not null,
+    inner_half_width numeric(9, 2) not null,
+    divergence numeric(6, 4) not null default 0,
+    slope numeric(6, 4) not null default 0,
+    check (bearing >= 0 and bearing < 360),
+    check (length > 0 and inner_half_width >= 0 and divergence >= 0)
+);
+
+create table dof.surface_penetration (
+    surface_id integer not null,
+    oas_code char(2) not null,
+    obst_number char(6) not null,
+    obstacle_height numeric(7, 2) not null,
+    surface_height numeric(7, 2) not null,
+    penetration numeric(7, 2) not null,
+    check_timestamp timestamp not null default now(),
+    primary key (surface_id, oas_code, obst_number),
+    foreign key (surface_id) references dof.surface(id) on delete cascade
+);
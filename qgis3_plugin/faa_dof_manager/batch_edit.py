@@ -0,0 +1,188 @@
+"""Batch edit mode: validated obstacles are queued (single obstacle form, pasted table) and committed together
+in a single database transaction, with a single provider call per edit type (add features, change attributes,
+change geometries) and a single repaint of obstacle layer.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from qgis.core import (
+    QgsDataSourceUri,
+    QgsExpression,
+    QgsFeature,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsPointXY,
+    QgsTransaction,
+    QgsVectorLayer
+)
+from qgis.PyQt.QtCore import QDateTime
+
+from .errors import BatchCommitError
+
+KEY_FIELDS = ["oas_code", "obst_number"]
+# Obstacle data fields (the same as taken from single obstacle form), values of pasted table are codes (as stored)
+OBSTACLE_FIELDS = [
+    "oas_code",
+    "obst_number",
+    "verif_status_code",
+    "type_id",
+    "lighting_code",
+    "marking_code",
+    "hor_acc_code",
+    "vert_acc_code",
+    "city",
+    "quantity",
+    "agl",
+    "amsl",
+    "faa_study_number",
+    "action",
+    "julian_date",
+    "valid_from",
+    "valid_to",
+    "lon",
+    "lat"
+]
+# Fields of obstacle data not stored as attributes, obstacle location is built from them
+COORDINATE_FIELDS = ["lon", "lat"]
+# Pasted table: tab-separated rows (as copied from spreadsheet), first row with field names
+PASTE_SEPARATOR = "\t"
+
+
+def parse_pasted_table(text: str, fields: list[str]) -> tuple[list[dict[str, str]], list[str]]:
+    """Return obstacle data from pasted table.
+
+    :param text: pasted table, first row with field names (the same as single obstacle data fields)
+    :param fields: required fields
+    :return: obstacle data (row values as strings), required fields missing in pasted table
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return [], []
+    header = [name.strip() for name in lines[0].split(PASTE_SEPARATOR)]
+    missing = [field for field in fields if field not in header]
+    if missing:
+        return [], missing
+    rows = []
+    for line in lines[1:]:
+        values = [value.strip() for value in line.split(PASTE_SEPARATOR)]
+        values += [""] * (len(header) - len(values))
+        row = dict(zip(header, values))
+        rows.append({field: row[field] for field in fields})
+    return rows, []
+
+
+def obstacle_key(data: dict[str, Any]) -> tuple[str, str]:
+    """Return obstacle key (oas_code, obst_number)"""
+    return data["oas_code"].strip(), data["obst_number"].strip()
+
+
+class ObstacleBatch:
+
+    """Validated obstacles queued in batch edit mode.
+    Queued obstacles existing in obstacle table are updated, others are inserted.
+    The same obstacle queued again replaces data queued before.
+    """
+
+    def __init__(self) -> None:
+        self.queued: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.queued)
+
+    def add(self, data: dict[str, Any]) -> None:
+        """Queue obstacle.
+
+        :param data: validated obstacle data (coordinates converted to DD)
+        """
+        self.queued[obstacle_key(data)] = data
+
+    def clear(self) -> None:
+        """Remove all queued obstacles"""
+        self.queued.clear()
+
+    def _existing_feature_ids(self, layer: QgsVectorLayer) -> dict[tuple[str, str], int]:
+        """Return feature ids of queued obstacles existing in obstacle layer, fetched with a single request.
+
+        :param layer: obstacle layer
+        :return: obstacle key, feature id
+        """
+        obst_numbers: dict[str, list[str]] = {}
+        for oas_code, obst_number in self.queued:
+            obst_numbers.setdefault(oas_code, []).append(obst_number)
+        # Filter on key columns (grouped by oas_code), compiled into query using primary key index
+        expression = " or ".join(
+            f"(\"oas_code\" = {QgsExpression.quotedValue(oas_code)} and \"obst_number\" in "
+            f"({', '.join(QgsExpression.quotedValue(obst_number) for obst_number in numbers)}))"
+            for oas_code, numbers in obst_numbers.items()
+        )
+        request = (QgsFeatureRequest()
+                   .setFilterExpression(expression)
+                   .setFlags(QgsFeatureRequest.NoGeometry)
+                   .setSubsetOfAttributes(KEY_FIELDS, layer.fields()))
+        return {(str(feature["oas_code"]).strip(), str(feature["obst_number"]).strip()): feature.id()
+                for feature in layer.getFeatures(request)}
+
+    def commit(self, layer: QgsVectorLayer) -> tuple[int, int]:
+        """Insert new and update existing queued obstacles in a single transaction, layer is repainted once.
+        Queue is cleared if all changes were committed, no changes are committed otherwise.
+
+        :param layer: obstacle layer
+        :return: number of inserted obstacles, number of updated obstacles
+        """
+        if not self.queued:
+            return 0, 0
+
+        fields = layer.fields()
+        provider = layer.dataProvider()
+        user = QgsDataSourceUri(provider.dataSourceUri()).username()
+        timestamp = QDateTime.currentDateTime()
+        existing = self._existing_feature_ids(layer)
+
+        new_features = []
+        attribute_changes: dict[int, dict[int, Any]] = {}
+        geometry_changes: dict[int, QgsGeometry] = {}
+        for key, data in self.queued.items():
+            geometry = QgsGeometry.fromPointXY(QgsPointXY(data["lon"], data["lat"]))
+            attributes = {field: value for field, value in data.items() if field not in COORDINATE_FIELDS}
+            if key in existing:
+                attributes.update({"mod_user": user, "mod_timestamp": timestamp})
+                attribute_changes[existing[key]] = {fields.indexOf(field): value for field, value in attributes.items()
+                                                    if field not in KEY_FIELDS}
+                geometry_changes[existing[key]] = geometry
+            else:
+                feature = QgsFeature(fields)
+                feature.setGeometry(geometry)
+                for field, value in attributes.items():
+                    feature.setAttribute(field, value)
+                # insert_user is not in the plugin dialog graphical user interface
+                feature.setAttribute("insert_user", user)
+                new_features.append(feature)
+
+        logging.info("Committing batch: %d obstacles to insert, %d obstacles to update",
+                     len(new_features), len(attribute_changes))
+        # Provider calls are executed in the transaction, failed update rolls back inserted obstacles
+        transaction = QgsTransaction.create({layer})
+        if transaction is None:
+            raise BatchCommitError("Obstacle layer does not support transactions")
+        started, error = transaction.begin()
+        if not started:
+            raise BatchCommitError(f"Transaction not started: {error}")
+        try:
+            if new_features and not provider.addFeatures(new_features)[0]:
+                raise BatchCommitError(f"Obstacles not inserted: {'; '.join(provider.errors())}")
+            if attribute_changes and not (provider.changeAttributeValues(attribute_changes)
+                                          and provider.changeGeometryValues(geometry_changes)):
+                raise BatchCommitError(f"Obstacles not updated: {'; '.join(provider.errors())}")
+            committed, error = transaction.commit()
+            if not committed:
+                raise BatchCommitError(f"Obstacles not committed: {error}")
+        except BatchCommitError:
+            transaction.rollback()
+            raise
+
+        layer.updateExtents()
+        layer.triggerRepaint()
+        self.clear()
+        return len(new_features), len(attribute_changes)
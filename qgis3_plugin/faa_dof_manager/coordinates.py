@@ -1,10 +1,18 @@
 """Coordinate conversion"""
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from .errors import CoordinateError
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
 HEMISPHERES = ["N", "S", "W", "E"]
 NEGATIVE_SIGN = ["S", "W"]
+# Degrees, minutes, seconds and hemisphere separated as expected by dms_to_dd, example: 32 00 04.00N
+DMS_PATTERN = r"^(\d+) (\d+) (\d+(?:\.\d*)?|\.\d+)([NSWE])$"
 
 
 def dms_to_dd(coord: str,
@@ -41,3 +49,37 @@ def dms_to_dd(coord: str,
     if h in NEGATIVE_SIGN:
         return -dd
     return dd
+
+
+def dms_to_dd_array(coords: pd.Series | np.ndarray,
+                    max_degree: int) -> tuple[np.ndarray, np.ndarray]:
+    """Convert coordinates from DMS (degree, minutes, second) to DD (decimal degrees) format.
+    Array counterpart of dms_to_dd: the same rules are applied to all values at once,
+    invalid values are reported in the mask instead of raising CoordinateError.
+
+    :param coords: coordinate values to be converted
+    :param max_degree: maximum degree value for coordinates:
+        90 for longitude
+        180 for latitude
+    :return: coordinates in decimal degree format (NaN for invalid values), mask of valid values
+    """
+    # Imported on first use, not when plugin is loaded by QGIS
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    parts = pd.Series(coords, dtype="object").str.extract(DMS_PATTERN)
+    d = parts[0].astype("float64").to_numpy()
+    m = parts[1].astype("float64").to_numpy()
+    s = parts[2].astype("float64").to_numpy()
+
+    valid = (
+        (0 <= d) & (d <= max_degree)
+        & (0 <= m) & (m < 60)
+        & (0 <= s) & (s < 60)
+        & ~((d == max_degree) & ((m != 0) | (s != 0)))
+    )
+
+    dd = d + m / 60 + s / 3600
+    dd = np.where(parts[3].isin(NEGATIVE_SIGN).to_numpy(), -dd, dd)
+    dd[~valid] = np.nan
+    return dd, valid
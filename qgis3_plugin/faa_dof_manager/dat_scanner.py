@@ -0,0 +1,199 @@
+"""Memory-mapped reader of DOF DAT (fixed width) file.
+Fields are sliced from the file bytes into NumPy fixed width byte arrays (views of the file if lines have the same length),
+integer fields are decoded from digit bytes, string fields are decoded once per unique value.
+"""
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+SPACE = ord(" ")
+TAB = ord("\t")
+ZERO = ord("0")
+# File bytes searched for line breaks at once
+SEARCH_BLOCK_SIZE = 1 << 23
+# Values read as NaN by pandas readers (default na_values)
+NA_VALUES = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+             "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+
+def get_line_bounds(buffer: np.ndarray, skiprows: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return start and end (exclusive, without line break) offsets of non-blank lines.
+
+    :param buffer: file bytes
+    :param skiprows: number of header lines to skip
+    :return: line start offsets, line end offsets
+    """
+    # Searched in blocks, so boolean mask of the whole file is not created
+    newlines = np.concatenate([
+        np.flatnonzero(buffer[block:block + SEARCH_BLOCK_SIZE] == NEWLINE) + block
+        for block in range(0, len(buffer), SEARCH_BLOCK_SIZE)
+    ])
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buffer)]))
+    starts, ends = starts[skiprows:], ends[skiprows:]
+
+    # Windows line breaks
+    has_cr = (ends > starts) & (buffer[np.maximum(ends - 1, 0)] == CARRIAGE_RETURN)
+    ends = ends - has_cr
+
+    # Blank lines are skipped (as by read_fwf), last empty "line" after final line break as well.
+    # Only lines starting with whitespace can be whitespace only, DOF data lines start with OAS code
+    non_blank = ends > starts
+    first_byte = buffer[np.minimum(starts, len(buffer) - 1)]
+    for i in np.flatnonzero(non_blank & ((first_byte == SPACE) | (first_byte == TAB))):
+        non_blank[i] = bool(bytes(buffer[starts[i]:ends[i]]).strip(b" \t"))
+    return starts[non_blank], ends[non_blank]
+
+
+def get_fixed_rows(buffer: np.ndarray,
+                   starts: np.ndarray,
+                   ends: np.ndarray) -> np.ndarray | None:
+    """Return lines as rows of 2D view of the file bytes (no copy), if lines are contiguous and have the same length.
+
+    :param buffer: file bytes
+    :param starts: line start offsets
+    :param ends: line end offsets (exclusive)
+    :return: lines bytes, shape: (lines, line length with line break), None if lines are not equally spaced
+    """
+    if len(starts) < 2:
+        return None
+    stride = int(starts[1] - starts[0])
+    if (
+            not (np.diff(starts) == stride).all()
+            or starts[0] + len(starts) * stride > len(buffer)
+    ):
+        return None
+    return buffer[starts[0]:starts[0] + len(starts) * stride].reshape(len(starts), stride)
+
+
+def slice_field(buffer: np.ndarray,
+                starts: np.ndarray,
+                ends: np.ndarray,
+                field_start: int,
+                field_end: int) -> np.ndarray:
+    """Return field bytes of each line, bytes past the end of the line are spaces.
+
+    :param buffer: file bytes
+    :param starts: line start offsets
+    :param ends: line end offsets (exclusive)
+    :param field_start: field start column (0-based)
+    :param field_end: field end column (exclusive)
+    :return: field bytes, shape: (lines, field width)
+    """
+    positions = starts[:, None] + np.arange(field_start, field_end)
+    field_bytes = buffer[np.minimum(positions, len(buffer) - 1)]
+    field_bytes[positions >= ends[:, None]] = SPACE
+    return field_bytes
+
+
+def decode_integers(field_bytes: np.ndarray) -> pd.arrays.IntegerArray:
+    """Decode integer field, blank values are NA.
+
+    :param field_bytes: field bytes, shape: (lines, field width)
+    :return: decoded values (Int64)
+    """
+    is_blank = (field_bytes == SPACE) | (field_bytes == TAB)
+    is_digit = (field_bytes >= ZERO) & (field_bytes <= ZERO + 9)
+    if not (is_blank | is_digit).all():
+        row = np.flatnonzero(~(is_blank | is_digit).all(axis=1))[0]
+        raise ValueError(f"Unable to parse integer value: {bytes(field_bytes[row]).decode(errors='replace')!r}")
+
+    values = np.zeros(len(field_bytes), dtype=np.int64)
+    for column in range(field_bytes.shape[1]):
+        digit = is_digit[:, column]
+        values = np.where(digit, values * 10 + (field_bytes[:, column].astype(np.int64) - ZERO), values)
+    return pd.arrays.IntegerArray(values, is_blank.all(axis=1))
+
+
+def decode_strings(field_bytes: np.ndarray) -> np.ndarray:
+    """Decode string field, values are stripped, blank values and NA_VALUES are NaN.
+    Each unique value is decoded once, rows with the same value share the same string object.
+
+    :param field_bytes: field bytes, shape: (lines, field width)
+    :return: decoded values (object array)
+    """
+    fixed_width = np.ascontiguousarray(field_bytes).view(f"S{field_bytes.shape[1]}").ravel()
+    uniques, inverse = np.unique(fixed_width, return_inverse=True)
+    decoded = np.empty(len(uniques), dtype=object)
+    decoded[:] = [value.strip(b" \t").decode("utf-8") for value in uniques]
+    decoded[[value in NA_VALUES for value in decoded]] = np.nan
+    return decoded[inverse.ravel()]
+
+
+def read_chunk(buffer: np.ndarray,
+               starts: np.ndarray,
+               ends: np.ndarray,
+               colspecs: dict[str, tuple[int, int]],
+               integer_fields: list[str]) -> pd.DataFrame:
+    """Return data of lines, decoded values do not reference file bytes.
+
+    :param buffer: file bytes
+    :param starts: line start offsets
+    :param ends: line end offsets (exclusive)
+    :param colspecs: field name, column specification (half-open interval, 0-based)
+    :param integer_fields: fields decoded as integers (Int64), other fields are decoded as strings
+    :return: raw data
+    """
+    # Fixed length lines: fields are sliced from the view of the file bytes (no copy)
+    rows = get_fixed_rows(buffer, starts, ends)
+    min_length = (ends - starts).min()
+    data = {}
+    for field_name, (field_start, field_end) in colspecs.items():
+        if rows is not None and field_end <= min_length:
+            field_bytes = rows[:, field_start:field_end]
+        else:
+            field_bytes = slice_field(buffer, starts, ends, field_start, field_end)
+        if field_name in integer_fields:
+            data[field_name] = decode_integers(field_bytes)
+        else:
+            data[field_name] = decode_strings(field_bytes)
+    return pd.DataFrame(data)
+
+
+def read_dat_chunks_mmap(path: Path,
+                         colspecs: dict[str, tuple[int, int]],
+                         integer_fields: list[str],
+                         skiprows: int,
+                         chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Return DOF DAT file data in chunks, file is memory-mapped.
+    Chunks are the same as returned by read_fwf (rows, index, values), except empty chunks are not returned.
+
+    :param path: path to the DOF file
+    :param colspecs: field name, column specification (half-open interval, 0-based)
+    :param integer_fields: fields decoded as integers (Int64), other fields are decoded as strings
+    :param skiprows: number of header lines to skip
+    :param chunk_size: number of rows in chunk
+    :return: raw data chunks
+    """
+    error = None
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buffer = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                starts, ends = get_line_bounds(buffer, skiprows)
+                for chunk_start in range(0, len(starts), chunk_size):
+                    chunk = read_chunk(buffer=buffer,
+                                       starts=starts[chunk_start:chunk_start + chunk_size],
+                                       ends=ends[chunk_start:chunk_start + chunk_size],
+                                       colspecs=colspecs,
+                                       integer_fields=integer_fields)
+                    chunk.index = pd.RangeIndex(chunk_start, chunk_start + len(chunk))
+                    yield chunk
+            except ValueError as e:
+                # Traceback references views of the mapped memory (frames of decoding functions),
+                # error is raised again without it when the memory is closed
+                error = ValueError(str(e))
+            finally:
+                # Views of the mapped memory must be released before it is closed
+                del buffer
+    if error is not None:
+        raise error
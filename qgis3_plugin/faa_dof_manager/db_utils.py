@@ -2,17 +2,34 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
+import weakref
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
 
 import psycopg2
+from psycopg2.extensions import connection, cursor
 from psycopg2.extras import DictCursor
-
+from psycopg2.pool import ThreadedConnectionPool
 from .errors import DBConnectionError
+from .types import StatementTiming
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
 
 
 class DBUtils:
 
-    """Handle database CRUD operations"""
+    """Handle database CRUD operations.
+    Connections are kept in a pool shared by all plugin components (dialog, values mapping, loaders).
+    """
+
+    MIN_CONNECTIONS: int = 1
+    MAX_CONNECTIONS: int = 4
+    PORT: int = 5432
+    # Connections idle longer than IDLE_CHECK_SECONDS are checked (ping) before use,
+    # broken connections (e.g. after database server restart) are replaced with new ones
+    IDLE_CHECK_SECONDS: float = 30
 
     def __init__(self,
                  host: str,
@@ -23,13 +40,24 @@ class DBUtils:
         self._database = database
         self._user = user
         self._password = password
-        self._connection = None
+        self._pool: ThreadedConnectionPool | None = None
+        # Per connection state is kept with weak references to connections, not their id():
+        # connection closed by the pool can be replaced with new one at the same address
+        self._last_used: weakref.WeakKeyDictionary[connection, float] = weakref.WeakKeyDictionary()
+        self._engine: Engine | None = None
+        self._statements: dict[str, str] = {}
+        self._prepared: weakref.WeakKeyDictionary[connection, set[str]] = weakref.WeakKeyDictionary()
+        self.timings: dict[str, StatementTiming] = {}
+        """Execution times of prepared statements"""
 
     def connect(self) -> None | Exception:
-        """Connect to the database"""
+        """Create pool of connections to the database"""
         try:
-            self._connection = psycopg2.connect(
+            self._pool = ThreadedConnectionPool(
+                minconn=DBUtils.MIN_CONNECTIONS,
+                maxconn=DBUtils.MAX_CONNECTIONS,
                 host=self._host,
+                port=DBUtils.PORT,
                 database=self._database,
                 user=self._user,
                 password=self._password
@@ -39,15 +67,171 @@ class DBUtils:
             logging.error("Database connection error: %s", e)
             raise DBConnectionError(e) from e
 
-    def select(self, query: str) -> dict[Any, Any]:
-        """Execute select query"""
-        if not self._connection:
+    def close(self) -> None:
+        """Close all pooled connections"""
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+        self._last_used.clear()
+        self._prepared.clear()
+
+    def _discard(self, conn: connection) -> None:
+        """Close connection and remove it from the pool.
+
+        :param conn: pooled connection
+        """
+        self._last_used.pop(conn, None)
+        self._prepared.pop(conn, None)
+        self._pool.putconn(conn, close=True)
+
+    def _is_alive(self, conn: connection) -> bool:
+        """Check if pooled connection can be used.
+
+        :param conn: pooled connection
+        :return: True if connection can be used, False otherwise
+        """
+        if conn.closed:
+            return False
+        if time.monotonic() - self._last_used.get(conn, 0) < DBUtils.IDLE_CHECK_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("select 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logging.info("Pooled connection broken, reconnecting: %s", e)
+            return False
+
+    def _get_connection(self) -> connection:
+        """Return working connection from the pool, broken connections are discarded.
+
+        :return: pooled connection
+        """
+        if self._pool is None:
             self.connect()
 
-        with self._connection as conn:
-            cur = conn.cursor(cursor_factory=DictCursor)
-            cur.execute(query)
-            data = cur.fetchall()
-            cur.close()
+        # Each pooled connection might be broken after database server restart
+        for _ in range(DBUtils.MAX_CONNECTIONS + 1):
+            try:
+                conn = self._pool.getconn()
+            except psycopg2.Error as e:
+                logging.error("Database connection error: %s", e)
+                raise DBConnectionError(e) from e
+            if self._is_alive(conn):
+                return conn
+            self._discard(conn)
+        raise DBConnectionError("Cannot get working connection from the pool")
+
+    @contextmanager
+    def connection(self) -> Iterator[connection]:
+        """Return connection from the pool, connection is returned to the pool when block exits."""
+        conn = self._get_connection()
+        try:
+            yield conn
+        finally:
+            if conn.closed:
+                self._discard(conn)
+            else:
+                self._last_used[conn] = time.monotonic()
+                self._pool.putconn(conn)
+
+    @contextmanager
+    def transaction(self, cursor_factory: type[cursor] | None = None) -> Iterator[cursor]:
+        """Return cursor to execute statements in a single transaction.
+        Transaction is committed when block exits normally, rolled back otherwise.
+
+        :param cursor_factory: cursor class, default: psycopg2 cursor
+        """
+        with self.connection() as conn:
+            with conn:
+                with conn.cursor(cursor_factory=cursor_factory) as cur:
+                    yield cur
 
+    def select(self, query: str, params: Any = None) -> dict[Any, Any]:
+        """Execute select query.
+        Query is executed once again with new connection if connection was lost (e.g. database server restart).
+        """
+        try:
+            with self.transaction(cursor_factory=DictCursor) as cur:
+                cur.execute(query, params)
+                return cur.fetchall()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            logging.info("Query failed due to connection error, retrying: %s", e)
+
+        with self.transaction(cursor_factory=DictCursor) as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+
+    def prepare(self, name: str, query: str) -> None:
+        """Register statement to be prepared (server side) once per pooled connection, at first execution.
+
+        :param name: statement name
+        :param query: statement query with parameters as $1, $2, ...
+        """
+        self._statements[name] = query
+
+    def _execute_prepared(self, name: str, params: tuple[Any, ...]) -> list[Any]:
+        """Execute prepared statement, prepare it first if not prepared for the connection yet.
+
+        :param name: statement name
+        :param params: statement parameters values
+        :return: fetched rows
+        """
+        with self.connection() as conn:
+            prepared = self._prepared.setdefault(conn, set())
+            with conn:
+                with conn.cursor(cursor_factory=DictCursor) as cur:
+                    if name not in prepared:
+                        cur.execute(f"prepare {name} as {self._statements[name]}")
+                        prepared.add(name)
+                    start = time.perf_counter()
+                    placeholders = ", ".join(["%s"] * len(params))
+                    cur.execute(f"execute {name} ({placeholders});", params)
+                    data = cur.fetchall()
+                    elapsed = time.perf_counter() - start
+
+        timing = self.timings.setdefault(name, StatementTiming())
+        timing.calls += 1
+        timing.total_seconds += elapsed
+        timing.last_seconds = elapsed
         return data
+
+    def execute_prepared(self, name: str, params: tuple[Any, ...]) -> list[Any]:
+        """Execute statement registered with prepare using bound parameters.
+        Statement is executed once again with new connection if connection was lost (e.g. database server restart).
+
+        :param name: statement name
+        :param params: statement parameters values
+        :return: fetched rows
+        """
+        try:
+            return self._execute_prepared(name=name, params=params)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            logging.info("Statement %s failed due to connection error, retrying: %s", name, e)
+        return self._execute_prepared(name=name, params=params)
+
+    @property
+    def engine(self) -> Engine:
+        """SQLAlchemy engine for the same database (created once and reused)"""
+        if self._engine is None:
+            # Imported on first use, not when plugin is loaded by QGIS
+            from sqlalchemy import create_engine  # pylint: disable=import-outside-toplevel
+            from sqlalchemy.engine import URL  # pylint: disable=import-outside-toplevel
+
+            self._engine = create_engine(
+                URL.create(
+                    drivername="postgresql+psycopg2",
+                    username=self._user,
+                    password=self._password,
+                    host=self._host,
+                    port=DBUtils.PORT,
+                    database=self._database
+                ),
+                pool_size=DBUtils.MAX_CONNECTIONS,
+                pool_pre_ping=True
+            )
+        return self._engine
@@ -1,6 +1,28 @@
 """Helper for getting primary key database table value based on human friendly values"""
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
 from .db_utils import DBUtils
 
+# Mapping attribute: query returning 'human' friendly value (key) and primary key (value) ordered by primary key
+MAPPING_QUERIES = {
+    "oas": "select json_object_agg(name, code order by code) from dof.oas",
+    "hor_acc": "select json_object_agg(accuracy, code order by code) from dof.vw_horizontal_acc",
+    "vert_acc": "select json_object_agg(accuracy, code order by code) from dof.vw_vertical_acc",
+    "obstacle_type": "select json_object_agg(type, id order by id) from dof.obstacle_type",
+    "marking": "select json_object_agg(description, code order by code) from dof.marking",
+    "lighting": "select json_object_agg(description, code order by code) from dof.lighting",
+    "verification_status": "select json_object_agg(description, code order by code) from dof.verif_status",
+}
+# All mappings in a single JSON document
+ALL_MAPPING_QUERY = "json_build_object(\n" + ",\n".join(
+    f"    '{attribute}', ({query})" for attribute, query in MAPPING_QUERIES.items()
+) + "\n)"
+
 
 class DBValuesMapping:
 
@@ -8,8 +30,14 @@ class DBValuesMapping:
 
 
     def __init__(self,
-                 db_utils: DBUtils):
+                 db_utils: DBUtils,
+                 cache_file: Path | None = None):
+        """
+        :param db_utils: instance of DBUtils class
+        :param cache_file: file to cache mapping between plugin runs, default: mapping not cached
+        """
         self.db_utils = db_utils
+        self.cache_file = cache_file
         self.oas = {}
         self.hor_acc = {}
         self.vert_acc = {}
@@ -18,46 +46,59 @@ class DBValuesMapping:
         self.lighting = {}
         self.verification_status = {}
 
-    def _set_mapping(self,
-                    query: str,
-                    mapping: dict) -> None:
+    def _set_mapping(self, mapping: dict[str, dict[str, Any]]) -> None:
         """Set mapping between database 'human' friendly values and database primary keys
 
-        :param query: SQL query based on which mapping will be set
-        :param mapping: mapping to be set
+        :param mapping: mappings (attribute: mapping) to be set
+        """
+        for attribute in MAPPING_QUERIES:
+            setattr(self, attribute, mapping.get(attribute) or {})
+
+    def _read_cache(self) -> dict[str, Any] | None:
+        """Read cached mapping.
+
+        :return: cached mapping and its checksum, None if cache does not exist or cannot be read
+        """
+        if self.cache_file is None or not self.cache_file.exists():
+            return None
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning("Cannot read mapping cache %s: %s", self.cache_file, e)
+            return None
+
+    def _write_cache(self, checksum: str, mapping: dict[str, dict[str, Any]]) -> None:
+        """Write mapping to cache file.
+
+        :param checksum: checksum of the mapping in the database
+        :param mapping: mappings (attribute: mapping)
         """
-        data = self.db_utils.select(query=query)
-        for value, primary_key in data:
-            mapping[value] = primary_key
+        if self.cache_file is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump({"checksum": checksum, "mapping": mapping}, f)
+        except OSError as e:
+            logging.warning("Cannot write mapping cache %s: %s", self.cache_file, e)
 
     def set_all_mapping(self) -> None:
         """Set mapping between database 'human' friendly values and database primary keys
-        for all control in the plugin UI"""
-        self._set_mapping(
-            query="select name, code from dof.oas;",
-            mapping=self.oas
-        )
-        self._set_mapping(
-            query="select accuracy, code from dof.vw_horizontal_acc;",
-            mapping=self.hor_acc
-        )
-        self._set_mapping(
-            query="select accuracy, code from dof.vw_vertical_acc;",
-            mapping=self.vert_acc
-        )
-        self._set_mapping(
-            query="select type, id from dof.obstacle_type;",
-            mapping=self.obstacle_type
-        )
-        self._set_mapping(
-            query="select description, code from dof.marking",
-            mapping=self.marking
-        )
-        self._set_mapping(
-            query="select description, code from dof.lighting;",
-            mapping=self.lighting
-        )
-        self._set_mapping(
-            query="select description, code from dof.verif_status;",
-            mapping=self.verification_status
-        )
+        for all control in the plugin UI.
+        Cached mapping is used if its checksum is the same as checksum of the mapping in the database,
+        otherwise all mappings are fetched with a single query and cached."""
+        cache = self._read_cache()
+        if cache is not None:
+            data = self.db_utils.select(query=f"select md5({ALL_MAPPING_QUERY}::text);")
+            if data[0][0] == cache.get("checksum"):
+                logging.info("Using cached mapping: %s", self.cache_file)
+                self._set_mapping(cache["mapping"])
+                return
+
+        data = self.db_utils.select(query=f"select mapping, md5(mapping)\n"
+                                          f"from (select {ALL_MAPPING_QUERY}::text as mapping) m;")
+        mapping_json, checksum = data[0]
+        mapping = json.loads(mapping_json)
+        self._set_mapping(mapping)
+        self._write_cache(checksum=checksum, mapping=mapping)
@@ -31,3 +31,11 @@ class MissingRequiredValueError(FAADOFManagerError):
 
 class NumberExpectedError(FAADOFManagerError):
     """Risen when value is not a number"""
+
+
+class ImportCanceledError(FAADOFManagerError):
+    """Risen when DOF import is canceled by user"""
+
+
+class BatchCommitError(FAADOFManagerError):
+    """Risen when obstacles queued in batch edit mode cannot be committed"""
@@ -21,9 +21,12 @@
  *                                                                         *
  ***************************************************************************/
 """
+from __future__ import annotations
+
 from dataclasses import asdict
 import os.path
 from pathlib import Path
+import re
 
 from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication
 from qgis.PyQt.QtGui import QIcon
@@ -38,6 +41,7 @@ from .custom_logging import configure_logging
 
 from .db_values_map import DBValuesMapping
 from .db_utils import DBUtils
+from .types import DBConnectionSettings
 
 
 class FAADOFManager:  # pylint: disable=too-many-instance-attributes
@@ -79,6 +83,8 @@ class FAADOFManager:  # pylint: disable=too-many-instance-attributes
         """Path to the log file"""
         self.dof_layers: DOFLayers = DOFLayers()
         """Layers used by plugin"""
+        self.db_utils: DBUtils | None = None
+        """Database connections shared by plugin components"""
         self._init_logging()
 
     # noinspection PyMethodMayBeStatic
@@ -192,6 +198,8 @@ class FAADOFManager:  # pylint: disable=too-many-instance-attributes
                 self.tr('&FAA DOF Manager'),
                 action)
             self.iface.removeToolBarIcon(action)
+        if self.db_utils is not None:
+            self.db_utils.close()
 
     def _init_logging(self) -> None:
         """Initialize plugin logging"""
@@ -200,6 +208,15 @@ class FAADOFManager:  # pylint: disable=too-many-instance-attributes
         self._log_file = log_dir / "faa_dof_manager.txt"
         configure_logging(log_file=self._log_file)
 
+    def _mapping_cache_file(self, db_setting: DBConnectionSettings) -> Path:
+        """Return file to cache database values mapping, separate file for each database.
+
+        :param db_setting: database connection details
+        :return: cache file path
+        """
+        name = re.sub(r"[^\w.-]", "_", f"{db_setting.host}_{db_setting.database}")
+        return Path(self.plugin_dir) / "cache" / f"mapping_{name}.json"
+
     def open_logs(self) -> None:
         """Open logs in default text editor"""
         os.startfile(self._log_file)
@@ -214,13 +231,16 @@ class FAADOFManager:  # pylint: disable=too-many-instance-attributes
         if self.first_start:
             self.first_start = False
             db_setting = self.dof_layers.get_db_settings()
-            db_utils = DBUtils(**asdict(db_setting))
-            db_mapping = DBValuesMapping(db_utils=db_utils)
+            self.db_utils = DBUtils(**asdict(db_setting))
+            db_mapping = DBValuesMapping(
+                db_utils=self.db_utils,
+                cache_file=self._mapping_cache_file(db_setting)
+            )
             db_mapping.set_all_mapping()
 
             self.dlg = FAADOFManagerDialog(
                 db_mapping=db_mapping,
-                db_utils=db_utils,
+                db_utils=self.db_utils,
                 layers=self.dof_layers
             )
             self.dlg.set_single_mode_drop_down_lists()
@@ -26,9 +26,10 @@ from __future__ import annotations
 import logging
 import os
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from qgis.core import (
+    QgsApplication,
     QgsDataSourceUri,
     QgsFeature,
     QgsGeometry,
@@ -38,24 +39,34 @@ from qgis.PyQt import uic
 from qgis.PyQt.QtWidgets import (
     QDialog,
     QMessageBox,
+    QTableWidgetItem,
     QWidget
 )
 
-from .errors import ObstacleNotFoundError
+from .batch_edit import OBSTACLE_FIELDS, ObstacleBatch, parse_pasted_table
+from .coordinates import dms_to_dd
+from .errors import BatchCommitError, CoordinateError, ObstacleNotFoundError
 from .db_values_map import DBValuesMapping
 from .db_utils import DBUtils
 from .dof_layers import DOFLayers
 from .obstacle_data_validator import validate_obstacle
-from .load_dof import (
-    load_csv,
-    load_dat
-)
+from .import_task import ImportDOFTask
+from .merge_dof import refresh_obstacle_buffers
 
+if TYPE_CHECKING:
+    from .obstacle_index import ObstacleIndex
+    from .types import NearbyObstacle
 
 # This loads your .ui file so that PyQt can populate your plugin with the elements from Qt Designer
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
     os.path.dirname(__file__), 'faa_dof_manager_dialog_base.ui'))
 
+# Single obstacle lookup, prepared once per database connection
+FETCH_OBSTACLE_STATEMENT = "fetch_obstacle"
+# Single obstacle lookup in materialized view (refreshed after import)
+FETCH_OBSTACLE_MV_STATEMENT = "fetch_obstacle_mv"
+NEARBY_POINT_MESSAGE = "Enter longitude and latitude of the point, example: 087 25 33.00W, 32 00 04.00N."
+
 
 class FAADOFManagerDialog(QDialog, FORM_CLASS):
     """Plugin dialog window dialog implementation."""
@@ -76,10 +87,31 @@ class FAADOFManagerDialog(QDialog, FORM_CLASS):
         self.db_mapping = db_mapping
         self.db_utils = db_utils
         self.layers = layers
+        self.import_task: ImportDOFTask | None = None
+        # Obstacles queued in batch edit mode
+        self.obstacle_batch = ObstacleBatch()
+        # Spatial index of obstacles, built at the first nearby obstacles query
+        self.obstacle_index: ObstacleIndex | None = None
+        self.db_utils.prepare(name=FETCH_OBSTACLE_STATEMENT,
+                              query="select *\n"
+                                    "from dof.vw_obstacle\n"
+                                    "where oas_code = $1\n"
+                                    "      and obst_number = $2;")
+        self.db_utils.prepare(name=FETCH_OBSTACLE_MV_STATEMENT,
+                              query="select *\n"
+                                    "from dof.mv_obstacle\n"
+                                    "where oas_code = $1\n"
+                                    "      and obst_number = $2;")
         self.lineEditObstacleIdent.editingFinished.connect(self.load_single_obstacle)
         self.pushButtonInsert.clicked.connect(self.insert_single_obstacle)
         self.mQgsFileWidgetSourceFile.setFilter("*.csv;;*.dat")
         self.pushButtonLoadData.clicked.connect(self.load_dof_data)
+        self.pushButtonAddToBatch.clicked.connect(self.add_single_obstacle_to_batch)
+        self.pushButtonBatchAddPasted.clicked.connect(self.add_pasted_obstacles_to_batch)
+        self.pushButtonBatchClear.clicked.connect(self.clear_batch)
+        self.pushButtonBatchCommit.clicked.connect(self.commit_batch)
+        self.pushButtonFindNearest.clicked.connect(self.find_nearest_obstacles)
+        self.pushButtonFindWithinRadius.clicked.connect(self.find_obstacles_within_radius)
 
     def set_single_mode_drop_down_lists(self) -> None:
         """Fill in drop down list control UI elements with 'human' friendly database value that are used
@@ -96,20 +128,28 @@ class FAADOFManagerDialog(QDialog, FORM_CLASS):
 
     def fetch_single_obstacle(self,
                               ident: str,
-                              ctry_state_name: str) -> dict[str, Any] | Exception:
+                              ctry_state_name: str,
+                              materialized: bool = False) -> dict[str, Any] | Exception:
         """Fetch data for single obstacle.
+        By default obstacle is fetched from the view, materialized view dof.mv_obstacle is refreshed after import only
+        (edit form shows obstacle changes committed from the plugin). Obstacle not found in materialized view
+        (e.g. inserted after last refresh) is fetched from the view.
 
         :param ident: ident of the obstacle
         :param ctry_state_name: ctry/state name of the obstacle
-        :return: obstacle data from view dof.vw_obstacle
+        :param materialized: fetch from materialized view dof.mv_obstacle first
+        :return: obstacle data from view dof.vw_obstacle (or dof.mv_obstacle)
         """
         oas_code = self.db_mapping.oas[ctry_state_name]
         logging.info(f"Fetching data for obstacle: ident {ident}, country/state {ctry_state_name}, oas_code {oas_code}")
-        query = (f"select *\n"
-                 f"from dof.vw_obstacle\n"
-                 f"where oas_code = '{oas_code}'\n"
-                 f"      and obst_number = '{ident}';")
-        data = self.db_utils.select(query=query)
+        statement = FETCH_OBSTACLE_MV_STATEMENT if materialized else FETCH_OBSTACLE_STATEMENT
+        data = self.db_utils.execute_prepared(name=statement, params=(oas_code, ident))
+        if not data and materialized:
+            statement = FETCH_OBSTACLE_STATEMENT
+            data = self.db_utils.execute_prepared(name=statement, params=(oas_code, ident))
+        timing = self.db_utils.timings[statement]
+        logging.info("Obstacle lookup: %.2f ms (mean %.2f ms, %d lookups)",
+                     timing.last_seconds * 1000, timing.mean_seconds * 1000, timing.calls)
         logging.info(data)
         if not data:
             logging.info("No obstacle found")
@@ -201,6 +241,75 @@ class FAADOFManagerDialog(QDialog, FORM_CLASS):
         obstacle_lyr.startEditing()
         obstacle_lyr.dataProvider().addFeatures([feat])
         obstacle_lyr.commitChanges(stopEditing=True)
+        refresh_obstacle_buffers(db_utils=self.db_utils, oas_code=data["oas_code"], obst_number=data["obst_number"])
+        self.refresh_obstacle_index()
+
+    def show_batch(self) -> None:
+        """Show obstacles queued in batch edit mode"""
+        self.listWidgetBatch.clear()
+        self.listWidgetBatch.addItems([f"{oas_code}-{obst_number}  {data['city']}"
+                                       for (oas_code, obst_number), data in self.obstacle_batch.queued.items()])
+        self.labelBatchQueued.setText(f"Queued obstacles: {len(self.obstacle_batch)}")
+
+    def add_single_obstacle_to_batch(self) -> None:
+        """Queue obstacle from data in 'single obstacle mode', it is inserted/updated when batch is committed"""
+        data = self.get_single_obstacle_from_gui()
+        try:
+            data = validate_obstacle(data)
+        except ValueError as e:
+            QMessageBox.critical(QWidget(), "Message", str(e))
+            return
+        self.obstacle_batch.add(data)
+        self.show_batch()
+
+    def add_pasted_obstacles_to_batch(self) -> None:
+        """Queue obstacles from table pasted in 'batch edit mode', invalid rows are reported and not queued"""
+        rows, missing = parse_pasted_table(text=self.plainTextEditBatchPaste.toPlainText(), fields=OBSTACLE_FIELDS)
+        if missing:
+            QMessageBox.critical(QWidget(), "Message", f"Columns missing in pasted table: {', '.join(missing)}")
+            return
+
+        errors = []
+        for row_number, data in enumerate(rows, start=1):
+            try:
+                self.obstacle_batch.add(validate_obstacle(data))
+            except ValueError as e:
+                errors.append(f"Row {row_number}: {e}")
+        self.show_batch()
+        if errors:
+            QMessageBox.warning(QWidget(), "Message", "Rows not added to batch:\n" + "\n".join(errors))
+        else:
+            self.plainTextEditBatchPaste.clear()
+
+    def clear_batch(self) -> None:
+        """Remove all obstacles queued in 'batch edit mode'"""
+        self.obstacle_batch.clear()
+        self.show_batch()
+
+    def commit_batch(self) -> None:
+        """Insert/update all queued obstacles in a single transaction, with single provider call per edit type
+        and single layer repaint
+        """
+        if not len(self.obstacle_batch):
+            QMessageBox.information(QWidget(), "Message", "No obstacles queued.")
+            return
+
+        oas_codes = {oas_code for oas_code, _ in self.obstacle_batch.queued}
+        try:
+            inserted, updated = self.obstacle_batch.commit(layer=self.layers.layers["obstacle"])
+        except BatchCommitError as e:
+            # No obstacle is committed, queued obstacles are kept
+            logging.error(e)
+            QMessageBox.critical(QWidget(), "Message", str(e))
+            return
+
+        for oas_code in oas_codes:
+            refresh_obstacle_buffers(db_utils=self.db_utils, oas_code=oas_code)
+        self.refresh_obstacle_index()
+        self.show_batch()
+
+        logging.info("Batch committed, obstacles inserted: %d, updated: %d", inserted, updated)
+        QMessageBox.information(QWidget(), "Message", f"Obstacles inserted: {inserted}, updated: {updated}.")
 
     def load_dof_data(self) -> None:
         """Load DOF data from CSV/DAT file into obstacle table"""
@@ -208,20 +317,100 @@ class FAADOFManagerDialog(QDialog, FORM_CLASS):
             QMessageBox.information(QWidget(), "Message", "Select DOF file to import.")
             return
 
-        dof_path = Path(self.mQgsFileWidgetSourceFile.filePath())
-        try:
-            if dof_path.suffix.lower() == ".csv":
-                load_csv(
-                    path=dof_path,
-                    db_utils=self.db_utils,
-                    obstacle_type_mapping=self.db_mapping.obstacle_type)
-            elif dof_path.suffix.lower() == ".dat":
-                load_dat(
-                    path=dof_path,
-                    db_utils=self.db_utils,
-                    obstacle_type_mapping=self.db_mapping.obstacle_type)
-        except Exception as e:
-            logging.exception("Error while loading data:\n %s", e)
-            QMessageBox.critical(QWidget(), "Message", "Error while loading DOF.\nCheck log for details.")
+        if self.import_task is not None:
+            QMessageBox.information(QWidget(), "Message", "DOF import is already running.")
+            return
+
+        self.import_task = ImportDOFTask(
+            path=Path(self.mQgsFileWidgetSourceFile.filePath()),
+            db_utils=self.db_utils,
+            obstacle_type_mapping=self.db_mapping.obstacle_type,
+            method="copy"
+        )
+        self.import_task.taskCompleted.connect(self._import_task_done)
+        self.import_task.taskTerminated.connect(self._import_task_done)
+        self.pushButtonLoadData.setEnabled(False)
+        QgsApplication.taskManager().addTask(self.import_task)
+
+    def _import_task_done(self) -> None:
+        """Allow next import when DOF import task completed or terminated"""
+        self.import_task = None
+        self.pushButtonLoadData.setEnabled(True)
+        self.refresh_obstacle_index()
+
+    def refresh_obstacle_index(self) -> None:
+        """Update spatial index with obstacles changed since the last query (if index was built)"""
+        if self.obstacle_index is not None:
+            self.obstacle_index.refresh(db_utils=self.db_utils)
+
+    def get_obstacle_index(self) -> ObstacleIndex:
+        """Return spatial index of obstacles, index is built at the first call.
+
+        :return: obstacle spatial index
+        """
+        if self.obstacle_index is None:
+            # numpy, scipy are imported at the first query, not when plugin is loaded by QGIS
+            from .obstacle_index import ObstacleIndex  # pylint: disable=import-outside-toplevel
+
+            obstacle_index = ObstacleIndex()
+            obstacle_index.build(db_utils=self.db_utils)
+            self.obstacle_index = obstacle_index
+        return self.obstacle_index
+
+    def get_nearby_point_from_gui(self) -> tuple[float, float]:
+        """Return point of nearby obstacles query from plugin GUI 'nearby obstacles mode'
+
+        :return: longitude, latitude (decimal degrees)
+        """
+        return (dms_to_dd(self.lineEditNearbyLongitude.text().strip(), max_degree=180),
+                dms_to_dd(self.lineEditNearbyLatitude.text().strip(), max_degree=90))
+
+    def show_nearby_obstacles(self, obstacles: list[NearbyObstacle]) -> None:
+        """Show result of nearby obstacles query and the tallest obstacle of the result.
+
+        :param obstacles: obstacles sorted by distance
+        """
+        # Imported with obstacle index (numpy), index is already built
+        from .obstacle_index import tallest  # pylint: disable=import-outside-toplevel
+
+        oas_names = {oas_code: name for name, oas_code in self.db_mapping.oas.items()}
+        self.tableWidgetNearby.setSortingEnabled(False)
+        self.tableWidgetNearby.setRowCount(len(obstacles))
+        for row, obstacle in enumerate(obstacles):
+            values = [oas_names.get(obstacle.oas_code, obstacle.oas_code),
+                      obstacle.obst_number,
+                      f"{obstacle.distance_nm:.2f}",
+                      f"{obstacle.amsl:.0f}",
+                      "" if obstacle.agl is None else f"{obstacle.agl:.0f}"]
+            for column, value in enumerate(values):
+                self.tableWidgetNearby.setItem(row, column, QTableWidgetItem(value))
+        self.tableWidgetNearby.setSortingEnabled(True)
+
+        tallest_obstacle = tallest(obstacles)
+        if tallest_obstacle is None:
+            self.labelNearbyTallest.setText("No obstacles found")
         else:
-            QMessageBox.information(QWidget(), "Message", "DOF imported.")
+            self.labelNearbyTallest.setText(f"Obstacles: {len(obstacles)}, tallest: "
+                                            f"{tallest_obstacle.oas_code}-{tallest_obstacle.obst_number}, "
+                                            f"amsl {tallest_obstacle.amsl:.0f} ft, "
+                                            f"distance {tallest_obstacle.distance_nm:.2f} NM")
+
+    def find_nearest_obstacles(self) -> None:
+        """Find obstacles nearest to the point in 'nearby obstacles mode'"""
+        try:
+            lon, lat = self.get_nearby_point_from_gui()
+        except CoordinateError:
+            QMessageBox.critical(QWidget(), "Message", NEARBY_POINT_MESSAGE)
+            return
+        obstacles = self.get_obstacle_index().nearest(lon=lon, lat=lat, k=self.spinBoxNearbyCount.value())
+        self.show_nearby_obstacles(obstacles)
+
+    def find_obstacles_within_radius(self) -> None:
+        """Find obstacles within radius from the point in 'nearby obstacles mode'"""
+        try:
+            lon, lat = self.get_nearby_point_from_gui()
+        except CoordinateError:
+            QMessageBox.critical(QWidget(), "Message", NEARBY_POINT_MESSAGE)
+            return
+        obstacles = self.get_obstacle_index().within(lon=lon, lat=lat, radius_nm=self.doubleSpinBoxNearbyRadius.value())
+        self.show_nearby_obstacles(obstacles)
@@ -0,0 +1,124 @@
+"""Log of successful DOF imports (dof.import_log), import of the file imported last time is skipped.
+No heavy modules are imported, the file is checked before pandas, geopandas are imported.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from datetime import date, datetime
+from pathlib import Path
+
+from .db_utils import DBUtils
+from .types import DOFSource, ImportStats
+
+# First line of DAT file header, e.g.:   CURRENCY DATE = 10/13/24
+CURRENCY_DATE_PATTERN = re.compile(rb"CURRENCY DATE\s*=\s*(\d{1,2}/\d{1,2}/\d{2,4})")
+# Number of bytes searched for currency date at the beginning of the file
+HEADER_SIZE = 1024
+# Daily change file (DDOF.DAT) has DAT file layout, it is identified by file name
+DAILY_CHANGE_PREFIX = "ddof"
+
+
+def file_checksum(path: Path) -> str:
+    """Return SHA-256 checksum of the file.
+
+    :param path: path to the file
+    :return: checksum (hex)
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def read_currency_date(path: Path) -> date | None:
+    """Return currency date from DOF file header.
+
+    :param path: path to the DOF file
+    :return: currency date, None if file has no currency date in header (CSV file) or it cannot be parsed
+    """
+    with open(path, "rb") as f:
+        match = CURRENCY_DATE_PATTERN.search(f.read(HEADER_SIZE))
+    if match is None:
+        return None
+    value = match.group(1).decode("ascii")
+    for date_format in ("%m/%d/%y", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    logging.warning("Unable to parse currency date: %s", value)
+    return None
+
+
+def get_file_type(path: Path) -> str:
+    """Return DOF file type (dof_conf.file_type) based on file name.
+
+    :param path: path to the DOF file
+    :return: csv, dat, ddf (daily change file)
+    """
+    file_type = path.suffix.lower().lstrip(".")
+    if file_type == "dat" and path.name.lower().startswith(DAILY_CHANGE_PREFIX):
+        return "ddf"
+    return file_type
+
+
+def get_source(path: Path) -> DOFSource:
+    """Return identification of DOF file.
+
+    :param path: path to the DOF file
+    :return: file type, size and currency date of the file (checksum computed when used)
+    """
+    return DOFSource(path=path,
+                     file_type=get_file_type(path),
+                     file_size=path.stat().st_size,
+                     currency_date=read_currency_date(path))
+
+
+def is_last_import(db_utils: DBUtils, source: DOFSource) -> bool:
+    """Check if DOF file is the same as the file imported last time.
+    Only the last import is compared, file imported before another file changed obstacles is imported again.
+    File size and currency date are compared first, the whole file is hashed only if they are the same.
+
+    :param db_utils: instance of DBUtils class
+    :param source: DOF file identification
+    :return: True if file was imported last time
+    """
+    last_import = db_utils.select(query="select source_hash, file_size, currency_date, import_timestamp\n"
+                                        "from dof.import_log\n"
+                                        "order by import_timestamp desc, id desc\n"
+                                        "limit 1;")
+    if not last_import:
+        return False
+    # File size is not logged by imports recorded before the column was added
+    if last_import[0]["file_size"] is not None and last_import[0]["file_size"] != source.file_size:
+        return False
+    if last_import[0]["currency_date"] != source.currency_date:
+        return False
+    if last_import[0]["source_hash"] != source.source_hash:
+        return False
+    logging.info("File %s (currency date: %s) already imported at %s.",
+                 source.path, last_import[0]["currency_date"], last_import[0]["import_timestamp"])
+    return True
+
+
+def record_import(db_utils: DBUtils,
+                  source: DOFSource,
+                  stats: ImportStats,
+                  duration_seconds: float) -> None:
+    """Insert successful import of DOF file into import log.
+
+    :param db_utils: instance of DBUtils class
+    :param source: DOF file identification
+    :param stats: import statistics of the file
+    :param duration_seconds: duration of the import (load and merge)
+    """
+    with db_utils.transaction() as cur:
+        cur.execute("insert into dof.import_log (file_type, file_name, source_hash, file_size, currency_date,\n"
+                    "                            rows_read, rows_loaded, duration_seconds)\n"
+                    "values (%s, %s, %s, %s, %s, %s, %s, %s);",
+                    (source.file_type, source.path.name, source.source_hash, source.file_size, source.currency_date,
+                     stats.rows_read, stats.rows_loaded, round(duration_seconds, 3)))
+    logging.info("Import of %s recorded in import log.", source.path)
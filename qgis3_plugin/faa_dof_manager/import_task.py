@@ -0,0 +1,193 @@
+"""Background (QGIS task manager) import of DOF file into obstacle table"""
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+
+import psycopg2
+from qgis.core import QgsTask
+from qgis.PyQt.QtWidgets import (
+    QMessageBox,
+    QWidget
+)
+
+from .db_utils import DBUtils
+from .errors import ImportCanceledError
+from .location_check import check_import_locations
+from .import_log import (
+    get_source,
+    is_last_import,
+    record_import
+)
+from .merge_dof import (
+    MERGE_STEPS,
+    apply_changes,
+    merge_import,
+    refresh_obstacle_view
+)
+from .types import (
+    ImportStats,
+    MergeStats
+)
+
+# Share of the task progress (percent) reported while loading file, the rest is reported while merging
+LOAD_PROGRESS = 90
+# DAT file is read by memory-mapped scanner, faster than read_fwf in worker processes and no processes are spawned
+DAT_ENGINE = "mmap"
+# Prepared DOF data cache, import of the same file again (e.g. into another database) does not parse nor prepare it
+PARSED_CACHE_DIR = Path(__file__).resolve().parent / "cache" / "parsed"
+
+
+class ImportDOFTask(QgsTask):
+
+    """Import DOF CSV/DAT file (parse, validate, upload, check, merge) in QGIS task manager.
+    Daily change file (DDOF.DAT) is applied to obstacle table, other obstacles are not touched.
+    Each stage is committed separately, cancel (or failure) rolls back changes of the current stage only:
+    - load: auxiliary table dof.import_obstacle (replaced when whole file is loaded)
+    - location check: report table dof.import_location_mismatch
+    - merge: obstacle table
+    Cancel after load leaves dof.import_obstacle replaced, obstacle table is not changed until merge is committed.
+    Once merge is committed, cancel is ignored: materialized obstacle view is refreshed (failure is reported as warning)
+    and the import is logged.
+    Import is skipped if the file is the same as the file imported last time.
+    """
+
+    def __init__(self,
+                 path: Path,
+                 db_utils: DBUtils,
+                 obstacle_type_mapping: dict[str, int],
+                 method: str = "copy") -> None:
+        """
+        :param path: path to the DOF file
+        :param db_utils: instance of DBUtils class
+        :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+        :param method: method to load data into database, one of load_dof.LOAD_METHODS
+        """
+        super().__init__(f"Import DOF: {path.name}", QgsTask.CanCancel)
+        self.path = path
+        self.db_utils = db_utils
+        self.obstacle_type_mapping = obstacle_type_mapping
+        self.method = method
+        self.stage: str | None = None
+        self.total_rows = 0
+        self.import_stats: ImportStats | None = None
+        self.merge_stats: MergeStats | None = None
+        self.view_refresh_error: Exception | None = None
+        self.exception: Exception | None = None
+
+    def _progress(self, stage: str, done: int) -> None:
+        """Report import progress, cancel import if task is canceled.
+
+        :param stage: import stage
+        :param done: rows read (parse, validate, upload stages), merge steps completed (merge stage)
+        """
+        if self.isCanceled():
+            raise ImportCanceledError
+        if stage != self.stage:
+            logging.info("Import stage: %s", stage)
+            self.stage = stage
+        if stage == "merge":
+            progress = LOAD_PROGRESS + (100 - LOAD_PROGRESS) * done / MERGE_STEPS
+        else:
+            progress = LOAD_PROGRESS * min(done / max(self.total_rows, 1), 1)
+        self.setProgress(progress)
+
+    def run(self) -> bool:
+        """Import DOF file (executed in background thread).
+
+        :return: True if import completed, False if it was canceled or failed
+        """
+        if self.path.suffix.lower() not in (".csv", ".dat"):
+            self.exception = ValueError(f"Unsupported DOF file: {self.path}")
+            return False
+        try:
+            start = time.perf_counter()
+            source = get_source(self.path)
+            if is_last_import(db_utils=self.db_utils, source=source):
+                self.import_stats = ImportStats(source=source, skipped=True)
+                return True
+
+            # pandas, geopandas are imported when import starts, not when plugin is loaded by QGIS
+            # (nor when the file imported last time is skipped)
+            from .load_dof import (  # pylint: disable=import-outside-toplevel
+                count_lines,
+                load_csv,
+                load_dat,
+                load_ddof
+            )
+
+            load = {"csv": load_csv, "dat": load_dat, "ddf": load_ddof}[source.file_type]
+            self.total_rows = count_lines(self.path)
+            options = {"engine": DAT_ENGINE} if load is not load_csv else {}
+            self.import_stats = load(
+                path=self.path,
+                db_utils=self.db_utils,
+                obstacle_type_mapping=self.obstacle_type_mapping,
+                method=self.method,
+                progress=self._progress,
+                cache_dir=PARSED_CACHE_DIR,
+                source=source,
+                **options
+            )
+            self.import_stats.location_mismatches = check_import_locations(db_utils=self.db_utils,
+                                                                           progress=self._progress)
+            merge = apply_changes if source.file_type == "ddf" else merge_import
+            self.merge_stats = merge(db_utils=self.db_utils, progress=self._progress)
+            # Obstacle table is committed, import is logged even if materialized view is not refreshed
+            try:
+                refresh_obstacle_view(self.db_utils)
+            except psycopg2.Error as e:
+                logging.warning("Materialized obstacle view not refreshed: %s", e)
+                self.view_refresh_error = e
+            record_import(db_utils=self.db_utils,
+                          source=source,
+                          stats=self.import_stats,
+                          duration_seconds=time.perf_counter() - start)
+            return True
+        except ImportCanceledError:
+            logging.info("DOF import canceled, changes of %s stage rolled back.", self.stage)
+            return False
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.exception = e
+            return False
+
+    def _location_mismatches_message(self) -> str:
+        """Return message about obstacles located outside their country/state boundary, empty if there are none"""
+        if not self.import_stats.location_mismatches:
+            return ""
+        return (f"\nObstacles outside their country/state boundary: {self.import_stats.location_mismatches} "
+                f"(see dof.import_location_mismatch)")
+
+    def _view_refresh_message(self) -> str:
+        """Return warning about materialized obstacle view not refreshed, empty if it was refreshed"""
+        if self.view_refresh_error is None:
+            return ""
+        return ("\nWarning: materialized obstacle view dof.mv_obstacle not refreshed, "
+                "refresh it with: select dof.refresh_mv_obstacle();")
+
+    def finished(self, result: bool) -> None:
+        """Show import result (executed in main thread).
+
+        :param result: value returned by run
+        """
+        if result and self.import_stats.skipped:
+            currency_date = self.import_stats.source.currency_date
+            QMessageBox.information(QWidget(), "Message",
+                                    f"DOF file already imported"
+                                    f"{f' (currency date: {currency_date:%m/%d/%Y})' if currency_date else ''}, "
+                                    f"import skipped.")
+        elif result:
+            QMessageBox.information(QWidget(), "Message",
+                                    f"DOF imported.\n"
+                                    f"Obstacles inserted: {self.merge_stats.inserted}, "
+                                    f"changed: {self.merge_stats.changed}, "
+                                    f"retired: {self.merge_stats.retired}, "
+                                    f"unchanged: {self.merge_stats.unchanged}"
+                                    f"{self._location_mismatches_message()}"
+                                    f"{self._view_refresh_message()}")
+        elif self.exception is None:
+            QMessageBox.information(QWidget(), "Message", "DOF import canceled.")
+        else:
+            logging.error("Error while loading data:\n %s", self.exception, exc_info=self.exception)
+            QMessageBox.critical(QWidget(), "Message", "Error while loading DOF.\nCheck log for details.")
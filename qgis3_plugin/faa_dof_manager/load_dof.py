@@ -1,19 +1,58 @@
 """Load DOF CSV file into obstacle table"""
+from __future__ import annotations
+
+import io
 import logging
+import multiprocessing
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 import geopandas as gpd
 import pandas as pd
-from sqlalchemy import create_engine
+from psycopg2.extensions import cursor
 
-from .coordinates import dms_to_dd
+from .dat_scanner import read_dat_chunks_mmap
 from .db_utils import DBUtils
-
-OasCode = str
-ObstIdent = str
-HorAccCode = int
-VertAccCode = str
+from .import_log import get_source, is_last_import
+from .parsed_cache import cached_chunks
+from .obstacle_data_validator import ERROR_NOT_NUMBER, ERROR_REASONS, validate_obstacles
+from .types import DOFSource, ImportStats, ProgressCallback
+
+# Methods to load prepared data into auxiliary table dof.import_obstacle:
+# to_postgis - GeoDataFrame.to_postgis (INSERT statements, geometry built on the client)
+# copy - COPY FROM STDIN, geometry built on the server from lon, lat columns
+LOAD_METHODS = ("to_postgis", "copy")
+# PostgreSQL column types for pandas dtype kinds, same as used by GeoDataFrame.to_postgis
+COLUMN_TYPES = {
+    "i": "bigint",
+    "u": "bigint",
+    "f": "double precision",
+    "b": "boolean",
+    "O": "text"
+}
+# Default number of rows read, prepared and loaded at once
+CHUNK_SIZE = 50_000
+# Integer obstacle table columns. Like all other columns, they are read from DOF files as strings (the same column types
+# in each chunk of the file, malformed value does not abort reading) and converted to integers when validated
+INTEGER_COLUMNS = ["quantity", "agl", "amsl", "hor_acc_code", "julian_date"]
+COORDINATE_COLUMNS = ["lon", "lat"]
+# Columns of obstacle table which values may be missing
+NULLABLE_COLUMNS = ["quantity", "agl", "julian_date"]
+# Number of header rows in DAT file
+DAT_HEADER_ROWS = 4
+# Engines to read DAT file:
+# read_fwf - pandas.read_fwf, optionally byte ranges of the file parsed in worker processes
+# mmap - memory-mapped file, fields sliced into NumPy byte arrays (dat_scanner)
+DAT_ENGINES = ("read_fwf", "mmap")
+# Number of byte ranges parsed by each worker process when DAT file is parsed in parallel
+RANGES_PER_WORKER = 4
+# Maximum size of byte range, large files are split into more ranges to keep memory bounded
+MAX_RANGE_BYTES = 32 * 1024 * 1024
+# Number of byte ranges submitted to each worker process ahead of the range being consumed
+RANGES_IN_FLIGHT_PER_WORKER = 2
 
 
 def get_csv_columns(csv_rules: dict[str, Any]) -> list[str]:
@@ -28,35 +67,203 @@ def get_csv_columns(csv_rules: dict[str, Any]) -> list[str]:
     return columns
 
 
-def parse_oas(oas: str) -> tuple[OasCode, ObstIdent]:
-    """Return OAS code and obstacle ident based on oas value
+def split_oas(oas: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Return OAS codes and obstacle idents based on OAS column values.
 
-    :param oas: OAS column value
-    :return: oas code, obstacle ident
+    :param oas: OAS column values
+    :return: oas codes, obstacle idents
     """
-    oas_code, obst_ident = oas.split("-")
-    return oas_code, obst_ident
+    parts = oas.str.split("-", n=1, expand=True)
+    return parts[0], parts[1]
 
 
-def parse_accuracy(acc: str) -> tuple[HorAccCode, VertAccCode]:
-    """Return horizontal and vertical accuracy codes based on accuracy colum value.
+def split_accuracy(acc: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Return horizontal and vertical accuracy codes based on accuracy column values.
 
-    :param acc: accuracy column value
-    :return: horizontal accuracy code, vertical accuracy code
+    :param acc: accuracy column values (2 characters: horizontal code, vertical code)
+    :return: horizontal accuracy codes (NA for malformed codes), vertical accuracy codes
     """
-    h_acc = acc[0]
-    v_acc = acc[1]
-    return int(h_acc), v_acc
+    return pd.to_numeric(acc.str[0], errors="coerce").astype("Int64"), acc.str[1]
 
 
+def map_obstacle_type(obst_type: pd.Series,
+                      obstacle_type_mapping: dict[str, int]) -> pd.Series:
+    """Return obstacle type ids based on obstacle type column values.
+    Lookup is done once per distinct obstacle type (categories), not once per row.
 
-def load_data(df: pd.DataFrame,
-              db_utils: DBUtils) -> None:
-    """Load 'prepared' data into PostgreSQL database..
+    :param obst_type: obstacle type column values
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :return: obstacle type ids
+    """
+    categorical = obst_type.astype("category")
+    if categorical.isna().any():
+        raise KeyError("Obstacle type value missing")
+    unknown = categorical.cat.categories.difference(list(obstacle_type_mapping.keys()))
+    if not unknown.empty:
+        raise KeyError(f"Unknown obstacle types: {', '.join(unknown)}")
+
+    type_ids = categorical.cat.categories.map(obstacle_type_mapping).to_numpy(dtype="int64")
+    return pd.Series(type_ids[categorical.cat.codes.to_numpy()], index=obst_type.index)
+
+
+def get_report_file(reason: str) -> Path:
+    """Return report file of rejected rows.
+
+    :param reason: reason of rejection, example: accuracy, coordinates
+    :return: report file path
+    """
+    return Path(f"invalid_{reason}.csv")
 
+
+def report_rejected(df_rejected: pd.DataFrame,
+                    reason: str,
+                    stats: ImportStats) -> None:
+    """Write rejected rows into report file invalid_<reason>.csv and count them.
+    Report file is created for the first chunk with rejected rows, rows from next chunks are appended.
+
+    :param df_rejected: rejected rows
+    :param reason: reason of rejection, example: accuracy, coordinates
+    :param stats: import statistics of the file
+    """
+    first_report = reason not in stats.rows_rejected
+    df_rejected.to_csv(
+        get_report_file(reason),
+        mode="w" if first_report else "a",
+        header=first_report,
+        index=False
+    )
+    stats.rows_rejected[reason] = stats.rows_rejected.get(reason, 0) + len(df_rejected)
+
+
+def convert_integer_columns(df: pd.DataFrame) -> pd.Series:
+    """Convert integer columns (INTEGER_COLUMNS read as strings, or numbers) to integers (Int64), in place.
+    Malformed and non-integer values are converted to NA.
+
+    :param df: obstacle data
+    :return: mask of rows with malformed, non-integer or missing (columns not in NULLABLE_COLUMNS) values
+    """
+    invalid = pd.Series(False, index=df.index)
+    for column in INTEGER_COLUMNS:
+        if column not in df.columns:
+            continue
+        text = df[column]
+        if text.dtype == "object":
+            text = text.astype("string").str.strip().replace("", pd.NA)
+        values = pd.to_numeric(text, errors="coerce")
+        integer = values.isna() | (values % 1 == 0)
+        invalid |= (text.notna() & values.isna()) | ~integer
+        if column not in NULLABLE_COLUMNS:
+            invalid |= values.isna()
+        df[column] = values.where(integer).astype("Int64")
+    return invalid
+
+
+def quarantine_invalid(df: pd.DataFrame,
+                       stats: ImportStats,
+                       lon_column: str = "lon",
+                       lat_column: str = "lat") -> pd.DataFrame:
+    """Validate all rows at once, report invalid rows and return valid ones.
+    Numeric values read as strings are converted, malformed values are reported as invalid numbers.
+    Invalid row is reported once (with values as read), with the first of its errors (ERROR_REASONS order)
+    as reason of rejection and all its error codes in error_code column.
+
+    :param df: obstacle data, coordinates converted to DD into lon, lat columns
+    :param stats: import statistics of the file
+    :param lon_column: longitude column (DMS strings or DD numbers)
+    :param lat_column: latitude column (DMS strings or DD numbers)
+    :return: valid rows
+    """
+    raw_values = df[[column for column in INTEGER_COLUMNS if column in df.columns]].copy()
+    error_codes = validate_obstacles(df=df, lon_column=lon_column, lat_column=lat_column,
+                                     nullable_fields=NULLABLE_COLUMNS)
+    error_codes[convert_integer_columns(df)] |= ERROR_NOT_NUMBER
+    invalid_mask = error_codes != 0
+    if not invalid_mask.any():
+        return df
+
+    reported = pd.Series(False, index=df.index)
+    for error_code, reason in ERROR_REASONS.items():
+        reason_mask = invalid_mask & ~reported & ((error_codes & error_code) != 0)
+        if reason_mask.any():
+            df_rejected = df[reason_mask].assign(error_code=error_codes[reason_mask])
+            df_rejected[raw_values.columns] = raw_values[reason_mask]
+            report_rejected(df_rejected=df_rejected,
+                            reason=reason,
+                            stats=stats)
+            reported |= reason_mask
+    return df[~invalid_mask].copy()
+
+
+def create_copy_table(cur: cursor, df: pd.DataFrame) -> None:
+    """Create temporary table for COPY with columns of prepared data.
+
+    :param cur: cursor in transaction used to load data
     :param df: prepared data
+    """
+    columns = ",\n".join(f"{column} {COLUMN_TYPES[dtype.kind]}" for column, dtype in df.dtypes.items())
+    cur.execute(f"create temporary table import_obstacle_copy (\n{columns}\n) on commit drop;")
+
+
+def copy_rows(cur: cursor, df: pd.DataFrame) -> None:
+    """Copy prepared data into temporary table with COPY FROM STDIN (CSV format).
+
+    :param cur: cursor in transaction used to load data
+    :param df: prepared data
+    """
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cur.copy_expert(
+        f"copy import_obstacle_copy ({', '.join(df.columns)}) from stdin with (format csv);",
+        buffer
+    )
+
+
+def create_import_table(cur: cursor, columns: list[str]) -> None:
+    """Replace auxiliary table dof.import_obstacle with data copied into temporary table.
+    Location is built from lon, lat columns, table schema is the same as created by GeoDataFrame.to_postgis.
+
+    :param cur: cursor in transaction used to load data
+    :param columns: columns of prepared data
+    """
+    columns = ", ".join(column for column in columns if column not in ["lon", "lat"])
+    cur.execute("drop table if exists dof.import_obstacle;")
+    cur.execute(f"create table dof.import_obstacle as\n"
+                f"select {columns},\n"
+                f"       ST_SetSRID(ST_MakePoint(lon, lat), 4326)::geometry(Point, 4326) as geometry\n"
+                f"from import_obstacle_copy;")
+    cur.execute("create index idx_import_obstacle_geometry on dof.import_obstacle using gist (geometry);")
+
+
+def copy_chunks(chunks: Iterable[pd.DataFrame],
+                db_utils: DBUtils) -> None:
+    """Load chunks of 'prepared' data into PostgreSQL database with COPY FROM STDIN.
+
+    :param chunks: prepared data
     :param db_utils: instance of DBUtils class
     """
+    logging.info("Copying data into auxiliary table...")
+    with db_utils.transaction() as cur:
+        columns = None
+        for chunk in chunks:
+            if columns is None:
+                create_copy_table(cur=cur, df=chunk)
+                columns = list(chunk.columns)
+            copy_rows(cur=cur, df=chunk[columns])
+
+        if columns is None:
+            logging.info("No data to load.")
+            return
+        create_import_table(cur=cur, columns=columns)
+    logging.info("Loading data into auxiliary table completed.")
+
+
+def to_geodataframe(df: pd.DataFrame) -> gpd.GeoDataFrame:
+    """Return prepared data with point geometry built from lon, lat columns.
+
+    :param df: prepared data
+    :return: prepared data with geometry
+    """
     gdf = gpd.GeoDataFrame(
         data=df,
         geometry=gpd.points_from_xy(
@@ -66,51 +273,156 @@ def load_data(df: pd.DataFrame,
         crs="EPSG:4326"
     )
     gdf.drop(columns=["lon", "lat"], inplace=True)
-    logging.info("Data preparation complete.")
+    return gdf
+
 
-    engine = create_engine(
-        "postgresql+psycopg2://{user}:{password}@{host}:5432/{database}".format(
-            user=db_utils._user,
-            password=db_utils._password,
-            host=db_utils._host,
-            database=db_utils._database
-        ))
+def insert_chunks(chunks: Iterable[pd.DataFrame],
+                  db_utils: DBUtils) -> None:
+    """Load chunks of 'prepared' data into PostgreSQL database with GeoDataFrame.to_postgis.
 
+    :param chunks: prepared data
+    :param db_utils: instance of DBUtils class
+    """
     logging.info("Inserting data into auxiliary table...")
-    with engine.connect() as con:
-        con.execution_options(isolation_level="AUTOCOMMIT")
-        gdf.to_postgis(
-            name="import_obstacle",
-            schema="dof",
-            con=con,
-            if_exists="replace",
-            index=False,
-            chunksize=10000
-        )
+    with db_utils.engine.begin() as con:
+        if_exists = "replace"
+        for chunk in chunks:
+            to_geodataframe(chunk).to_postgis(
+                name="import_obstacle",
+                schema="dof",
+                con=con,
+                if_exists=if_exists,
+                index=False,
+                chunksize=10000
+            )
+            if_exists = "append"
     logging.info("Loading data into auxiliary table completed.")
 
-def load_csv(
-        path: Path,
-        db_utils: DBUtils,
-        obstacle_type_mapping: dict[str, int]
-) -> None:
-    """Load DOF CSV file into PostgreSQL database.
 
-    :param path: path to the DOF file
+def number_rows(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Add row number in file order (row_no column), e.g. the last of several actions for the same obstacle
+    in daily change file is applied.
+
+    :param chunks: prepared data in file order
+    :return: prepared data with row numbers
+    """
+    rows = 0
+    for chunk in chunks:
+        chunk["row_no"] = range(rows, rows + len(chunk))
+        rows += len(chunk)
+        yield chunk
+
+
+def load_chunks(chunks: Iterable[pd.DataFrame],
+                db_utils: DBUtils,
+                method: str = "to_postgis") -> None:
+    """Load chunks of 'prepared' data into PostgreSQL database, rows are numbered in file order (row_no).
+    Chunks are consumed one by one, so only one chunk is kept in memory.
+
+    :param chunks: prepared data
     :param db_utils: instance of DBUtils class
-    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :param method: load method, one of LOAD_METHODS
     """
-    logging.info("Loading obstacles from CSV file (path: %s) initiated.", path)
-    csv_config = db_utils.select(query="select settings\n"
-                                       "from dof.dof_conf\n"
-                                       "where file_type = 'csv';")[0][0]
-    logging.info("Preparing data...")
-    df = pd.read_csv(
+    if method == "copy":
+        copy_chunks(chunks=number_rows(chunks), db_utils=db_utils)
+    elif method == "to_postgis":
+        insert_chunks(chunks=number_rows(chunks), db_utils=db_utils)
+    else:
+        raise ValueError(f"Unsupported load method: {method}, expected one of: {', '.join(LOAD_METHODS)}")
+
+
+def load_data(df: pd.DataFrame,
+              db_utils: DBUtils,
+              method: str = "to_postgis") -> None:
+    """Load 'prepared' data into PostgreSQL database..
+
+    :param df: prepared data
+    :param db_utils: instance of DBUtils class
+    :param method: load method, one of LOAD_METHODS
+    """
+    load_chunks(chunks=[df], db_utils=db_utils, method=method)
+
+
+def count_lines(path: Path) -> int:
+    """Return number of lines in the file, used to report import progress.
+
+    :param path: path to the file
+    :return: number of lines
+    """
+    with open(path, "rb") as f:
+        return sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b""))
+
+
+def prepare_chunks(raw_chunks: Iterable[pd.DataFrame],
+                   prepare: Callable[[pd.DataFrame], pd.DataFrame],
+                   stats: ImportStats,
+                   progress: ProgressCallback | None = None) -> Iterator[pd.DataFrame]:
+    """Return prepared chunks of data, progress is reported before each stage of every chunk.
+
+    :param raw_chunks: raw data chunks
+    :param prepare: function preparing raw data chunk
+    :param stats: import statistics of the file
+    :param progress: import progress callback
+    :return: prepared data chunks
+    """
+    progress = progress or (lambda stage, done: None)
+    progress("parse", stats.rows_read)
+    for chunk in raw_chunks:
+        progress("validate", stats.rows_read + len(chunk))
+        prepared = prepare(chunk)
+        progress("upload", stats.rows_read)
+        yield prepared
+        progress("parse", stats.rows_read)
+
+
+def get_csv_dtypes(csv_rules: dict[str, Any]) -> dict[str, str]:
+    """Return data types of columns to load from CSV file.
+
+    :param csv_rules: rules for mapping CSV input data columns to database table columns.
+    :return: data types of columns to be imported from input file
+    """
+    dtypes = {column: "str" for column in csv_rules["csv_table_map"]}
+    dtypes.update({column: "float64" for column in csv_rules["coordinates_map"].keys()})
+    dtypes.update({column: "str" for column in csv_rules["parsed_map"].values()})
+    return dtypes
+
+
+def read_csv_chunks(path: Path,
+                    csv_rules: dict[str, Any],
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Return DOF CSV file data in chunks.
+
+    :param path: path to the DOF file
+    :param csv_rules: rules for mapping CSV input data columns to database table columns.
+    :param chunk_size: number of rows in chunk
+    :return: raw data chunks
+    """
+    yield from pd.read_csv(
         path,
-        usecols=get_csv_columns(csv_config),
+        usecols=get_csv_columns(csv_rules),
+        dtype=get_csv_dtypes(csv_rules),
         skipinitialspace=True,
+        chunksize=chunk_size
     )
-    logging.info("CSV data read, number of rows: %d", len(df))
+
+
+def prepare_csv(
+        df: pd.DataFrame,
+        csv_config: dict[str, Any],
+        obstacle_type_mapping: dict[str, int],
+        stats: ImportStats | None = None
+) -> pd.DataFrame:
+    """Return DOF CSV data with columns mapped and parsed into obstacle table columns.
+    Rows with invalid accuracy or invalid obstacle data (quarantine_invalid) are reported and skipped.
+
+    :param df: raw data read from DOF CSV file
+    :param csv_config: rules for mapping CSV input data columns to database table columns
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :param stats: import statistics of the file, updated with rows of prepared data
+    :return: prepared data
+    """
+    stats = stats or ImportStats()
+    stats.rows_read += len(df)
     df = df.apply(lambda col: col.str.strip() if col.dtype == "object" else col)
 
     df.rename(
@@ -123,69 +435,462 @@ def load_csv(
     )
 
     oas_code_column = csv_config["parsed_map"]["oas_ident"]
-    df["oas_code"] = df.apply(lambda row: parse_oas(row[oas_code_column])[0], axis=1)
-    df["obst_number"] = df.apply(lambda row: parse_oas(row[oas_code_column])[1], axis=1)
+    df["oas_code"], df["obst_number"] = split_oas(df[oas_code_column])
     df.drop(columns=[oas_code_column], inplace=True)
 
     accuracy_column = csv_config["parsed_map"]["accuracy"]
     accuracy_invalid_mask = df[accuracy_column].str.strip().str.len() != 2
     df_invalid_acc = df[accuracy_invalid_mask]
     if not df_invalid_acc.empty:
-        logging.info("Number of rows with invalid accuracy column (2 characters expected): %d",
-                     len(df_invalid_acc))
-        df_invalid_acc.to_csv("invalid_accuracy.csv", index=False)
+        report_rejected(df_rejected=df_invalid_acc, reason="accuracy", stats=stats)
         df = df.drop(df[accuracy_invalid_mask].index)
-    df["hor_acc_code"] = df.apply(lambda row: parse_accuracy(row[accuracy_column])[0], axis=1)
-    df["vert_acc_code"] = df.apply(lambda row: parse_accuracy(row[accuracy_column])[1], axis=1)
+    df["hor_acc_code"], df["vert_acc_code"] = split_accuracy(df[accuracy_column])
     df.drop(columns=[accuracy_column], inplace=True)
 
     obstacle_type_column = csv_config["parsed_map"]["obstacle_type"]
-    df["type_id"] = df.apply(lambda row: obstacle_type_mapping[row[obstacle_type_column]], axis=1)
+    df["type_id"] = map_obstacle_type(df[obstacle_type_column], obstacle_type_mapping)
     df.drop(columns=[obstacle_type_column], inplace=True)
 
-    load_data(df=df,
-              db_utils=db_utils)
-    logging.info("Number of rows loaded into database: %d",len(df))
+    df = quarantine_invalid(df=df, stats=stats)
+    stats.rows_loaded += len(df)
+    return df
 
 
-def load_dat(
+def log_stats(stats: ImportStats) -> None:
+    """Log import statistics of the file.
+
+    :param stats: import statistics of the file
+    """
+    logging.info("Data read, number of rows: %d", stats.rows_read)
+    for reason, rows in stats.rows_rejected.items():
+        logging.info("Number of rows with invalid %s: %d (see invalid_%s.csv)", reason, rows, reason)
+    logging.info("Number of rows loaded into database: %d", stats.rows_loaded)
+
+
+def load_csv(
         path: Path,
         db_utils: DBUtils,
-        obstacle_type_mapping: dict[str, int]
-) -> None:
-    """Load DOF DAT file into PostgreSQL database.
+        obstacle_type_mapping: dict[str, int],
+        method: str = "to_postgis",
+        chunk_size: int = CHUNK_SIZE,
+        progress: ProgressCallback | None = None,
+        cache_dir: Path | None = None,
+        source: DOFSource | None = None,
+        skip_unchanged: bool = False
+) -> ImportStats:
+    """Load DOF CSV file into PostgreSQL database.
+    File is read, prepared and loaded in chunks of chunk_size rows.
+    Prepared data is cached in cache_dir, file is not parsed nor prepared again if it was imported before.
+    Loading is skipped if skip_unchanged and the file is the same as the file imported last time.
 
     :param path: path to the DOF file
     :param db_utils: instance of DBUtils class
     :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :param method: method to load data into database, one of LOAD_METHODS
+    :param chunk_size: number of rows read, prepared and loaded at once
+    :param progress: import progress callback, called with stage and number of rows read so far
+    :param cache_dir: directory of prepared data cache, default: prepared data not cached
+    :param source: file identification (checksum, currency date), default: computed from the file
+    :param skip_unchanged: skip loading if the file was imported last time (dof.import_log)
+    :return: import statistics of the file
     """
-    logging.info("Loading obstacles from DAT file (path: %s) initiated.", path)
-    dat_config = db_utils.select(query="select settings\n"
-                                       "from dof.dof_conf\n"
-                                       "where file_type = 'dat';")[0][0]["fields"]
+    logging.info("Loading obstacles from CSV file (path: %s) initiated.", path)
+    source = source or get_source(path)
+    if skip_unchanged and is_last_import(db_utils=db_utils, source=source):
+        return ImportStats(source=source, skipped=True)
+    csv_config, revision_date = db_utils.select(query="select settings, revision_date\n"
+                                                      "from dof.dof_conf\n"
+                                                      "where file_type = 'csv';")[0]
+    logging.info("Preparing data...")
+    stats = ImportStats(source=source)
+    chunks = cached_chunks(
+        source_hash=source.source_hash,
+        file_type="csv",
+        revision_date=revision_date,
+        obstacle_type_mapping=obstacle_type_mapping,
+        cache_dir=cache_dir,
+        prepare_chunks=lambda: prepare_chunks(
+            raw_chunks=read_csv_chunks(path=path, csv_rules=csv_config, chunk_size=chunk_size),
+            prepare=lambda chunk: prepare_csv(df=chunk,
+                                              csv_config=csv_config,
+                                              obstacle_type_mapping=obstacle_type_mapping,
+                                              stats=stats),
+            stats=stats,
+            progress=progress
+        ),
+        chunk_size=chunk_size,
+        stats=stats,
+        report_file=get_report_file,
+        progress=progress
+    )
+    load_chunks(chunks=chunks,
+                db_utils=db_utils,
+                method=method)
+    log_stats(stats)
+    return stats
+
 
-    dat_config = {
+def get_dat_colspecs(dat_fields: dict[str, list[int]]) -> dict[str, tuple[int, int]]:
+    """Return DAT file column specifications (half-open intervals) based on fields extents from dof_conf.
+
+    :param dat_fields: field name, field extent (first and last column, 1-based)
+    :return: field name, column specification as expected by read_fwf
+    """
+    return {
         field_name: (field_extent[0] - 1, field_extent[1])
         for field_name, field_extent
-        in dat_config.items()
+        in dat_fields.items()
     }
 
-    logging.info("Preparing data...")
-    df = pd.read_fwf(
+
+def get_fwf_options(dat_fields: dict[str, list[int]]) -> dict[str, Any]:
+    """Return read_fwf options to read DAT file data rows.
+
+    :param dat_fields: field name, field extent (first and last column, 1-based)
+    :return: read_fwf keyword arguments
+    """
+    colspecs = get_dat_colspecs(dat_fields)
+    return {
+        "colspecs": list(colspecs.values()),
+        "names": list(colspecs.keys()),
+        "dtype": {field_name: "str" for field_name in colspecs}
+    }
+
+
+def read_dat_chunks(path: Path,
+                    dat_fields: dict[str, list[int]],
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Return DOF DAT file data in chunks.
+
+    :param path: path to the DOF file
+    :param dat_fields: field name, field extent (first and last column, 1-based)
+    :param chunk_size: number of rows in chunk
+    :return: raw data chunks
+    """
+    yield from pd.read_fwf(
         path,
-        sep="\s+",
-        skiprows=4,
-        colspecs=list(dat_config.values()),
-        names=dat_config.keys(),
-        dtype={ "obst_number": str}
+        skiprows=DAT_HEADER_ROWS,
+        chunksize=chunk_size,
+        **get_fwf_options(dat_fields)
     )
-    df["lon"] = df.apply(lambda row: dms_to_dd(row["lon_src"], 180), axis=1)
-    df["lat"] = df.apply(lambda row: dms_to_dd(row["lat_src"], 90), axis=1)
+
+
+def get_dat_byte_ranges(path: Path, ranges: int) -> list[tuple[int, int]]:
+    """Split DAT file data rows (after header rows) into byte ranges, each range starts at the beginning of a line.
+
+    :param path: path to the DOF file
+    :param ranges: requested number of ranges
+    :return: start, end (exclusive) offset of each non-empty range
+    """
+    with open(path, "rb") as f:
+        for _ in range(DAT_HEADER_ROWS):
+            f.readline()
+        data_start = f.tell()
+        file_size = f.seek(0, io.SEEK_END)
+
+        boundaries = [data_start]
+        range_size = max((file_size - data_start) // max(ranges, 1), 1)
+        for i in range(1, ranges):
+            f.seek(max(data_start + i * range_size, boundaries[-1]))
+            if f.tell() > data_start:
+                # Move to the beginning of the next line unless offset is already at the beginning of the line
+                f.seek(f.tell() - 1)
+                f.readline()
+            boundaries.append(min(f.tell(), file_size))
+        boundaries.append(file_size)
+
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def read_dat_range(path: Path,
+                   start: int,
+                   end: int,
+                   dat_fields: dict[str, list[int]]) -> pd.DataFrame:
+    """Return DOF DAT file data rows from byte range (executed in worker process).
+
+    :param path: path to the DOF file
+    :param start: range start offset, beginning of a line
+    :param end: range end offset (exclusive), beginning of a line or end of the file
+    :param dat_fields: field name, field extent (first and last column, 1-based)
+    :return: raw data
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    fwf_options = get_fwf_options(dat_fields)
+    try:
+        return pd.read_fwf(io.BytesIO(data), **fwf_options)
+    except pd.errors.EmptyDataError:
+        # Range with blank lines only
+        return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in fwf_options["dtype"].items()})
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return pool of worker processes.
+    Processes are spawned (not forked), import runs in QGIS task thread.
+
+    :param workers: number of worker processes
+    :return: process pool
+    """
+    context = multiprocessing.get_context("spawn")
+    if sys.platform == "win32" and not Path(sys.executable).stem.lower().startswith("python"):
+        # In QGIS on Windows sys.executable is QGIS application, not Python interpreter
+        context.set_executable(str(Path(sys.exec_prefix) / "pythonw.exe"))
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def read_dat_chunks_parallel(path: Path,
+                             dat_fields: dict[str, list[int]],
+                             chunk_size: int = CHUNK_SIZE,
+                             workers: int = 2) -> Iterator[pd.DataFrame]:
+    """Return DOF DAT file data in chunks, byte ranges of the file are parsed in worker processes.
+    Chunks are the same as returned by read_dat_chunks (rows, index, column types).
+    Only a bounded window of ranges is parsed ahead, memory does not grow with file size.
+
+    :param path: path to the DOF file
+    :param dat_fields: field name, field extent (first and last column, 1-based)
+    :param chunk_size: number of rows in chunk
+    :param workers: number of worker processes
+    :return: raw data chunks
+    """
+    ranges = max(workers * RANGES_PER_WORKER, path.stat().st_size // MAX_RANGE_BYTES + 1)
+    byte_ranges = get_dat_byte_ranges(path=path, ranges=ranges)
+    executor = get_process_pool(workers)
+    try:
+        pending: deque[Future] = deque()
+        submitted = 0
+        rest = None
+        rows = 0
+        # Ranges are consumed in file order, rows are yielded in chunks of chunk_size rows
+        for range_index in range(len(byte_ranges)):
+            # Next ranges are submitted as ranges are consumed, consumed ranges are not referenced
+            while submitted < len(byte_ranges) and len(pending) < workers * RANGES_IN_FLIGHT_PER_WORKER:
+                start, end = byte_ranges[submitted]
+                pending.append(executor.submit(read_dat_range, path, start, end, dat_fields))
+                submitted += 1
+            df = pending.popleft().result()
+            if rest is not None:
+                df = pd.concat([rest, df], ignore_index=True)
+            last_range = range_index == len(byte_ranges) - 1
+            chunk_starts = range(0, len(df), chunk_size)
+            for chunk_start in chunk_starts:
+                chunk = df.iloc[chunk_start:chunk_start + chunk_size].copy()
+                if len(chunk) < chunk_size and not last_range:
+                    rest = chunk
+                    break
+                chunk.index = pd.RangeIndex(rows, rows + len(chunk))
+                rows += len(chunk)
+                yield chunk
+            else:
+                rest = None
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def read_dat_file_chunks(path: Path,
+                         dat_fields: dict[str, list[int]],
+                         chunk_size: int = CHUNK_SIZE,
+                         workers: int = 1,
+                         engine: str = "read_fwf") -> Iterator[pd.DataFrame]:
+    """Return DOF DAT file data in chunks, read with selected engine.
+
+    :param path: path to the DOF file
+    :param dat_fields: field name, field extent (first and last column, 1-based)
+    :param chunk_size: number of rows in chunk
+    :param workers: number of processes parsing the file (read_fwf engine)
+    :param engine: engine to read the file, one of DAT_ENGINES
+    :return: raw data chunks
+    """
+    if engine == "mmap":
+        return read_dat_chunks_mmap(path=path,
+                                    colspecs=get_dat_colspecs(dat_fields),
+                                    # All fields decoded as strings, as read by read_fwf
+                                    integer_fields=[],
+                                    skiprows=DAT_HEADER_ROWS,
+                                    chunk_size=chunk_size)
+    if workers > 1:
+        return read_dat_chunks_parallel(path=path, dat_fields=dat_fields, chunk_size=chunk_size, workers=workers)
+    return read_dat_chunks(path=path, dat_fields=dat_fields, chunk_size=chunk_size)
+
+
+def prepare_dat(
+        df: pd.DataFrame,
+        obstacle_type_mapping: dict[str, int],
+        stats: ImportStats | None = None,
+        actions: list[str] | None = None
+) -> pd.DataFrame:
+    """Return DOF DAT data with coordinates and obstacle types parsed into obstacle table columns.
+    Rows with invalid obstacle data (coordinates, required and numeric values) or action other than expected
+    are reported and skipped.
+
+    :param df: raw data read from DOF DAT file
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :param stats: import statistics of the file, updated with rows of prepared data
+    :param actions: expected action codes (daily change file), default: any action
+    :return: prepared data
+    """
+    stats = stats or ImportStats()
+    stats.rows_read += len(df)
+    if actions is not None:
+        action_invalid_mask = ~df["action"].isin(actions)
+        if action_invalid_mask.any():
+            report_rejected(df_rejected=df[action_invalid_mask], reason="action", stats=stats)
+            df = df[~action_invalid_mask].copy()
+    df = quarantine_invalid(df=df, stats=stats, lon_column="lon_src", lat_column="lat_src")
     df.drop(columns=["lon_src", "lat_src"], inplace=True)
 
-    df["type_id"] = df.apply(lambda row: obstacle_type_mapping[row["obst_type"]], axis=1)
+    df["type_id"] = map_obstacle_type(df["obst_type"], obstacle_type_mapping)
     df.drop(columns=["obst_type"], inplace=True)
 
-    df.to_csv("dof_dat_parsed.csv", index=False)
-    load_data(df=df,
-              db_utils=db_utils)
+    stats.rows_loaded += len(df)
+    return df
+
+
+def load_dat_layout(
+        path: Path,
+        file_type: str,
+        db_utils: DBUtils,
+        obstacle_type_mapping: dict[str, int],
+        method: str,
+        chunk_size: int,
+        progress: ProgressCallback | None,
+        workers: int,
+        engine: str,
+        cache_dir: Path | None,
+        source: DOFSource | None,
+        skip_unchanged: bool
+) -> ImportStats:
+    """Load DOF file with DAT file layout (DOF DAT file, daily change file) into PostgreSQL database.
+    Settings of the file type are read from dof_conf: fields extents, expected action codes (optional).
+
+    :param path: path to the DOF file
+    :param file_type: DOF file type (dof_conf.file_type)
+    :param db_utils: instance of DBUtils class
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :param method: method to load data into database, one of LOAD_METHODS
+    :param chunk_size: number of rows read, prepared and loaded at once
+    :param progress: import progress callback, called with stage and number of rows read so far
+    :param workers: number of processes parsing the file
+    :param engine: engine to read the file, one of DAT_ENGINES
+    :param cache_dir: directory of prepared data cache, None - prepared data not cached
+    :param source: file identification (checksum, currency date), None - computed from the file
+    :param skip_unchanged: skip loading if the file was imported last time (dof.import_log)
+    :return: import statistics of the file
+    """
+    if engine not in DAT_ENGINES:
+        raise ValueError(f"Unsupported DAT engine: {engine}, expected one of: {', '.join(DAT_ENGINES)}")
+    logging.info("Loading obstacles from %s file (path: %s) initiated.", file_type.upper(), path)
+    source = source or get_source(path)
+    if skip_unchanged and is_last_import(db_utils=db_utils, source=source):
+        return ImportStats(source=source, skipped=True)
+    settings, revision_date = db_utils.select(query="select settings, revision_date\n"
+                                                    "from dof.dof_conf\n"
+                                                    "where file_type = %s;",
+                                              params=(file_type,))[0]
+    dat_fields = settings["fields"]
+    actions = list(settings["actions"].values()) if "actions" in settings else None
+
+    logging.info("Preparing data...")
+    stats = ImportStats(source=source)
+    chunks = cached_chunks(
+        source_hash=source.source_hash,
+        file_type=file_type,
+        revision_date=revision_date,
+        obstacle_type_mapping=obstacle_type_mapping,
+        cache_dir=cache_dir,
+        prepare_chunks=lambda: prepare_chunks(
+            raw_chunks=read_dat_file_chunks(path=path,
+                                            dat_fields=dat_fields,
+                                            chunk_size=chunk_size,
+                                            workers=workers,
+                                            engine=engine),
+            prepare=lambda chunk: prepare_dat(df=chunk,
+                                              obstacle_type_mapping=obstacle_type_mapping,
+                                              stats=stats,
+                                              actions=actions),
+            stats=stats,
+            progress=progress
+        ),
+        chunk_size=chunk_size,
+        stats=stats,
+        report_file=get_report_file,
+        progress=progress
+    )
+    load_chunks(chunks=chunks,
+                db_utils=db_utils,
+                method=method)
+    log_stats(stats)
+    return stats
+
+
+def load_dat(
+        path: Path,
+        db_utils: DBUtils,
+        obstacle_type_mapping: dict[str, int],
+        method: str = "to_postgis",
+        chunk_size: int = CHUNK_SIZE,
+        progress: ProgressCallback | None = None,
+        workers: int = 1,
+        engine: str = "read_fwf",
+        cache_dir: Path | None = None,
+        source: DOFSource | None = None,
+        skip_unchanged: bool = False
+) -> ImportStats:
+    """Load DOF DAT file into PostgreSQL database.
+    File is read, prepared and loaded in chunks of chunk_size rows.
+    File is parsed in worker processes if workers > 1 (read_fwf engine).
+    Prepared data is cached in cache_dir, file is not parsed nor prepared again if it was imported before.
+    Loading is skipped if skip_unchanged and the file is the same as the file imported last time.
+
+    :param path: path to the DOF file
+    :param db_utils: instance of DBUtils class
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :param method: method to load data into database, one of LOAD_METHODS
+    :param chunk_size: number of rows read, prepared and loaded at once
+    :param progress: import progress callback, called with stage and number of rows read so far
+    :param workers: number of processes parsing the file
+    :param engine: engine to read the file, one of DAT_ENGINES
+    :param cache_dir: directory of prepared data cache, default: prepared data not cached
+    :param source: file identification (checksum, currency date), default: computed from the file
+    :param skip_unchanged: skip loading if the file was imported last time (dof.import_log)
+    :return: import statistics of the file
+    """
+    return load_dat_layout(path=path, file_type="dat", db_utils=db_utils,
+                           obstacle_type_mapping=obstacle_type_mapping, method=method, chunk_size=chunk_size,
+                           progress=progress, workers=workers, engine=engine, cache_dir=cache_dir,
+                           source=source, skip_unchanged=skip_unchanged)
+
+
+def load_ddof(
+        path: Path,
+        db_utils: DBUtils,
+        obstacle_type_mapping: dict[str, int],
+        method: str = "to_postgis",
+        chunk_size: int = CHUNK_SIZE,
+        progress: ProgressCallback | None = None,
+        engine: str = "read_fwf",
+        cache_dir: Path | None = None,
+        source: DOFSource | None = None,
+        skip_unchanged: bool = False
+) -> ImportStats:
+    """Load DOF daily change (DDOF) file into PostgreSQL database (dof.import_obstacle).
+    File has DAT file layout and contains only added, changed and dismantled obstacles,
+    rows with action codes other than configured in dof_conf (file_type = 'ddf') are reported and skipped.
+    Loaded changes are applied to obstacle table with merge_dof.apply_changes.
+
+    :param path: path to the DOF daily change file
+    :param db_utils: instance of DBUtils class
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :param method: method to load data into database, one of LOAD_METHODS
+    :param chunk_size: number of rows read, prepared and loaded at once
+    :param progress: import progress callback, called with stage and number of rows read so far
+    :param engine: engine to read the file, one of DAT_ENGINES
+    :param cache_dir: directory of prepared data cache, default: prepared data not cached
+    :param source: file identification (checksum, currency date), default: computed from the file
+    :param skip_unchanged: skip loading if the file was imported last time (dof.import_log)
+    :return: import statistics of the file
+    """
+    return load_dat_layout(path=path, file_type="ddf", db_utils=db_utils,
+                           obstacle_type_mapping=obstacle_type_mapping, method=method, chunk_size=chunk_size,
+                           progress=progress, workers=1, engine=engine, cache_dir=cache_dir,
+                           source=source, skip_unchanged=skip_unchanged)
@@ -0,0 +1,42 @@
+"""Check imported obstacles (dof.import_obstacle) are located inside boundary of their country/state (oas_code)"""
+from __future__ import annotations
+
+import logging
+
+from .db_utils import DBUtils
+from .types import ProgressCallback
+
+
+def check_import_locations(db_utils: DBUtils, progress: ProgressCallback | None = None) -> int:
+    """Write imported obstacles located outside boundary of their country/state into dof.import_location_mismatch
+    (report of the last import). Point-in-polygon test uses subdivided boundaries (dof.oas_boundary_subdivided,
+    GiST index), obstacles of countries/states without boundary are not checked.
+
+    :param db_utils: instance of DBUtils class
+    :param progress: import progress callback, called before the check with number of checked obstacles
+    :return: number of obstacles located outside boundary
+    """
+    logging.info("Checking imported obstacles are located inside their country/state boundary...")
+    with db_utils.transaction() as cur:
+        cur.execute("select count(*) from dof.import_obstacle;")
+        if progress is not None:
+            progress("check", cur.fetchone()[0])
+        # Table is created by import, planner has no statistics yet
+        cur.execute("analyze dof.import_obstacle;")
+        cur.execute("delete from dof.import_location_mismatch;")
+        cur.execute("insert into dof.import_location_mismatch (oas_code, obst_number, location)\n"
+                    "select i.oas_code, i.obst_number, i.geometry\n"
+                    "from dof.import_obstacle i\n"
+                    "where i.oas_code in (select oas_code from dof.oas_boundary_subdivided)\n"
+                    "      and not exists (select 1\n"
+                    "                      from dof.oas_boundary_subdivided b\n"
+                    "                      where b.oas_code = i.oas_code\n"
+                    "                            and ST_Intersects(b.geom, i.geometry));")
+        mismatches = cur.rowcount
+
+    if mismatches:
+        logging.warning("Obstacles located outside their country/state boundary: %d "
+                        "(see dof.import_location_mismatch)", mismatches)
+    else:
+        logging.info("All checked obstacles are located inside their country/state boundary.")
+    return mismatches
@@ -0,0 +1,326 @@
+"""Merge DOF obstacles from auxiliary table dof.import_obstacle into obstacle table.
+Obstacle table is partitioned by oas_code, obstacles are merged into each partition (country/state) separately.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date
+
+from psycopg2.extensions import cursor
+
+from .db_utils import DBUtils
+from .types import MergeStats, ProgressCallback
+
+KEY_COLUMNS = ["oas_code", "obst_number"]
+# Obstacle attributes compared between imported and existing obstacles (row hash)
+ATTRIBUTE_COLUMNS = [
+    "verif_status_code",
+    "type_id",
+    "lighting_code",
+    "marking_code",
+    "hor_acc_code",
+    "vert_acc_code",
+    "city",
+    "quantity",
+    "agl",
+    "amsl",
+    "faa_study_number",
+    "action",
+    "julian_date",
+    "location"
+]
+# Worst-case height and horizontal buffer (feet) computed from accuracy tables when merge source is created,
+# stored with obstacle attributes (not compared, they are derived from amsl and accuracy codes)
+DERIVED_COLUMNS = {
+    "worst_case_amsl": "i.amsl::numeric + dof.tolerance_ft(v.tolerance, vu.uom)",
+    "horizontal_buffer": "dof.tolerance_ft(h.tolerance, hu.uom)"
+}
+# Merge steps reported to progress callback: create merge source, update, insert, retire
+MERGE_STEPS = 4
+# Daily change file: action codes of added, changed and dismantled obstacles (dof_conf, file_type = 'ddf')
+DEFAULT_ACTIONS = {"added": "A", "changed": "C", "dismantled": "D"}
+# Active obstacle: not closed out (valid_to) at the cycle date
+ACTIVE_CONDITION = "(o.valid_to is null or o.valid_to > %(cycle_date)s)"
+
+
+def row_hash(alias: str) -> str:
+    """Return SQL expression with hash of obstacle attributes.
+
+    :param alias: table alias
+    :return: row hash SQL expression
+    """
+    columns = ", ".join(f"{alias}.{column}" for column in ATTRIBUTE_COLUMNS)
+    return f"md5(row({columns})::text)"
+
+
+def create_merge_source(cur: cursor, oas_codes: list[str] | None = None) -> int:
+    """Create temporary table with imported obstacles converted to obstacle table column types.
+    Column types are taken from dof.obstacle, so values (and row hashes) are comparable with existing obstacles.
+    Derived columns (worst-case height, horizontal buffer) are computed once for all imported obstacles.
+    Obstacle imported more than once (e.g. changed and then dismantled in daily change file) is taken from the last row
+    of the file.
+
+    :param cur: cursor in merge transaction
+    :param oas_codes: countries/states (oas codes) to merge, default: all imported
+    :return: number of imported obstacles
+    """
+    columns = KEY_COLUMNS + ATTRIBUTE_COLUMNS + list(DERIVED_COLUMNS)
+    source_columns = [f"i.{column}" if column != "location" else "i.geometry::geography"
+                      for column in KEY_COLUMNS + ATTRIBUTE_COLUMNS] + list(DERIVED_COLUMNS.values())
+    cur.execute("create temporary table merge_source on commit drop as\n"
+                "select * from dof.obstacle with no data;")
+    cur.execute(f"insert into merge_source ({', '.join(columns)})\n"
+                f"select distinct on (i.oas_code, i.obst_number) {', '.join(source_columns)}\n"
+                f"from dof.import_obstacle i\n"
+                f"     left join dof.vertical_acc v on v.code = i.vert_acc_code\n"
+                f"     left join dof.tolerance_uom vu on vu.id = v.tolerance_uom_id\n"
+                f"     left join dof.horizontal_acc h on h.code = i.hor_acc_code::smallint\n"
+                f"     left join dof.tolerance_uom hu on hu.id = h.tolerance_uom_id\n"
+                f"where %(oas_codes)s is null or i.oas_code = any(%(oas_codes)s)\n"
+                f"order by i.oas_code, i.obst_number, i.row_no desc;",
+                {"oas_codes": oas_codes})
+    imported = cur.rowcount
+    cur.execute("create index on merge_source (oas_code, obst_number);")
+    cur.execute("analyze merge_source;")
+    return imported
+
+
+def get_merge_oas_codes(cur: cursor) -> list[str]:
+    """Return countries/states (oas codes) of imported obstacles, each one is merged into its own partition.
+
+    :param cur: cursor in merge transaction
+    :return: oas codes
+    """
+    cur.execute("select distinct oas_code from merge_source order by oas_code;")
+    return [oas_code for (oas_code,) in cur.fetchall()]
+
+
+def insert_new(cur: cursor, cycle_date: date, oas_code: str) -> int:
+    """Insert imported obstacles that do not exist in obstacle table.
+
+    :param cur: cursor in merge transaction
+    :param cycle_date: date from which imported data is valid
+    :param oas_code: country/state (partition) merged
+    :return: number of inserted obstacles
+    """
+    columns = ", ".join(KEY_COLUMNS + ATTRIBUTE_COLUMNS + list(DERIVED_COLUMNS))
+    cur.execute(f"insert into dof.obstacle ({columns}, valid_from, insert_timestamp)\n"
+                f"select {columns}, %(cycle_date)s, now()\n"
+                f"from merge_source s\n"
+                f"where s.oas_code = %(oas_code)s\n"
+                f"      and not exists (select 1\n"
+                f"                      from dof.obstacle o\n"
+                f"                      where o.oas_code = %(oas_code)s\n"
+                f"                            and o.obst_number = s.obst_number);",
+                {"cycle_date": cycle_date, "oas_code": oas_code})
+    return cur.rowcount
+
+
+def update_changed(cur: cursor, cycle_date: date, oas_code: str) -> int:
+    """Update obstacles which attributes or location changed (different row hash).
+    Obstacles closed out before and present in imported data are made active again.
+
+    :param cur: cursor in merge transaction
+    :param cycle_date: date from which imported data is valid
+    :param oas_code: country/state (partition) merged
+    :return: number of updated obstacles
+    """
+    assignments = ",\n    ".join(f"{column} = s.{column}" for column in ATTRIBUTE_COLUMNS + list(DERIVED_COLUMNS))
+    cur.execute(f"update dof.obstacle o\n"
+                f"set {assignments},\n"
+                f"    valid_from = %(cycle_date)s,\n"
+                f"    valid_to = default,\n"
+                f"    mod_user = current_user,\n"
+                f"    mod_timestamp = now()\n"
+                f"from merge_source s\n"
+                f"where o.oas_code = %(oas_code)s\n"
+                f"      and s.oas_code = %(oas_code)s\n"
+                f"      and o.obst_number = s.obst_number\n"
+                f"      and (not {ACTIVE_CONDITION}\n"
+                f"           or {row_hash('o')} <> {row_hash('s')});",
+                {"cycle_date": cycle_date, "oas_code": oas_code})
+    return cur.rowcount
+
+
+def retire_removed(cur: cursor, cycle_date: date, oas_code: str) -> int:
+    """Close out (set valid_to) active obstacles that are not in imported data.
+    Only obstacles from countries/states (oas_code) present in imported data are closed out,
+    so importing file for a single state does not close out obstacles from other states.
+
+    :param cur: cursor in merge transaction
+    :param cycle_date: date from which imported data is valid
+    :param oas_code: country/state (partition) merged
+    :return: number of closed out obstacles
+    """
+    cur.execute(f"update dof.obstacle o\n"
+                f"set valid_to = %(cycle_date)s,\n"
+                f"    mod_user = current_user,\n"
+                f"    mod_timestamp = now()\n"
+                f"where {ACTIVE_CONDITION}\n"
+                f"      and o.oas_code = %(oas_code)s\n"
+                f"      and not exists (select 1\n"
+                f"                      from merge_source s\n"
+                f"                      where s.oas_code = %(oas_code)s\n"
+                f"                            and s.obst_number = o.obst_number);",
+                {"cycle_date": cycle_date, "oas_code": oas_code})
+    return cur.rowcount
+
+
+def refresh_obstacle_buffers(db_utils: DBUtils,
+                             oas_code: str | None = None,
+                             obst_number: str | None = None) -> int:
+    """Recompute worst-case height and horizontal buffer of obstacles changed outside import/merge
+    (e.g. obstacle inserted with QGIS layer).
+
+    :param db_utils: instance of DBUtils class
+    :param oas_code: country/state of obstacles, default: all
+    :param obst_number: obstacle number, default: all obstacles of the country/state
+    :return: number of updated obstacles
+    """
+    with db_utils.transaction() as cur:
+        cur.execute("select dof.refresh_obstacle_buffers(%s, %s);", (oas_code, obst_number))
+        return cur.fetchone()[0]
+
+
+def refresh_obstacle_view(db_utils: DBUtils) -> None:
+    """Refresh materialized obstacle view dof.mv_obstacle (concurrently, readers are not blocked).
+
+    :param db_utils: instance of DBUtils class
+    """
+    logging.info("Refreshing materialized obstacle view...")
+    with db_utils.transaction() as cur:
+        cur.execute("select dof.refresh_mv_obstacle();")
+
+
+def merge_import(db_utils: DBUtils,
+                 cycle_date: date | None = None,
+                 progress: ProgressCallback | None = None,
+                 oas_codes: list[str] | None = None) -> MergeStats:
+    """Merge obstacles from auxiliary table dof.import_obstacle into obstacle table (single transaction):
+    - insert new obstacles
+    - update only obstacles which attributes or location changed
+    - close out obstacles not present in imported data (for countries/states present in imported data)
+    Each statement is executed for one country/state, so only its partition of obstacle table is scanned and changed.
+
+    :param db_utils: instance of DBUtils class
+    :param cycle_date: date from which imported data is valid, default: today
+    :param progress: import progress callback, called before each of MERGE_STEPS with number of completed steps
+    :param oas_codes: countries/states (oas codes) to merge, e.g. to refresh a single state, default: all imported
+    :return: number of inserted, changed, retired and unchanged obstacles
+    """
+    cycle_date = cycle_date or date.today()
+    progress = progress or (lambda stage, done: None)
+    logging.info("Merging imported obstacles into obstacle table (cycle date: %s)...", cycle_date)
+    with db_utils.transaction() as cur:
+        progress("merge", 0)
+        imported = create_merge_source(cur, oas_codes)
+        merge_oas_codes = get_merge_oas_codes(cur)
+        stats = MergeStats()
+        progress("merge", 1)
+        stats.changed = sum(update_changed(cur, cycle_date, oas_code) for oas_code in merge_oas_codes)
+        progress("merge", 2)
+        stats.inserted = sum(insert_new(cur, cycle_date, oas_code) for oas_code in merge_oas_codes)
+        progress("merge", 3)
+        stats.retired = sum(retire_removed(cur, cycle_date, oas_code) for oas_code in merge_oas_codes)
+        stats.unchanged = imported - stats.inserted - stats.changed
+
+    logging.info("Merge completed, obstacles inserted: %d, changed: %d, retired: %d, unchanged: %d",
+                 stats.inserted, stats.changed, stats.retired, stats.unchanged)
+    return stats
+
+
+def upsert_changed(cur: cursor, cycle_date: date, oas_code: str, actions: list[str]) -> tuple[int, int]:
+    """Insert added obstacles and update changed obstacles (keyed upsert) from daily change file.
+    Existing obstacles are updated only if attributes or location changed or they were closed out before.
+
+    :param cur: cursor in merge transaction
+    :param cycle_date: date from which imported data is valid
+    :param oas_code: country/state (partition) merged
+    :param actions: action codes of added and changed obstacles
+    :return: number of inserted obstacles, number of updated obstacles
+    """
+    columns = ", ".join(KEY_COLUMNS + ATTRIBUTE_COLUMNS + list(DERIVED_COLUMNS))
+    assignments = ",\n    ".join(f"{column} = excluded.{column}"
+                                  for column in ATTRIBUTE_COLUMNS + list(DERIVED_COLUMNS))
+    cur.execute(f"insert into dof.obstacle as o ({columns}, valid_from, insert_timestamp)\n"
+                f"select {columns}, %(cycle_date)s, now()\n"
+                f"from merge_source\n"
+                f"where oas_code = %(oas_code)s\n"
+                f"      and action = any(%(actions)s)\n"
+                f"on conflict (oas_code, obst_number) do update\n"
+                f"set {assignments},\n"
+                f"    valid_from = excluded.valid_from,\n"
+                f"    valid_to = default,\n"
+                f"    mod_user = current_user,\n"
+                f"    mod_timestamp = now()\n"
+                f"where not {ACTIVE_CONDITION}\n"
+                f"      or {row_hash('o')} <> {row_hash('excluded')}\n"
+                f"returning o.mod_timestamp is null as inserted;",
+                {"cycle_date": cycle_date, "oas_code": oas_code, "actions": actions})
+    inserted = sum(1 for (is_inserted,) in cur.fetchall() if is_inserted)
+    return inserted, cur.rowcount - inserted
+
+
+def close_dismantled(cur: cursor, cycle_date: date, oas_code: str, action: str) -> int:
+    """Close out (set valid_to) active obstacles dismantled according to daily change file.
+
+    :param cur: cursor in merge transaction
+    :param cycle_date: date from which imported data is valid
+    :param oas_code: country/state (partition) merged
+    :param action: action code of dismantled obstacles
+    :return: number of closed out obstacles
+    """
+    cur.execute(f"update dof.obstacle o\n"
+                f"set action = s.action,\n"
+                f"    valid_to = %(cycle_date)s,\n"
+                f"    mod_user = current_user,\n"
+                f"    mod_timestamp = now()\n"
+                f"from merge_source s\n"
+                f"where o.oas_code = %(oas_code)s\n"
+                f"      and s.oas_code = %(oas_code)s\n"
+                f"      and o.obst_number = s.obst_number\n"
+                f"      and s.action = %(action)s\n"
+                f"      and {ACTIVE_CONDITION};",
+                {"cycle_date": cycle_date, "oas_code": oas_code, "action": action})
+    return cur.rowcount
+
+
+def apply_changes(db_utils: DBUtils,
+                  cycle_date: date | None = None,
+                  progress: ProgressCallback | None = None) -> MergeStats:
+    """Apply obstacles from daily change file loaded into dof.import_obstacle to obstacle table (single transaction):
+    - added and changed obstacles are inserted or updated (keyed upsert)
+    - dismantled obstacles are closed out (valid_to is set)
+    Obstacles not present in the daily change file are not touched.
+
+    :param db_utils: instance of DBUtils class
+    :param cycle_date: date from which imported data is valid, default: today
+    :param progress: import progress callback, called before each of MERGE_STEPS with number of completed steps
+    :return: number of inserted, changed, retired (dismantled) and unchanged obstacles
+    """
+    cycle_date = cycle_date or date.today()
+    progress = progress or (lambda stage, done: None)
+    settings = db_utils.select(query="select settings\n"
+                                     "from dof.dof_conf\n"
+                                     "where file_type = 'ddf';")[0]["settings"]
+    actions = {**DEFAULT_ACTIONS, **settings.get("actions", {})}
+    logging.info("Applying daily changes to obstacle table (cycle date: %s)...", cycle_date)
+    with db_utils.transaction() as cur:
+        progress("merge", 0)
+        imported = create_merge_source(cur)
+        merge_oas_codes = get_merge_oas_codes(cur)
+        stats = MergeStats()
+        # Upsert covers update and insert steps
+        progress("merge", 1)
+        for oas_code in merge_oas_codes:
+            inserted, changed = upsert_changed(cur, cycle_date, oas_code, [actions["added"], actions["changed"]])
+            stats.inserted += inserted
+            stats.changed += changed
+        progress("merge", 3)
+        stats.retired = sum(close_dismantled(cur, cycle_date, oas_code, actions["dismantled"])
+                            for oas_code in merge_oas_codes)
+        stats.unchanged = imported - stats.inserted - stats.changed - stats.retired
+
+    logging.info("Daily changes applied, obstacles inserted: %d, changed: %d, dismantled: %d, unchanged: %d",
+                 stats.inserted, stats.changed, stats.retired, stats.unchanged)
+    return stats
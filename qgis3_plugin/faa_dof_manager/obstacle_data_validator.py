@@ -1,15 +1,36 @@
 """Obstacle data validators"""
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from .coordinates import dms_to_dd
+from .coordinates import (
+    dms_to_dd,
+    dms_to_dd_array
+)
 from .errors import (
     CoordinateError,
     MissingRequiredValueError,
     NumberExpectedError
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Fields which values are required (not empty)
+REQUIRED_FIELDS = ["obst_number", "city"]
+# Fields converted to numbers
+NUMERIC_FIELDS = ["agl", "amsl", "quantity"]
+# Error codes of validate_obstacles (bit flags, combined for row with more errors), 0 - valid row
+ERROR_COORDINATES = 1
+ERROR_MISSING_VALUE = 2
+ERROR_NOT_NUMBER = 4
+# Error codes and reasons of rejection (invalid_<reason>.csv reports of the import)
+ERROR_REASONS = {
+    ERROR_COORDINATES: "coordinates",
+    ERROR_MISSING_VALUE: "required_value",
+    ERROR_NOT_NUMBER: "number"
+}
+
 
 def convert_coordinates(data: dict[str, Any]) -> dict[str, Any] | Exception:
     """Convert coordinates from DMS to DD.
@@ -35,7 +56,6 @@ def convert_coordinates(data: dict[str, Any]) -> dict[str, Any] | Exception:
     return data
 
 
-
 def check_empty(data: dict[str, Any],
                 non_empty_fields: list[str]) -> bool | Exception:
     """Check if required fields are not empty.
@@ -44,10 +64,8 @@ def check_empty(data: dict[str, Any],
     :param non_empty_fields: fields that values required (not empty)
     :return: obstacle data with checked required fields not empty
     """
-    for field, value in data.items():
-        if field not in non_empty_fields:
-            continue
-        if not value:
+    for field in non_empty_fields:
+        if field in data and not data[field]:
             raise MissingRequiredValueError(f"Value expected: {field}")
 
     return True
@@ -60,11 +78,11 @@ def cast_to_float(data: dict[str, Any],
     :param to_float_fields: field names that are need to be converted to number
     :return: obstacle data with numeric fields converted to numbers
     """
-    for field, value in data.items():
-        if field not in to_float_fields:
+    for field in to_float_fields:
+        if field not in data:
             continue
         try:
-            data[field] = float(value)
+            data[field] = float(data[field])
         except ValueError:
             raise NumberExpectedError(f"Number expected: {field}")
 
@@ -81,20 +99,82 @@ def validate_obstacle(data: dict[str, Any]) -> dict[str, str] | Exception:
         convert_coordinates(data=data)
         check_empty(
             data=data,
-            non_empty_fields=[
-                "obst_number",
-                "city"
-            ]
+            non_empty_fields=REQUIRED_FIELDS
         )
         cast_to_float(
             data=data,
-            to_float_fields=[
-                "agl",
-                "amsl",
-                "quantity"
-            ]
+            to_float_fields=NUMERIC_FIELDS
         )
     except (MissingRequiredValueError, NumberExpectedError, CoordinateError) as e:
         raise ValueError(e) from e
 
     return data
+
+
+def check_coordinates_column(values: pd.Series, max_degree: int) -> tuple[pd.Series, pd.Series]:
+    """Convert coordinates from DMS to DD (strings) or check range of coordinates in DD (numbers).
+
+    :param values: coordinate values
+    :param max_degree: maximum degree value: 180 for longitude, 90 for latitude
+    :return: coordinates in DD (NaN for invalid values), mask of valid values
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    if values.dtype == "object":
+        dd, valid = dms_to_dd_array(coords=values, max_degree=max_degree)
+        return pd.Series(dd, index=values.index), pd.Series(valid, index=values.index)
+    dd = values.astype("float64")
+    valid = dd.between(-max_degree, max_degree)
+    return dd.where(valid), valid
+
+
+def validate_obstacles(df: pd.DataFrame,
+                       lon_column: str = "lon",
+                       lat_column: str = "lat",
+                       nullable_fields: list[str] | None = None) -> pd.Series:
+    """Validate obstacle data of all rows at once, with the same rules as validate_obstacle:
+    coordinates, required values (REQUIRED_FIELDS), numeric values (NUMERIC_FIELDS).
+    Errors are returned per row instead of raising. Only fields present in df are checked.
+    Coordinates are converted to DD into lon, lat columns, numeric fields stored as strings are converted
+    to numbers (in place, NaN for invalid values).
+
+    :param df: obstacle data, e.g. chunk of imported DOF file
+    :param lon_column: longitude column (DMS strings or DD numbers)
+    :param lat_column: latitude column (DMS strings or DD numbers)
+    :param nullable_fields: numeric fields which values may be missing, e.g. nullable columns of obstacle table
+    :return: error codes per row (ERROR_* flags combined), 0 - valid row
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    nullable_fields = nullable_fields or []
+    errors = np.zeros(len(df), dtype=np.int8)
+
+    df["lon"], lon_valid = check_coordinates_column(values=df[lon_column], max_degree=180)
+    df["lat"], lat_valid = check_coordinates_column(values=df[lat_column], max_degree=90)
+    errors[~(lon_valid & lat_valid).to_numpy()] |= ERROR_COORDINATES
+
+    for field in REQUIRED_FIELDS:
+        if field not in df.columns:
+            continue
+        values = df[field]
+        missing = values.isna()
+        if values.dtype == "object":
+            missing |= values.eq("")
+        errors[missing.to_numpy()] |= ERROR_MISSING_VALUE
+
+    for field in NUMERIC_FIELDS:
+        if field not in df.columns:
+            continue
+        values = df[field]
+        if values.dtype == "object":
+            text = values.astype("string").str.strip().replace("", pd.NA)
+            df[field] = pd.to_numeric(text, errors="coerce").astype("float64")
+            invalid = text.notna() & df[field].isna()
+        else:
+            invalid = pd.Series(False, index=df.index)
+        if field not in nullable_fields:
+            invalid |= df[field].isna()
+        errors[invalid.to_numpy()] |= ERROR_NOT_NUMBER
+
+    return pd.Series(errors, index=df.index)
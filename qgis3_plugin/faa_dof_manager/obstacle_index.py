@@ -0,0 +1,319 @@
+"""In-memory spatial index of active obstacles (dof.obstacle) for k-nearest and radius queries.
+Obstacles are indexed as Earth-centered (ECEF) coordinates of spherical Earth model, chord distance between
+points grows with great-circle distance, so k-nearest and radius queries in 3D give exact great-circle results.
+Uses scipy KD-tree (optional dependency), brute-force NumPy search is used if scipy is not installed.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+
+import numpy as np
+
+from .db_utils import DBUtils
+from .types import NearbyObstacle
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+# Mean Earth radius (IUGG), meters
+EARTH_RADIUS = 6371008.8
+# Meters in nautical mile
+NM = 1852
+# Index is rebuilt when number of obstacles changed since the last build exceeds
+# max(REBUILD_MIN_CHANGES, REBUILD_RATIO * number of indexed obstacles), changed obstacles are searched brute-force
+REBUILD_MIN_CHANGES = 1000
+REBUILD_RATIO = 0.05
+# Obstacle key separator: <oas_code>-<obst_number>, as in DOF ident
+KEY_SEPARATOR = "-"
+
+# Active obstacles changed since the given timestamp (all active obstacles if timestamp is null)
+# Retired obstacles are returned as well (active = false), they are removed from the index
+FETCH_OBSTACLES_QUERY = (
+    "select oas_code, obst_number,\n"
+    "       ST_X(location::geometry) as lon,\n"
+    "       ST_Y(location::geometry) as lat,\n"
+    "       amsl, agl,\n"
+    "       (valid_to is null or valid_to > current_date) as active,\n"
+    "       coalesce(mod_timestamp, insert_timestamp) as change_timestamp\n"
+    "from dof.obstacle\n"
+    "where (%(since)s::timestamp is null and (valid_to is null or valid_to > current_date))\n"
+    "      or coalesce(mod_timestamp, insert_timestamp) > %(since)s::timestamp;"
+)
+
+
+def to_ecef(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """Return Earth-centered coordinates of points on spherical Earth.
+
+    :param lon: longitudes, decimal degrees
+    :param lat: latitudes, decimal degrees
+    :return: array (n, 3) of x, y, z coordinates in meters
+    """
+    lon_rad = np.radians(np.asarray(lon, dtype=np.float64))
+    lat_rad = np.radians(np.asarray(lat, dtype=np.float64))
+    cos_lat = np.cos(lat_rad)
+    return EARTH_RADIUS * np.column_stack((cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)))
+
+
+def chord_to_nm(chord: np.ndarray) -> np.ndarray:
+    """Convert chord length to great-circle distance.
+
+    :param chord: chord lengths, meters
+    :return: great-circle distances, nautical miles
+    """
+    return 2 * EARTH_RADIUS * np.arcsin(np.minimum(chord / (2 * EARTH_RADIUS), 1)) / NM
+
+
+def nm_to_chord(distance_nm: float) -> float:
+    """Convert great-circle distance to chord length.
+
+    :param distance_nm: great-circle distance, nautical miles
+    :return: chord length, meters
+    """
+    angle = min(distance_nm * NM / EARTH_RADIUS, np.pi)
+    return 2 * EARTH_RADIUS * np.sin(angle / 2)
+
+
+class BruteForceTree:
+
+    """Exhaustive search over points, the same query interface as scipy cKDTree (used parts only).
+    Used for obstacles changed since the last index build, and instead of cKDTree if scipy is not installed.
+    """
+
+    def __init__(self, data: np.ndarray) -> None:
+        self.data = data
+        self.n = len(data)
+
+    def _distances(self, point: np.ndarray) -> np.ndarray:
+        """Return distances from the point to all points."""
+        return np.sqrt(np.sum((self.data - point) ** 2, axis=1))
+
+    def query(self, point: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return distances and indexes of k nearest points, sorted by distance.
+        Missing neighbors (k > number of points) have infinite distance and index n, as in cKDTree.
+        """
+        distances = self._distances(point)
+        count = min(k, self.n)
+        nearest = np.argpartition(distances, count - 1)[:count] if 0 < count < self.n else np.arange(count)
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        missing = k - count
+        return (np.concatenate((distances[nearest], np.full(missing, np.inf))),
+                np.concatenate((nearest, np.full(missing, self.n))))
+
+    def query_ball_point(self, point: np.ndarray, r: float) -> list[int]:
+        """Return indexes of points within distance r."""
+        return np.flatnonzero(self._distances(point) <= r).tolist()
+
+
+def build_tree(xyz: np.ndarray) -> cKDTree | BruteForceTree:
+    """Return spatial index of points.
+
+    :param xyz: array (n, 3) of point coordinates
+    :return: scipy KD-tree, brute-force search if scipy is not installed
+    """
+    if cKDTree is None or not len(xyz):
+        return BruteForceTree(xyz)
+    return cKDTree(xyz)
+
+
+def tallest(obstacles: list[NearbyObstacle]) -> NearbyObstacle | None:
+    """Return the tallest obstacle (highest top elevation, amsl).
+
+    :param obstacles: obstacles, e.g. result of radius query
+    :return: the tallest obstacle, None if there are no obstacles
+    """
+    return max(obstacles, key=lambda obstacle: obstacle.amsl, default=None)
+
+
+class ObstacleIndex:
+
+    """Spatial index of active obstacles, built once from obstacle table and refreshed incrementally.
+    Obstacles changed after the build (inserted, changed, retired) are kept in change set searched brute-force,
+    their previous versions are masked out of the tree. Tree is rebuilt when change set grows too large.
+    """
+
+    def __init__(self) -> None:
+        # Indexed obstacles sorted by key: lon, lat, amsl, agl (NaN - unknown) per obstacle
+        self._keys = np.empty(0, dtype=str)
+        self._values = np.empty((0, 4))
+        self._alive = np.empty(0, dtype=bool)
+        self._tree: cKDTree | BruteForceTree = BruteForceTree(np.empty((0, 3)))
+        # Obstacles changed since the tree was built: key -> lon, lat, amsl, agl (None - retired obstacle)
+        self._changes: dict[str, tuple[float, float, float, float] | None] = {}
+        self._changes_keys: list[str] = []
+        self._changes_values = np.empty((0, 4))
+        self._changes_tree = BruteForceTree(np.empty((0, 3)))
+        # The latest insert/modification timestamp of indexed obstacles, None - index not built
+        self._last_change: datetime | None = None
+
+    def __len__(self) -> int:
+        """Number of indexed active obstacles"""
+        return int(np.count_nonzero(self._alive)) + len(self._changes_keys)
+
+    @property
+    def built(self) -> bool:
+        """Index was built from obstacle table"""
+        return self._last_change is not None
+
+    @staticmethod
+    def _fetch(db_utils: DBUtils, since: datetime | None) -> list[tuple]:
+        """Fetch obstacles from obstacle table.
+
+        :param db_utils: instance of DBUtils class
+        :param since: fetch obstacles changed since the timestamp, None - all active obstacles
+        :return: obstacle rows (oas_code, obst_number, lon, lat, amsl, agl, active, change_timestamp)
+        """
+        with db_utils.transaction() as cur:
+            cur.execute(FETCH_OBSTACLES_QUERY, {"since": since})
+            return cur.fetchall()
+
+    @staticmethod
+    def _row_values(row: tuple) -> tuple[float, float, float, float]:
+        """Return lon, lat, amsl, agl of fetched obstacle row"""
+        _, _, lon, lat, amsl, agl, _, _ = row
+        return float(lon), float(lat), float(amsl), np.nan if agl is None else float(agl)
+
+    def _set_obstacles(self, keys: list[str], values: np.ndarray) -> None:
+        """Replace indexed obstacles and build the tree, change set is cleared.
+
+        :param keys: obstacle keys
+        :param values: array (n, 4) of lon, lat, amsl, agl
+        """
+        order = np.argsort(np.asarray(keys, dtype=str), kind="stable")
+        self._keys = np.asarray(keys, dtype=str)[order]
+        self._values = values.reshape(-1, 4)[order]
+        self._alive = np.ones(len(self._keys), dtype=bool)
+        self._tree = build_tree(to_ecef(self._values[:, 0], self._values[:, 1]))
+        self._changes.clear()
+        self._update_changes()
+
+    def _update_changes(self) -> None:
+        """Mask changed obstacles out of the tree, prepare brute-force search of their current versions"""
+        self._alive[:] = True
+        if self._changes and len(self._keys):
+            changed = np.asarray(list(self._changes), dtype=str)
+            positions = np.minimum(np.searchsorted(self._keys, changed), len(self._keys) - 1)
+            self._alive[positions[self._keys[positions] == changed]] = False
+        self._changes_keys = [key for key, values in self._changes.items() if values is not None]
+        self._changes_values = np.array([self._changes[key] for key in self._changes_keys],
+                                        dtype=np.float64).reshape(-1, 4)
+        self._changes_tree = BruteForceTree(to_ecef(self._changes_values[:, 0], self._changes_values[:, 1]))
+
+    def build(self, db_utils: DBUtils) -> None:
+        """Build index of all active obstacles.
+
+        :param db_utils: instance of DBUtils class
+        """
+        start = time.perf_counter()
+        rows = self._fetch(db_utils=db_utils, since=None)
+        self._set_obstacles(keys=[f"{row[0]}{KEY_SEPARATOR}{row[1]}" for row in rows],
+                            values=np.array([self._row_values(row) for row in rows], dtype=np.float64))
+        self._last_change = max((row[7] for row in rows), default=datetime.min)
+        logging.info("Obstacle index built: %d obstacles, %.2f s (%s)", len(rows), time.perf_counter() - start,
+                     "brute-force search" if isinstance(self._tree, BruteForceTree) else "KD-tree")
+
+    def refresh(self, db_utils: DBUtils) -> int:
+        """Update index with obstacles inserted, changed or retired since the last build or refresh.
+        Index is built if not built yet, the tree is rebuilt if there are too many changes.
+
+        :param db_utils: instance of DBUtils class
+        :return: number of fetched obstacles
+        """
+        if not self.built:
+            self.build(db_utils=db_utils)
+            return len(self._keys)
+
+        rows = self._fetch(db_utils=db_utils, since=self._last_change)
+        if not rows:
+            return 0
+        for row in rows:
+            self._changes[f"{row[0]}{KEY_SEPARATOR}{row[1]}"] = self._row_values(row) if row[6] else None
+            self._last_change = max(self._last_change, row[7])
+
+        if len(self._changes) > max(REBUILD_MIN_CHANGES, REBUILD_RATIO * len(self._keys)):
+            self._compact()
+        else:
+            self._update_changes()
+        logging.info("Obstacle index refreshed: %d changed obstacles, %d obstacles changed since the tree was built",
+                     len(rows), len(self._changes))
+        return len(rows)
+
+    def _compact(self) -> None:
+        """Rebuild the tree of indexed obstacles merged with change set"""
+        self._update_changes()
+        self._set_obstacles(keys=self._keys[self._alive].tolist() + self._changes_keys,
+                            values=np.concatenate((self._values[self._alive], self._changes_values)))
+        logging.info("Obstacle index rebuilt: %d obstacles", len(self._keys))
+
+    def _to_obstacles(self,
+                      keys: np.ndarray,
+                      values: np.ndarray,
+                      chords: np.ndarray) -> list[NearbyObstacle]:
+        """Return query results sorted by distance.
+
+        :param keys: obstacle keys
+        :param values: array (n, 4) of lon, lat, amsl, agl
+        :param chords: chord distances of obstacles, meters
+        :return: obstacles
+        """
+        obstacles = []
+        distances = chord_to_nm(chords)
+        for i in np.argsort(distances, kind="stable"):
+            oas_code, obst_number = str(keys[i]).split(KEY_SEPARATOR, 1)
+            lon, lat, amsl, agl = values[i].tolist()
+            obstacles.append(NearbyObstacle(oas_code=oas_code,
+                                            obst_number=obst_number,
+                                            lon=lon,
+                                            lat=lat,
+                                            amsl=amsl,
+                                            agl=None if np.isnan(agl) else agl,
+                                            distance_nm=float(distances[i])))
+        return obstacles
+
+    def nearest(self, lon: float, lat: float, k: int = 1) -> list[NearbyObstacle]:
+        """Return k obstacles nearest to the point.
+
+        :param lon: longitude of the point, decimal degrees
+        :param lat: latitude of the point, decimal degrees
+        :param k: number of obstacles
+        :return: obstacles sorted by distance
+        """
+        point = to_ecef(lon, lat)[0]
+        # Masked obstacles can be among the nearest ones, the tree is queried for more neighbors
+        masked = len(self._alive) - int(np.count_nonzero(self._alive))
+        count = min(k + masked, len(self._keys))
+        chords, positions = np.empty(0), np.empty(0, dtype=int)
+        if count:
+            chords, positions = (np.atleast_1d(result) for result in self._tree.query(point, k=count))
+            found = positions < len(self._keys)
+            found[found] = self._alive[positions[found]]
+            chords, positions = chords[found], positions[found]
+        changes_chords, changes_positions = self._changes_tree.query(point, k=min(k, len(self._changes_keys)))
+        obstacles = self._to_obstacles(
+            keys=np.concatenate((self._keys[positions], np.asarray(self._changes_keys, dtype=str)[changes_positions])),
+            values=np.concatenate((self._values[positions], self._changes_values[changes_positions])),
+            chords=np.concatenate((chords, changes_chords))
+        )
+        return obstacles[:k]
+
+    def within(self, lon: float, lat: float, radius_nm: float) -> list[NearbyObstacle]:
+        """Return obstacles within great-circle distance from the point.
+
+        :param lon: longitude of the point, decimal degrees
+        :param lat: latitude of the point, decimal degrees
+        :param radius_nm: radius, nautical miles
+        :return: obstacles sorted by distance
+        """
+        point = to_ecef(lon, lat)[0]
+        radius = nm_to_chord(radius_nm)
+        positions = np.asarray(self._tree.query_ball_point(point, radius) if len(self._keys) else [], dtype=int)
+        positions = positions[self._alive[positions]]
+        changes_positions = np.asarray(self._changes_tree.query_ball_point(point, radius), dtype=int)
+        keys = np.concatenate((self._keys[positions], np.asarray(self._changes_keys, dtype=str)[changes_positions]))
+        values = np.concatenate((self._values[positions], self._changes_values[changes_positions]))
+        return self._to_obstacles(keys=keys,
+                                  values=values,
+                                  chords=np.sqrt(np.sum((to_ecef(values[:, 0], values[:, 1]) - point) ** 2, axis=1)))
@@ -0,0 +1,227 @@
+"""Cache of prepared DOF file data (Parquet), keyed by file checksum, dof_conf revision date
+and obstacle type mapping. Prepared data (parsed, validated, coordinates converted, obstacle types mapped)
+is cached with import statistics and reports of rejected rows, so the whole preparation is skipped on cache hit.
+Requires pyarrow (optional dependency), data is not cached if pyarrow is not installed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .types import ImportStats, ProgressCallback
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Increase when prepared data (columns, types, validation rules) changes, so data cached by previous version is not used
+CACHE_VERSION = 2
+# Number of cached files kept in cache directory, least recently used files are removed
+MAX_CACHED_FILES = 3
+# Parquet file metadata key of import statistics of cached data
+STATS_KEY = b"dof_import_stats"
+# Arrow types of prepared data columns for pandas dtype kinds
+ARROW_TYPES = {
+    "i": "int64",
+    "f": "float64",
+    "O": "string"
+}
+
+
+def get_mapping_version(obstacle_type_mapping: dict[str, int]) -> str:
+    """Return short checksum of obstacle type mapping, data prepared with other mapping is not used.
+
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :return: mapping checksum
+    """
+    mapping = json.dumps(obstacle_type_mapping, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(mapping).hexdigest()[:12]
+
+
+def get_cache_file(cache_dir: Path,
+                   source_hash: str,
+                   file_type: str,
+                   revision_date: date,
+                   obstacle_type_mapping: dict[str, int]) -> Path:
+    """Return cache file of prepared DOF file data.
+
+    :param cache_dir: cache directory
+    :param source_hash: checksum of the DOF file
+    :param file_type: DOF file type (dof_conf.file_type)
+    :param revision_date: revision date of file type settings (dof_conf.revision_date)
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :return: cache file path
+    """
+    mapping_version = get_mapping_version(obstacle_type_mapping)
+    return cache_dir / (f"{source_hash}_{file_type}_{revision_date:%Y%m%d}_{mapping_version}"
+                        f"_v{CACHE_VERSION}.parquet")
+
+
+def get_cached_report(cache_file: Path, report_file: Path) -> Path:
+    """Return copy of rejected rows report kept with cache file.
+
+    :param cache_file: cache file path
+    :param report_file: report file of rejected rows
+    :return: cached report file path
+    """
+    return cache_file.with_name(f"{cache_file.stem}.{report_file.name}")
+
+
+def get_arrow_schema(df: pd.DataFrame) -> pa.Schema:
+    """Return Arrow schema of prepared data, column types are based on pandas dtypes, not on values
+    (column with missing values only in the first chunk is not written as null type column).
+
+    :param df: prepared data
+    :return: Arrow schema with pandas metadata (Int64 columns are read back as Int64)
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    for column, dtype in df.dtypes.items():
+        arrow_type = getattr(pa, ARROW_TYPES[dtype.kind])()
+        schema = schema.set(schema.get_field_index(column), pa.field(column, arrow_type))
+    return schema
+
+
+def remove_old_cache_files(cache_dir: Path) -> None:
+    """Remove least recently used cache files, keep MAX_CACHED_FILES files.
+
+    :param cache_dir: cache directory
+    """
+    cache_files = sorted(cache_dir.glob("*.parquet"), key=lambda f: f.stat().st_mtime, reverse=True)
+    for cache_file in cache_files[MAX_CACHED_FILES:]:
+        logging.info("Removing old prepared data cache: %s", cache_file)
+        for cached_report in cache_dir.glob(f"{cache_file.stem}.*.csv"):
+            cached_report.unlink(missing_ok=True)
+        cache_file.unlink(missing_ok=True)
+
+
+def read_cached_chunks(cache_file: Path,
+                       chunk_size: int,
+                       stats: ImportStats,
+                       report_file: Callable[[str], Path],
+                       progress: ProgressCallback) -> Iterator[pd.DataFrame]:
+    """Return cached prepared data in chunks, import statistics and reports of rejected rows are restored
+    from the import which cached the data. Progress is reported before upload of every chunk.
+
+    :param cache_file: cache file path
+    :param chunk_size: number of rows in chunk
+    :param stats: import statistics of the file, updated with statistics of cached data
+    :param report_file: function returning report file of rejected rows for reason of rejection
+    :param progress: import progress callback
+    :return: prepared data chunks, the same as chunks written to cache (index renumbered)
+    """
+    parquet_file = pq.ParquetFile(cache_file)
+    cached_stats = json.loads(parquet_file.metadata.metadata[STATS_KEY])
+    stats.rows_read = cached_stats["rows_read"]
+    stats.rows_loaded = cached_stats["rows_loaded"]
+    stats.rows_rejected = cached_stats["rows_rejected"]
+    for reason in stats.rows_rejected:
+        shutil.copyfile(get_cached_report(cache_file, report_file(reason)), report_file(reason))
+
+    rows = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        df = batch.to_pandas()
+        # Missing strings are read as None, parsers return NaN
+        object_columns = df.select_dtypes(include="object").columns
+        df[object_columns] = df[object_columns].fillna(np.nan)
+        df.index = pd.RangeIndex(rows, rows + len(df))
+        rows += len(df)
+        progress("upload", rows)
+        yield df
+
+
+def write_cached_chunks(chunks: Iterator[pd.DataFrame],
+                        cache_file: Path,
+                        stats: ImportStats,
+                        report_file: Callable[[str], Path]) -> Iterator[pd.DataFrame]:
+    """Return chunks of prepared data, chunks are written to cache file at the same time.
+    Cache file is created only if all chunks are consumed, partially written file is removed.
+    Import statistics (file metadata) and reports of rejected rows are cached with the data.
+
+    :param chunks: prepared data chunks
+    :param cache_file: cache file path
+    :param stats: import statistics of the file, complete when all chunks are prepared
+    :param report_file: function returning report file of rejected rows for reason of rejection
+    :return: prepared data chunks
+    """
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    partial_file = cache_file.with_suffix(".partial")
+    writer = None
+    completed = False
+    try:
+        for chunk in chunks:
+            if writer is None:
+                writer = pq.ParquetWriter(partial_file, get_arrow_schema(chunk))
+            writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+            yield chunk
+        if writer is not None:
+            cached_stats = {
+                "rows_read": stats.rows_read,
+                "rows_loaded": stats.rows_loaded,
+                "rows_rejected": stats.rows_rejected
+            }
+            writer.add_key_value_metadata({STATS_KEY: json.dumps(cached_stats)})
+            for reason in stats.rows_rejected:
+                shutil.copyfile(report_file(reason), get_cached_report(cache_file, report_file(reason)))
+            completed = True
+    finally:
+        if writer is not None:
+            writer.close()
+        if completed:
+            partial_file.replace(cache_file)
+            logging.info("Prepared data cached: %s", cache_file)
+            remove_old_cache_files(cache_file.parent)
+        else:
+            partial_file.unlink(missing_ok=True)
+
+
+def cached_chunks(source_hash: str,
+                  file_type: str,
+                  revision_date: date,
+                  obstacle_type_mapping: dict[str, int],
+                  cache_dir: Path | None,
+                  prepare_chunks: Callable[[], Iterator[pd.DataFrame]],
+                  chunk_size: int,
+                  stats: ImportStats,
+                  report_file: Callable[[str], Path],
+                  progress: ProgressCallback | None = None) -> Iterator[pd.DataFrame]:
+    """Return prepared data chunks from cache if the same file was prepared with the same settings and
+    obstacle type mapping before (file is not parsed, validated nor mapped again), otherwise prepare the file
+    and cache prepared data.
+
+    :param source_hash: checksum of the DOF file
+    :param file_type: DOF file type (dof_conf.file_type)
+    :param revision_date: revision date of file type settings (dof_conf.revision_date)
+    :param obstacle_type_mapping: mapping between obstacle type map from DOF data and obstacle id in database table
+    :param cache_dir: cache directory, None - data is not cached
+    :param prepare_chunks: function parsing and preparing the file, returns prepared data chunks
+    :param chunk_size: number of rows in chunk
+    :param stats: import statistics of the file, updated by prepare_chunks or restored from cache
+    :param report_file: function returning report file of rejected rows for reason of rejection
+    :param progress: import progress callback, used when data is read from cache
+    :return: prepared data chunks
+    """
+    if cache_dir is None:
+        return prepare_chunks()
+    if pa is None:
+        logging.info("pyarrow not installed, prepared data is not cached.")
+        return prepare_chunks()
+
+    cache_file = get_cache_file(cache_dir=cache_dir, source_hash=source_hash, file_type=file_type,
+                                revision_date=revision_date, obstacle_type_mapping=obstacle_type_mapping)
+    if cache_file.exists():
+        logging.info("File prepared before, reading prepared data from cache: %s", cache_file)
+        cache_file.touch()
+        return read_cached_chunks(cache_file=cache_file, chunk_size=chunk_size, stats=stats,
+                                  report_file=report_file, progress=progress or (lambda stage, done: None))
+    return write_cached_chunks(chunks=prepare_chunks(), cache_file=cache_file, stats=stats, report_file=report_file)
@@ -0,0 +1,218 @@
+"""Obstacle clearance surface penetration analysis: obstacle height (amsl plus vertical accuracy tolerance)
+is compared with the height of the surface (dof.surface) at obstacle location, penetrating obstacles are written
+into dof.surface_penetration. All active obstacles are fetched once, obstacles near each surface are selected by
+latitude band (binary search over obstacles sorted by latitude) and longitude, then evaluated with NumPy.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import time
+
+import numpy as np
+
+from .db_utils import DBUtils
+from .obstacle_index import EARTH_RADIUS, to_ecef
+from .types import Surface
+
+# Meters in foot
+FT = 0.3048
+
+SURFACES_QUERY = (
+    "select id, name,\n"
+    "       ST_X(origin::geometry) as lon,\n"
+    "       ST_Y(origin::geometry) as lat,\n"
+    "       bearing, elevation, start_distance, length, inner_half_width, divergence, slope\n"
+    "from dof.surface\n"
+    "where %(ids)s::integer[] is null or id = any(%(ids)s::integer[])\n"
+    "order by id;"
+)
+
+# Active obstacles with height including vertical accuracy tolerance (precomputed worst_case_amsl,
+# unknown accuracy: no tolerance)
+OBSTACLES_QUERY = (
+    "select oas_code, obst_number,\n"
+    "       ST_X(location::geometry) as lon,\n"
+    "       ST_Y(location::geometry) as lat,\n"
+    "       coalesce(worst_case_amsl, amsl) as height\n"
+    "from dof.obstacle\n"
+    "where valid_to is null or valid_to > current_date;"
+)
+
+
+class ObstacleHeights:
+
+    """Active obstacles sorted by latitude: keys, coordinates and heights including vertical tolerance (ft)"""
+
+    def __init__(self,
+                 oas_code: np.ndarray,
+                 obst_number: np.ndarray,
+                 lon: np.ndarray,
+                 lat: np.ndarray,
+                 height: np.ndarray) -> None:
+        order = np.argsort(lat, kind="stable")
+        self.oas_code = np.asarray(oas_code, dtype=str)[order]
+        self.obst_number = np.asarray(obst_number, dtype=str)[order]
+        self.lon = np.asarray(lon, dtype=np.float64)[order]
+        self.lat = np.asarray(lat, dtype=np.float64)[order]
+        self.height = np.asarray(height, dtype=np.float64)[order]
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @classmethod
+    def fetch(cls, db_utils: DBUtils) -> ObstacleHeights:
+        """Fetch active obstacles from obstacle table.
+
+        :param db_utils: instance of DBUtils class
+        :return: obstacles sorted by latitude
+        """
+        with db_utils.transaction() as cur:
+            cur.execute(OBSTACLES_QUERY)
+            rows = cur.fetchall()
+        if not rows:
+            return cls(*(np.empty(0) for _ in range(5)))
+        oas_code, obst_number, lon, lat, height = zip(*rows)
+        return cls(oas_code=np.array(oas_code),
+                   obst_number=np.array(obst_number),
+                   lon=np.array(lon, dtype=np.float64),
+                   lat=np.array(lat, dtype=np.float64),
+                   height=np.array(height, dtype=np.float64))
+
+    def near(self, lon: float, lat: float, radius: float) -> np.ndarray:
+        """Return positions of obstacles within latitude/longitude band around the point (spatial prefilter).
+
+        :param lon: longitude of the point, decimal degrees
+        :param lat: latitude of the point, decimal degrees
+        :param radius: half size of the band, feet
+        :return: positions of obstacles, superset of obstacles within radius from the point
+        """
+        band = np.degrees(radius * FT / EARTH_RADIUS)
+        positions = np.arange(np.searchsorted(self.lat, lat - band, side="left"),
+                              np.searchsorted(self.lat, lat + band, side="right"))
+        max_lat = abs(lat) + band
+        if max_lat >= 90 or band >= 90:
+            return positions
+        lon_band = band / np.cos(np.radians(max_lat))
+        if lon_band >= 180:
+            return positions
+        # Longitude difference normalized to <-180, 180), obstacles across antimeridian are included
+        lon_diff = (self.lon[positions] - lon + 180) % 360 - 180
+        return positions[np.abs(lon_diff) <= lon_band]
+
+
+def local_coordinates(surface: Surface, lon: np.ndarray, lat: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return coordinates of points in surface coordinate system (tangent plane at surface origin).
+
+    :param surface: obstacle clearance surface
+    :param lon: longitudes of points, decimal degrees
+    :param lat: latitudes of points, decimal degrees
+    :return: distances along centerline (positive in bearing direction) and across centerline
+             (positive to the right), feet
+    """
+    origin_lon, origin_lat = np.radians(surface.lon), np.radians(surface.lat)
+    dx, dy, dz = (to_ecef(lon, lat) - to_ecef(surface.lon, surface.lat)[0]).T / FT
+    east = -np.sin(origin_lon) * dx + np.cos(origin_lon) * dy
+    north = (-np.sin(origin_lat) * np.cos(origin_lon) * dx
+             - np.sin(origin_lat) * np.sin(origin_lon) * dy
+             + np.cos(origin_lat) * dz)
+    bearing = np.radians(surface.bearing)
+    along = east * np.sin(bearing) + north * np.cos(bearing)
+    across = east * np.cos(bearing) - north * np.sin(bearing)
+    return along, across
+
+
+def surface_heights(surface: Surface, lon: np.ndarray, lat: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return height of the surface at points.
+
+    :param surface: obstacle clearance surface
+    :param lon: longitudes of points, decimal degrees
+    :param lat: latitudes of points, decimal degrees
+    :return: mask of points within surface extent, surface height at points (feet, valid within extent only)
+    """
+    along, across = local_coordinates(surface=surface, lon=lon, lat=lat)
+    distance = along - surface.start_distance
+    inside = ((distance >= 0)
+              & (distance <= surface.length)
+              & (np.abs(across) <= surface.inner_half_width + distance * surface.divergence))
+    return inside, surface.elevation + distance * surface.slope
+
+
+def surface_radius(surface: Surface) -> float:
+    """Return distance from surface origin to the farthest corner of the surface.
+
+    :param surface: obstacle clearance surface
+    :return: distance, feet
+    """
+    end = surface.start_distance + surface.length
+    outer_half_width = surface.inner_half_width + surface.length * surface.divergence
+    return float(max(np.hypot(surface.start_distance, surface.inner_half_width), np.hypot(end, outer_half_width)))
+
+
+def find_penetrations(surface: Surface, obstacles: ObstacleHeights) -> tuple[np.ndarray, np.ndarray]:
+    """Find obstacles penetrating the surface.
+
+    :param surface: obstacle clearance surface
+    :param obstacles: active obstacles
+    :return: positions of penetrating obstacles, surface height at their locations (feet)
+    """
+    positions = obstacles.near(lon=surface.lon, lat=surface.lat, radius=surface_radius(surface))
+    inside, heights = surface_heights(surface=surface, lon=obstacles.lon[positions], lat=obstacles.lat[positions])
+    penetrating = inside & (obstacles.height[positions] > heights)
+    return positions[penetrating], heights[penetrating]
+
+
+def load_surfaces(db_utils: DBUtils, ids: list[int] | None = None) -> list[Surface]:
+    """Load obstacle clearance surfaces.
+
+    :param db_utils: instance of DBUtils class
+    :param ids: surface ids, None - all surfaces
+    :return: surfaces
+    """
+    rows = db_utils.select(query=SURFACES_QUERY, params={"ids": ids})
+    return [Surface(id=row["id"],
+                    name=row["name"],
+                    lon=row["lon"],
+                    lat=row["lat"],
+                    bearing=float(row["bearing"]),
+                    elevation=float(row["elevation"]),
+                    start_distance=float(row["start_distance"]),
+                    length=float(row["length"]),
+                    inner_half_width=float(row["inner_half_width"]),
+                    divergence=float(row["divergence"]),
+                    slope=float(row["slope"])) for row in rows]
+
+
+def check_surfaces(db_utils: DBUtils, ids: list[int] | None = None) -> dict[int, int]:
+    """Check active obstacles against obstacle clearance surfaces, replace penetrations of checked surfaces
+    in dof.surface_penetration.
+
+    :param db_utils: instance of DBUtils class
+    :param ids: surface ids, None - all surfaces
+    :return: number of penetrating obstacles per surface id
+    """
+    start = time.perf_counter()
+    surfaces = load_surfaces(db_utils=db_utils, ids=ids)
+    obstacles = ObstacleHeights.fetch(db_utils=db_utils)
+    logging.info("Checking %d obstacles against %d surfaces...", len(obstacles), len(surfaces))
+
+    buffer = io.StringIO()
+    penetrations = {}
+    for surface in surfaces:
+        positions, heights = find_penetrations(surface=surface, obstacles=obstacles)
+        penetrations[surface.id] = len(positions)
+        for position, surface_height in zip(positions.tolist(), heights.tolist()):
+            obstacle_height = obstacles.height[position]
+            buffer.write(f"{surface.id},{obstacles.oas_code[position]},{obstacles.obst_number[position]},"
+                         f"{obstacle_height:.2f},{surface_height:.2f},{obstacle_height - surface_height:.2f}\n")
+    buffer.seek(0)
+
+    with db_utils.transaction() as cur:
+        cur.execute("delete from dof.surface_penetration where surface_id = any(%s);", ([s.id for s in surfaces],))
+        cur.copy_expert("copy dof.surface_penetration (surface_id, oas_code, obst_number,\n"
+                        "                              obstacle_height, surface_height, penetration)\n"
+                        "from stdin with (format csv);", buffer)
+
+    logging.info("Surface check completed: %d penetrations, %.2f s",
+                 sum(penetrations.values()), time.perf_counter() - start)
+    return penetrations
@@ -0,0 +1,58 @@
+# coding=utf-8
+"""Coordinate conversion test."""
+
+__author__ = '@'
+__date__ = '2024-10-13'
+__copyright__ = 'Copyright 2024, Paweł Strzelewicz'
+
+import math
+import unittest
+
+import numpy as np
+
+from faa_dof_manager.coordinates import (
+    dms_to_dd,
+    dms_to_dd_array
+)
+from faa_dof_manager.errors import CoordinateError
+
+
+class CoordinatesTest(unittest.TestCase):
+    """Test DMS to DD conversion."""
+
+    COORDINATES = [
+        "32 00 04.00N",
+        "087 25 33.00W",
+        "90 00 00.00S",
+        "90 00 00.01N",
+        "12 60 00.00N",
+        "12 00 60.00N",
+        "12 00 04.00X",
+        "12  00 04.00N",
+        "",
+    ]
+
+    def test_dms_to_dd_array_same_as_dms_to_dd(self):
+        """Test array conversion gives the same values and validity as scalar conversion."""
+        for max_degree in (90, 180):
+            dd, valid = dms_to_dd_array(np.array(self.COORDINATES, dtype=object), max_degree)
+            self.assertEqual(dd.dtype, np.float64)
+            for coord, value, is_valid in zip(self.COORDINATES, dd, valid):
+                try:
+                    expected = dms_to_dd(coord, max_degree)
+                except (CoordinateError, IndexError):
+                    self.assertFalse(is_valid, coord)
+                    self.assertTrue(math.isnan(value), coord)
+                else:
+                    self.assertTrue(is_valid, coord)
+                    self.assertEqual(value, expected, coord)
+
+    def test_dms_to_dd_array_hemisphere_sign(self):
+        """Test southern and western hemisphere coordinates are negative."""
+        dd, valid = dms_to_dd_array(np.array(["10 30 00.00S", "010 30 00.00W"], dtype=object), 180)
+        self.assertTrue(valid.all())
+        self.assertEqual(dd.tolist(), [-10.5, -10.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# coding=utf-8
+"""Database values mapping cache test."""
+
+__author__ = '@'
+__date__ = '2024-10-13'
+__copyright__ = 'Copyright 2024, Paweł Strzelewicz'
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from faa_dof_manager.db_values_map import DBValuesMapping
+
+
+class MappingDatabase:
+    """Database returning mapping JSON and its checksum, records executed queries."""
+
+    def __init__(self, mapping: dict, checksum: str):
+        self.mapping = mapping
+        self.checksum = checksum
+        self.queries = []
+
+    def select(self, query, params=None):
+        self.queries.append(query)
+        if query.startswith("select md5("):
+            return [[self.checksum]]
+        return [[json.dumps(self.mapping), self.checksum]]
+
+
+class DBValuesMappingTest(unittest.TestCase):
+    """Test mapping is cached and revalidated with checksum."""
+
+    MAPPING = {
+        "oas": {"Alabama": "01"},
+        "hor_acc": {"20.0 ft": 1},
+        "vert_acc": {"3.0 ft": "A"},
+        "obstacle_type": {"TOWER": 2},
+        "marking": {"None": "N"},
+        "lighting": {"Red": "R"},
+        "verification_status": {"verified": "O"},
+    }
+
+    def setUp(self):
+        self.cache_file = Path(tempfile.mkdtemp()) / "cache" / "mapping.json"
+
+    def test_mapping_fetched_with_single_query(self):
+        """Test all mappings are set with single query when there is no cache."""
+        db = MappingDatabase(self.MAPPING, "abc")
+        mapping = DBValuesMapping(db_utils=db, cache_file=self.cache_file)
+        mapping.set_all_mapping()
+        self.assertEqual(len(db.queries), 1)
+        self.assertEqual(mapping.oas, {"Alabama": "01"})
+        self.assertEqual(mapping.obstacle_type, {"TOWER": 2})
+        self.assertTrue(self.cache_file.exists())
+
+    def test_cached_mapping_used_when_checksum_same(self):
+        """Test cached mapping is used when checksum in the database is the same."""
+        DBValuesMapping(db_utils=MappingDatabase(self.MAPPING, "abc"), cache_file=self.cache_file).set_all_mapping()
+        db = MappingDatabase({}, "abc")
+        mapping = DBValuesMapping(db_utils=db, cache_file=self.cache_file)
+        mapping.set_all_mapping()
+        self.assertEqual(len(db.queries), 1)
+        self.assertTrue(db.queries[0].startswith("select md5("))
+        self.assertEqual(mapping.verification_status, {"verified": "O"})
+
+    def test_stale_cache_refetched(self):
+        """Test mapping is fetched again and cached when checksum in the database changed."""
+        DBValuesMapping(db_utils=MappingDatabase(self.MAPPING, "abc"), cache_file=self.cache_file).set_all_mapping()
+        changed = dict(self.MAPPING, lighting={"White": "W"})
+        db = MappingDatabase(changed, "def")
+        mapping = DBValuesMapping(db_utils=db, cache_file=self.cache_file)
+        mapping.set_all_mapping()
+        self.assertEqual(len(db.queries), 2)
+        self.assertEqual(mapping.lighting, {"White": "W"})
+        self.assertEqual(json.loads(self.cache_file.read_text(encoding="utf-8"))["checksum"], "def")
+
+
+if __name__ == "__main__":
+    unittest.main()
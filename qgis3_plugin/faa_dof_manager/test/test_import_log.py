@@ -0,0 +1,89 @@
+# coding=utf-8
+"""DOF import log test."""
+
+__author__ = '@'
+__date__ = '2024-10-13'
+__copyright__ = 'Copyright 2024, Paweł Strzelewicz'
+
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from faa_dof_manager.import_log import (
+    file_checksum,
+    get_file_type,
+    get_source,
+    is_last_import,
+    read_currency_date
+)
+
+
+class LastImportDBUtils:
+    """DBUtils returning the last import from import log"""
+
+    def __init__(self, last_import):
+        self.last_import = last_import
+
+    def select(self, query):
+        """Return the last import"""
+        return [self.last_import]
+
+
+class ImportLogTest(unittest.TestCase):
+    """Test DOF file identification."""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    def write(self, name, content):
+        """Write test file"""
+        path = self.tmp_dir / name
+        path.write_bytes(content)
+        return path
+
+    def test_read_currency_date(self):
+        """Test currency date is read from DAT file header."""
+        path = self.write("DOF.DAT", b"  CURRENCY DATE = 10/13/24\r\n\r\nOAS#    V CITY\r\n")
+        self.assertEqual(read_currency_date(path), date(2024, 10, 13))
+
+    def test_read_currency_date_missing(self):
+        """Test file without currency date in header (CSV file)."""
+        path = self.write("DOF.CSV", b"OAS,Obstacle#,Verified Status\n")
+        self.assertIsNone(read_currency_date(path))
+
+    def test_get_source(self):
+        """Test the same content has the same checksum, file type is based on file extension."""
+        dat = self.write("DOF.DAT", b"  CURRENCY DATE = 10/13/24\n")
+        copy = self.write("copy.dat", b"  CURRENCY DATE = 10/13/24\n")
+        changed = self.write("changed.dat", b"  CURRENCY DATE = 10/20/24\n")
+        self.assertEqual(get_source(dat).file_type, "dat")
+        self.assertEqual(get_source(dat).source_hash, get_source(copy).source_hash)
+        self.assertNotEqual(get_source(dat).source_hash, get_source(changed).source_hash)
+
+    def test_get_file_type(self):
+        """Test daily change file is recognized by file name."""
+        self.assertEqual(get_file_type(Path("DOF.CSV")), "csv")
+        self.assertEqual(get_file_type(Path("DOF.DAT")), "dat")
+        self.assertEqual(get_file_type(Path("DDOF.DAT")), "ddf")
+        self.assertEqual(get_file_type(Path("ddof_20241014.dat")), "ddf")
+
+    def test_is_last_import(self):
+        """Test file is hashed only if its size and currency date are the same as of the last import."""
+        dat = self.write("DOF.DAT", b"  CURRENCY DATE = 10/13/24\n")
+        last_import = {"source_hash": file_checksum(dat), "file_size": 27, "currency_date": date(2024, 10, 13),
+                       "import_timestamp": "2024-10-14 06:00:00"}
+        with mock.patch("faa_dof_manager.import_log.file_checksum", wraps=file_checksum) as checksum:
+            self.assertTrue(is_last_import(LastImportDBUtils(last_import), get_source(dat)))
+            self.assertEqual(checksum.call_count, 1)
+            for changed in ({"file_size": 28}, {"currency_date": date(2024, 10, 20)}):
+                self.assertFalse(is_last_import(LastImportDBUtils({**last_import, **changed}), get_source(dat)))
+            self.assertEqual(checksum.call_count, 1)
+            self.assertFalse(is_last_import(LastImportDBUtils({**last_import, "source_hash": "0" * 64}),
+                                            get_source(dat)))
+            self.assertTrue(is_last_import(LastImportDBUtils({**last_import, "file_size": None}), get_source(dat)))
+
+
+if __name__ == "__main__":
+    unittest.main()
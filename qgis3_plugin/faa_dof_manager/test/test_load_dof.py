@@ -0,0 +1,255 @@
+# coding=utf-8
+"""DOF loading (parsing) test."""
+
+__author__ = '@'
+__date__ = '2024-10-13'
+__copyright__ = 'Copyright 2024, Paweł Strzelewicz'
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from faa_dof_manager.dat_scanner import read_dat_chunks_mmap
+from faa_dof_manager.load_dof import (
+    DAT_ENGINES,
+    get_dat_byte_ranges,
+    get_dat_colspecs,
+    map_obstacle_type,
+    number_rows,
+    prepare_csv,
+    prepare_dat,
+    read_csv_chunks,
+    read_dat_chunks,
+    read_dat_chunks_parallel,
+    read_dat_file_chunks,
+    split_accuracy,
+    split_oas
+)
+from faa_dof_manager.types import ImportStats
+
+
+class LoadDOFTest(unittest.TestCase):
+    """Test columnar parsing of DOF columns."""
+
+    def test_split_oas(self):
+        """Test OAS column is split into oas code and obstacle ident."""
+        oas_code, obst_number = split_oas(pd.Series(["01-000001", "CA-123456"]))
+        self.assertEqual(oas_code.tolist(), ["01", "CA"])
+        self.assertEqual(obst_number.tolist(), ["000001", "123456"])
+
+    def test_split_accuracy(self):
+        """Test accuracy column is split into horizontal and vertical accuracy codes."""
+        hor_acc, vert_acc = split_accuracy(pd.Series(["4D", "9I"]))
+        self.assertEqual(hor_acc.tolist(), [4, 9])
+        self.assertEqual(hor_acc.dtype, "Int64")
+        self.assertEqual(vert_acc.tolist(), ["D", "I"])
+
+    def test_map_obstacle_type(self):
+        """Test obstacle types are mapped to obstacle type ids."""
+        type_id = map_obstacle_type(
+            pd.Series(["TOWER", "BLDG", "TOWER"], index=[3, 5, 7]),
+            {"BLDG": 1, "TOWER": 2}
+        )
+        self.assertEqual(type_id.tolist(), [2, 1, 2])
+        self.assertEqual(type_id.index.tolist(), [3, 5, 7])
+
+    def test_map_obstacle_type_unknown(self):
+        """Test unknown obstacle type is reported."""
+        with self.assertRaises(KeyError):
+            map_obstacle_type(pd.Series(["TOWER", "SILO"]), {"TOWER": 2})
+
+    def test_number_rows(self):
+        """Test rows are numbered in file order across chunks (rejected rows are not numbered)."""
+        chunks = [pd.DataFrame({"action": ["A", "C"]}, index=[0, 2]), pd.DataFrame({"action": ["D"]}, index=[4])]
+        self.assertEqual([chunk["row_no"].tolist() for chunk in number_rows(chunks)], [[0, 1], [2]])
+
+
+class DATReaderTest(unittest.TestCase):
+    """Test DAT readers return the same data as read_fwf."""
+
+    DAT_FIELDS = {
+        "oas_code": [1, 2],
+        "obst_number": [4, 9],
+        "city": [11, 20],
+        "agl": [22, 26]
+    }
+    HEADER = ["  CURRENCY DATE = 10/13/24", "", "OAS#    CITY       AGL", "-" * 26]
+
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / "DOF.dat"
+        rows = [f"{i % 3:02d}-{i:06d} CITY {i:<5d} {i * 7:05d}" for i in range(23)]
+        rows[5] = "01-000005            00035"
+        self.path.write_text("\n".join(self.HEADER + rows) + "\n", encoding="utf-8")
+
+    def test_byte_ranges_start_at_line(self):
+        """Test byte ranges cover all data rows and start at the beginning of a line."""
+        data = self.path.read_bytes()
+        ranges = get_dat_byte_ranges(self.path, ranges=5)
+        self.assertEqual(ranges[0][0], len("\n".join(self.HEADER)) + 1)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[start - 1:start], b"\n")
+
+    def test_parallel_same_as_serial(self):
+        """Test parallel parsing returns the same chunks as serial parsing."""
+        expected = list(read_dat_chunks(self.path, self.DAT_FIELDS, chunk_size=4))
+        actual = list(read_dat_chunks_parallel(self.path, self.DAT_FIELDS, chunk_size=4, workers=2))
+        self.assertEqual(len(actual), len(expected))
+        for actual_chunk, expected_chunk in zip(actual, expected):
+            pd.testing.assert_frame_equal(actual_chunk, expected_chunk)
+
+    def test_parallel_ranges_in_flight(self):
+        """Test only a bounded window of byte ranges is submitted ahead of consumed chunks."""
+        executor = ThreadPoolExecutor(max_workers=2)
+        with mock.patch("faa_dof_manager.load_dof.get_process_pool", return_value=executor), \
+                mock.patch.object(executor, "submit", wraps=executor.submit) as submit:
+            chunks = read_dat_chunks_parallel(self.path, self.DAT_FIELDS, chunk_size=1, workers=2)
+            next(chunks)
+            self.assertEqual(submit.call_count, 4)
+            self.assertEqual(sum(1 for _ in chunks), 22)
+            self.assertEqual(submit.call_count, 8)
+
+    def test_mmap_same_as_read_fwf(self):
+        """Test memory-mapped reader returns the same chunks as read_fwf."""
+        expected = list(read_dat_chunks(self.path, self.DAT_FIELDS, chunk_size=4))
+        actual = list(read_dat_chunks_mmap(self.path,
+                                           colspecs=get_dat_colspecs(self.DAT_FIELDS),
+                                           integer_fields=[],
+                                           skiprows=4,
+                                           chunk_size=4))
+        self.assertEqual(len(actual), len(expected))
+        for actual_chunk, expected_chunk in zip(actual, expected):
+            pd.testing.assert_frame_equal(actual_chunk, expected_chunk)
+
+    def test_mmap_invalid_integer(self):
+        """Test malformed integer value is reported (not hidden by error closing the mapped file)."""
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        lines[-1] = lines[-1][:21] + "0X035"
+        self.path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "0X035"):
+            list(read_dat_chunks_mmap(self.path,
+                                      colspecs=get_dat_colspecs(self.DAT_FIELDS),
+                                      integer_fields=["agl"],
+                                      skiprows=4,
+                                      chunk_size=4))
+
+
+class MalformedNumberTest(unittest.TestCase):
+    """Test row with malformed numeric value is quarantined, other rows of the file are loaded."""
+
+    CSV_CONFIG = {
+        "csv_table_map": {
+            "VERIFIED STATUS": "verif_status_code",
+            "CITY": "city",
+            "QUANTITY": "quantity",
+            "AGL": "agl",
+            "AMSL": "amsl",
+            "LIGHTING": "lighting_code",
+            "MARKING": "marking_code",
+            "FAA STUDY": "faa_study_number",
+            "ACTION": "action",
+            "JDATE": "julian_date"
+        },
+        "coordinates_map": {
+            "LATDEC": "lat",
+            "LONDEC": "lon"
+        },
+        "parsed_map": {
+            "oas_ident": "OAS",
+            "accuracy": "ACCURACY",
+            "obstacle_type": "TYPE"
+        }
+    }
+    DAT_FIELDS = {
+        "oas_code": [1, 2],
+        "obst_number": [4, 9],
+        "verif_status_code": [11, 11],
+        "city": [19, 34],
+        "lat_src": [36, 47],
+        "lon_src": [49, 61],
+        "obst_type": [63, 80],
+        "quantity": [82, 82],
+        "agl": [84, 88],
+        "amsl": [90, 94],
+        "lighting_code": [96, 96],
+        "hor_acc_code": [98, 98],
+        "vert_acc_code": [100, 100],
+        "marking_code": [102, 102],
+        "faa_study_number": [104, 117],
+        "action": [119, 119],
+        "julian_date": [121, 127]
+    }
+    OBSTACLE_TYPE_MAPPING = {"TOWER": 1}
+    AGL = ["00100", "0X100", "00300"]
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        self.addCleanup(os.chdir, cwd)
+
+    def dat_line(self, obst_number: str, agl: str) -> str:
+        """Return DAT file line with given obstacle ident and AGL value"""
+        values = {
+            "oas_code": "01", "obst_number": obst_number, "verif_status_code": "O", "city": "MOBILE",
+            "lat_src": "30 41 15.00N", "lon_src": "088 02 30.00W", "obst_type": "TOWER", "quantity": "1",
+            "agl": agl, "amsl": "00150", "lighting_code": "R", "hor_acc_code": "4", "vert_acc_code": "D",
+            "marking_code": "N", "faa_study_number": "2024ASO123OE", "action": "A", "julian_date": "2024287"
+        }
+        line = [" "] * 127
+        for field_name, (start, end) in self.DAT_FIELDS.items():
+            line[start - 1:end] = values[field_name].ljust(end - start + 1)
+        return "".join(line)
+
+    def assert_quarantined(self, df: pd.DataFrame, stats: ImportStats):
+        """Assert row with malformed AGL is reported, other rows are prepared"""
+        self.assertEqual(df["obst_number"].tolist(), ["000001", "000003"])
+        self.assertEqual(df["agl"].tolist(), [100, 300])
+        self.assertEqual(df["agl"].dtype, "Int64")
+        self.assertEqual((stats.rows_read, stats.rows_loaded, stats.rows_rejected), (3, 2, {"number": 1}))
+        rejected = pd.read_csv(self.tmp_dir / "invalid_number.csv", dtype=str)
+        self.assertEqual(rejected["obst_number"].tolist(), ["000002"])
+        self.assertEqual(rejected["agl"].str.strip().tolist(), ["0X100"])
+
+    def test_csv(self):
+        """Test CSV row with malformed AGL is quarantined."""
+        path = self.tmp_dir / "DOF.csv"
+        columns = ["OAS", "VERIFIED STATUS", "CITY", "LATDEC", "LONDEC", "TYPE", "QUANTITY", "AGL", "AMSL",
+                   "LIGHTING", "ACCURACY", "MARKING", "FAA STUDY", "ACTION", "JDATE"]
+        rows = [f"01-{i:06d},O,MOBILE,30.6875,-88.041667,TOWER,1,{agl},150,R,4D,N,2024ASO123OE,A,2024287"
+                for i, agl in enumerate(self.AGL, start=1)]
+        path.write_text("\n".join([",".join(columns)] + rows) + "\n", encoding="utf-8")
+
+        stats = ImportStats()
+        df = pd.concat([prepare_csv(df=chunk,
+                                    csv_config=self.CSV_CONFIG,
+                                    obstacle_type_mapping=self.OBSTACLE_TYPE_MAPPING,
+                                    stats=stats)
+                        for chunk in read_csv_chunks(path, self.CSV_CONFIG, chunk_size=2)])
+        self.assert_quarantined(df, stats)
+
+    def test_dat(self):
+        """Test DAT row with malformed AGL is quarantined, with each DAT engine."""
+        path = self.tmp_dir / "DOF.dat"
+        rows = [self.dat_line(f"{i:06d}", agl) for i, agl in enumerate(self.AGL, start=1)]
+        path.write_text("\n".join(["  CURRENCY DATE = 10/13/24", "", "HEADER", "-" * 127] + rows) + "\n",
+                        encoding="utf-8")
+        for engine in DAT_ENGINES:
+            with self.subTest(engine=engine):
+                stats = ImportStats()
+                df = pd.concat([prepare_dat(df=chunk,
+                                            obstacle_type_mapping=self.OBSTACLE_TYPE_MAPPING,
+                                            stats=stats)
+                                for chunk in read_dat_file_chunks(path, self.DAT_FIELDS, chunk_size=2,
+                                                                  engine=engine)])
+                self.assert_quarantined(df, stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# coding=utf-8
+"""Obstacle data validators test."""
+
+__author__ = '@'
+__date__ = '2024-10-13'
+__copyright__ = 'Copyright 2024, Paweł Strzelewicz'
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from faa_dof_manager.obstacle_data_validator import (
+    ERROR_COORDINATES,
+    ERROR_MISSING_VALUE,
+    ERROR_NOT_NUMBER,
+    validate_obstacle,
+    validate_obstacles
+)
+
+
+def obstacle_data(**values):
+    """Return valid obstacle data taken from plugin GUI, updated with values"""
+    data = {
+        "obst_number": "000001",
+        "city": "MOBILE",
+        "lon": "088 02 30.00W",
+        "lat": "30 41 15.00N",
+        "agl": "100",
+        "amsl": "150",
+        "quantity": "1"
+    }
+    data.update(values)
+    return data
+
+
+class ObstacleDataValidatorTest(unittest.TestCase):
+    """Test columnar validator applies the same rules as validator of single obstacle."""
+
+    ROWS = [
+        {},
+        {"lon": "188 00 00.00W"},
+        {"lat": "invalid"},
+        {"city": ""},
+        {"obst_number": ""},
+        {"agl": "1O0"},
+        {"quantity": ""},
+        {"lon": "x", "city": "", "amsl": "x"}
+    ]
+
+    def test_same_as_validate_obstacle(self):
+        """Test rows rejected by validate_obstacle have error codes, valid rows are converted the same way."""
+        df = pd.DataFrame([obstacle_data(**values) for values in self.ROWS])
+        error_codes = validate_obstacles(df)
+        for row, values in enumerate(self.ROWS):
+            try:
+                data = validate_obstacle(obstacle_data(**values))
+            except ValueError:
+                self.assertNotEqual(error_codes[row], 0)
+            else:
+                self.assertEqual(error_codes[row], 0)
+                for field in ["lon", "lat", "agl", "amsl", "quantity"]:
+                    self.assertAlmostEqual(df.loc[row, field], data[field])
+
+    def test_error_codes(self):
+        """Test error codes of each rule, combined for row with more errors."""
+        df = pd.DataFrame([obstacle_data(**values) for values in self.ROWS])
+        self.assertEqual(validate_obstacles(df).tolist(), [
+            0,
+            ERROR_COORDINATES,
+            ERROR_COORDINATES,
+            ERROR_MISSING_VALUE,
+            ERROR_MISSING_VALUE,
+            ERROR_NOT_NUMBER,
+            ERROR_NOT_NUMBER,
+            ERROR_COORDINATES | ERROR_MISSING_VALUE | ERROR_NOT_NUMBER
+        ])
+
+    def test_parsed_columns(self):
+        """Test parsed data: coordinates in DD and source columns, nullable numeric fields, absent fields."""
+        df = pd.DataFrame({
+            "lon_src": ["088 02 30.00W", "088 02 30.00W", "088 02 30.00W"],
+            "lat_src": ["30 41 15.00N", "30 41 15.00N", "30 41 15.00N"],
+            "agl": pd.array([100, pd.NA, 100], dtype="Int64"),
+            "amsl": pd.array([150, 150, pd.NA], dtype="Int64")
+        }, index=[10, 11, 12])
+        error_codes = validate_obstacles(df, lon_column="lon_src", lat_column="lat_src", nullable_fields=["agl"])
+        self.assertEqual(error_codes.to_dict(), {10: 0, 11: 0, 12: ERROR_NOT_NUMBER})
+        self.assertAlmostEqual(df.loc[10, "lon"], -88.041667, places=6)
+
+        df = pd.DataFrame({"lon": [-88.0, 181.0, np.nan], "lat": [30.0, 30.0, 30.0]})
+        self.assertEqual(validate_obstacles(df).tolist(), [0, ERROR_COORDINATES, ERROR_COORDINATES])
+
+
+if __name__ == "__main__":
+    unittest.main()
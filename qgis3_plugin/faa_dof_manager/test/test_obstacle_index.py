@@ -0,0 +1,105 @@
+# coding=utf-8
+"""Obstacle spatial index test."""
+
+__author__ = '@'
+__date__ = '2024-10-13'
+__copyright__ = 'Copyright 2024, Paweł Strzelewicz'
+
+import math
+import unittest
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+
+from faa_dof_manager.obstacle_index import (
+    BruteForceTree,
+    ObstacleIndex,
+    chord_to_nm,
+    nm_to_chord,
+    tallest,
+    to_ecef
+)
+
+
+class FakeTableIndex(ObstacleIndex):
+    """Obstacle index with obstacle table replaced by list of rows"""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+
+    def _fetch(self, db_utils, since):
+        if since is None:
+            return [row for row in self.rows if row[6]]
+        return [row for row in self.rows if row[7] > since]
+
+
+def obstacle_row(obst_number, lon, lat, amsl, active=True, timestamp=datetime(2024, 10, 13)):
+    """Return obstacle table row"""
+    return "01", obst_number, lon, lat, Decimal(amsl), Decimal("100.00"), active, timestamp
+
+
+class ObstacleIndexTest(unittest.TestCase):
+    """Test k-nearest and radius queries."""
+
+    def setUp(self):
+        # Obstacles 0.1 degree (6 NM) apart along the equator
+        self.index = FakeTableIndex()
+        self.index.rows = [obstacle_row(f"{i:06d}", i / 10, 0, str(100 + i)) for i in range(20)]
+        self.index.build(db_utils=None)
+
+    def test_distance_conversion(self):
+        """Test chord length and great-circle distance conversion."""
+        self.assertAlmostEqual(float(chord_to_nm(np.array([nm_to_chord(25)]))[0]), 25)
+        # One minute of arc on the equator is about one nautical mile
+        chord = np.linalg.norm(to_ecef([0, 1 / 60], [0, 0])[1] - to_ecef([0], [0])[0])
+        self.assertTrue(math.isclose(float(chord_to_nm(np.array([chord]))[0]), 1, rel_tol=0.01))
+
+    def test_brute_force_tree(self):
+        """Test brute-force search returns missing neighbors as in KD-tree."""
+        tree = BruteForceTree(to_ecef([0, 1, 2], [0, 0, 0]))
+        distances, positions = tree.query(to_ecef([1.9], [0])[0], k=4)
+        self.assertEqual(positions.tolist(), [2, 1, 0, 3])
+        self.assertTrue(np.isinf(distances[3]))
+
+    def test_nearest(self):
+        """Test k nearest obstacles sorted by distance."""
+        obstacles = self.index.nearest(lon=0.52, lat=0, k=3)
+        self.assertEqual([obstacle.obst_number for obstacle in obstacles], ["000005", "000006", "000004"])
+        self.assertEqual(obstacles[0].oas_code, "01")
+        self.assertLess(obstacles[0].distance_nm, obstacles[1].distance_nm)
+
+    def test_within(self):
+        """Test obstacles within radius and the tallest one."""
+        obstacles = self.index.within(lon=1, lat=0, radius_nm=13)
+        self.assertEqual({obstacle.obst_number for obstacle in obstacles},
+                         {"000008", "000009", "000010", "000011", "000012"})
+        self.assertEqual(tallest(obstacles).obst_number, "000012")
+        self.assertIsNone(tallest([]))
+
+    def test_refresh(self):
+        """Test changed and retired obstacles replace indexed ones, inserted obstacles are found."""
+        changed = datetime(2024, 10, 14)
+        self.index.rows[5] = obstacle_row("000005", 10, 10, "500", timestamp=changed)
+        self.index.rows[6] = obstacle_row("000006", 0.6, 0, "106", active=False, timestamp=changed)
+        self.index.rows.append(obstacle_row("000100", 0.51, 0, "999", timestamp=changed))
+        self.assertEqual(self.index.refresh(db_utils=None), 3)
+        self.assertEqual(len(self.index), 20)
+
+        obstacles = self.index.nearest(lon=0.52, lat=0, k=3)
+        self.assertEqual([obstacle.obst_number for obstacle in obstacles], ["000100", "000004", "000007"])
+        self.assertEqual(self.index.nearest(lon=10, lat=10)[0].amsl, 500)
+        self.assertEqual(self.index.refresh(db_utils=None), 0)
+
+    def test_refresh_rebuild(self):
+        """Test the tree is rebuilt when most of obstacles changed."""
+        changed = datetime(2024, 10, 14)
+        self.index.rows = [obstacle_row(f"{i:06d}", i / 10, 1, "100", timestamp=changed) for i in range(2000)]
+        self.index.refresh(db_utils=None)
+        self.assertEqual(len(self.index), 2000)
+        self.assertEqual(self.index.nearest(lon=0, lat=1)[0].obst_number, "000000")
+
+
+if __name__ == "__main__":
+    unittest.main()
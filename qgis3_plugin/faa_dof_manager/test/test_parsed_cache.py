@@ -0,0 +1,108 @@
+# coding=utf-8
+"""Prepared DOF data cache test."""
+
+__author__ = '@'
+__date__ = '2024-10-13'
+__copyright__ = 'Copyright 2024, Paweł Strzelewicz'
+
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from faa_dof_manager import parsed_cache
+from faa_dof_manager.import_log import file_checksum
+from faa_dof_manager.load_dof import get_report_file
+from faa_dof_manager.parsed_cache import cached_chunks
+from faa_dof_manager.types import ImportStats
+
+
+@unittest.skipIf(parsed_cache.pa is None, "pyarrow not installed")
+class ParsedCacheTest(unittest.TestCase):
+    """Test prepared data is cached and read back unchanged, with import statistics and reports."""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        self.addCleanup(os.chdir, cwd)
+        self.path = self.tmp_dir / "DOF.dat"
+        self.path.write_text("data", encoding="utf-8")
+        self.cache_dir = self.tmp_dir / "cache"
+        self.chunks = [
+            pd.DataFrame({"city": [np.nan, "HOUSTON"], "agl": pd.array([None, 120], dtype="Int64")}),
+            pd.DataFrame({"city": ["DALLAS"], "agl": pd.array([35], dtype="Int64")}, index=[2]),
+        ]
+        self.prepared = 0
+
+    def prepare_chunks(self, stats):
+        """Prepare file (count preparing), one row rejected"""
+        self.prepared += 1
+        get_report_file("number").write_text("city,agl\nMOBILE,0X100\n", encoding="utf-8")
+        stats.rows_read, stats.rows_loaded, stats.rows_rejected = 4, 3, {"number": 1}
+        return iter(self.chunks)
+
+    def get_chunks(self, revision_date=date(2019, 9, 8), obstacle_type_mapping=None, stats=None):
+        """Return chunks through cache"""
+        stats = stats or ImportStats()
+        return list(cached_chunks(source_hash=file_checksum(self.path),
+                                  file_type="dat",
+                                  revision_date=revision_date,
+                                  obstacle_type_mapping=obstacle_type_mapping or {"TOWER": 1},
+                                  cache_dir=self.cache_dir,
+                                  prepare_chunks=lambda: self.prepare_chunks(stats),
+                                  chunk_size=2,
+                                  stats=stats,
+                                  report_file=get_report_file))
+
+    def test_cached_chunks_same_as_prepared(self):
+        """Test the same file is prepared once and cached chunks are the same as prepared chunks."""
+        self.get_chunks()
+        cached = self.get_chunks()
+        self.assertEqual(self.prepared, 1)
+        self.assertEqual(len(cached), len(self.chunks))
+        for actual, expected in zip(cached, self.chunks):
+            pd.testing.assert_frame_equal(actual, expected)
+
+    def test_cached_stats_and_reports(self):
+        """Test import statistics and reports of rejected rows are restored from cache."""
+        self.get_chunks()
+        get_report_file("number").unlink()
+        stats = ImportStats()
+        self.get_chunks(stats=stats)
+        self.assertEqual(self.prepared, 1)
+        self.assertEqual((stats.rows_read, stats.rows_loaded, stats.rows_rejected), (4, 3, {"number": 1}))
+        self.assertEqual(get_report_file("number").read_text(encoding="utf-8"), "city,agl\nMOBILE,0X100\n")
+
+    def test_changed_file_or_settings_prepared(self):
+        """Test file is prepared again when file content, settings revision or obstacle type mapping changed."""
+        self.get_chunks()
+        self.get_chunks(revision_date=date(2024, 1, 1))
+        self.get_chunks(obstacle_type_mapping={"TOWER": 2})
+        self.path.write_text("changed data", encoding="utf-8")
+        self.get_chunks()
+        self.assertEqual(self.prepared, 4)
+
+    def test_partially_read_not_cached(self):
+        """Test data is not cached when not all chunks were read (e.g. import canceled)."""
+        stats = ImportStats()
+        chunks = cached_chunks(source_hash=file_checksum(self.path),
+                               file_type="dat",
+                               revision_date=date(2019, 9, 8),
+                               obstacle_type_mapping={"TOWER": 1},
+                               cache_dir=self.cache_dir,
+                               prepare_chunks=lambda: self.prepare_chunks(stats),
+                               chunk_size=2,
+                               stats=stats,
+                               report_file=get_report_file)
+        next(chunks)
+        chunks.close()
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
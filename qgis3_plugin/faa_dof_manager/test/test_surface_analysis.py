@@ -0,0 +1,81 @@
+# coding=utf-8
+"""Obstacle clearance surface analysis test."""
+
+__author__ = '@'
+__date__ = '2024-10-13'
+__copyright__ = 'Copyright 2024, Paweł Strzelewicz'
+
+import unittest
+
+import numpy as np
+
+from faa_dof_manager.surface_analysis import (
+    FT,
+    ObstacleHeights,
+    find_penetrations,
+    local_coordinates,
+    surface_heights
+)
+from faa_dof_manager.obstacle_index import EARTH_RADIUS
+from faa_dof_manager.types import Surface
+
+# Feet in one degree of latitude
+DEGREE = np.radians(1) * EARTH_RADIUS / FT
+
+
+def approach_surface(bearing=0.0):
+    """Return approach surface: 200 ft from origin at 100 ft elevation, 50:1 slope, 10000 ft long"""
+    return Surface(id=1, name="RWY 36 approach", lon=-87.0, lat=32.0, bearing=bearing, elevation=100,
+                   start_distance=200, length=10000, inner_half_width=500, divergence=0.15, slope=0.02)
+
+
+def point_at(surface, along, across):
+    """Return lon, lat of point at distance along/across north-bound centerline of the surface (feet)"""
+    return (surface.lon + across / DEGREE / np.cos(np.radians(surface.lat)),
+            surface.lat + along / DEGREE)
+
+
+class SurfaceAnalysisTest(unittest.TestCase):
+    """Test surface height and penetration evaluation."""
+
+    def test_local_coordinates(self):
+        """Test distances along and across centerline."""
+        surface = approach_surface()
+        along, across = local_coordinates(surface, *point_at(surface, 5000, -300))
+        self.assertAlmostEqual(float(along[0]), 5000, delta=1)
+        self.assertAlmostEqual(float(across[0]), -300, delta=1)
+        # The same point, centerline pointing east: point is behind and to the left of the centerline
+        along, across = local_coordinates(approach_surface(bearing=90), *point_at(surface, 5000, -300))
+        self.assertAlmostEqual(float(along[0]), -300, delta=1)
+        self.assertAlmostEqual(float(across[0]), -5000, delta=1)
+
+    def test_surface_heights(self):
+        """Test surface extent (trapezoid) and height."""
+        surface = approach_surface()
+        lon, lat = zip(point_at(surface, 1200, 0),      # on centerline
+                       point_at(surface, 1200, 640),    # inside, half width at 1000 ft is 650 ft
+                       point_at(surface, 1200, 660),    # outside laterally
+                       point_at(surface, 100, 0),       # before inner edge
+                       point_at(surface, 10300, 0))     # after outer edge
+        inside, heights = surface_heights(surface, np.array(lon), np.array(lat))
+        self.assertEqual(inside.tolist(), [True, True, False, False, False])
+        self.assertAlmostEqual(float(heights[0]), 120, delta=0.1)
+
+    def test_find_penetrations(self):
+        """Test obstacles above surface are found, including vertical tolerance in obstacle height."""
+        surface = approach_surface()
+        points = [point_at(surface, 1200, 0), point_at(surface, 6200, 100), point_at(surface, 6200, 5000),
+                  (surface.lon + 1, surface.lat)]
+        lon, lat = zip(*points)
+        obstacles = ObstacleHeights(oas_code=np.array(["01"] * 4),
+                                    obst_number=np.array(["000001", "000002", "000003", "000004"]),
+                                    lon=np.array(lon),
+                                    lat=np.array(lat),
+                                    height=np.array([119.0, 230.0, 900.0, 900.0]))
+        positions, heights = find_penetrations(surface, obstacles)
+        self.assertEqual(obstacles.obst_number[positions].tolist(), ["000002"])
+        self.assertAlmostEqual(float(heights[0]), 220, delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,16 @@
 """Custom data types used in the plugin"""
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from functools import cached_property
+from pathlib import Path
+from typing import Callable
+
+# Import progress callback: progress(stage, done), stages: parse, validate, upload (done: rows read),
+# check (done: rows checked), merge (done: merge steps completed)
+# Callback can cancel import by raising ImportCanceledError, database changes are rolled back then
+ProgressCallback = Callable[[str, int], None]
 
 
 @dataclass(frozen=True)
@@ -9,3 +20,88 @@ class DBConnectionSettings:
     database: str
     user: str
     password: str
+
+
+@dataclass(frozen=True)
+class DOFSource:
+    """DOF file identification, compared with the last import (dof.import_log).
+    Checksum of the file is computed when first used, not when file size and currency date are enough
+    to tell the file from the last imported file.
+    """
+    path: Path
+    file_type: str
+    file_size: int
+    currency_date: date | None
+
+    @cached_property
+    def source_hash(self) -> str:
+        """SHA-256 checksum of the file"""
+        from .import_log import file_checksum  # pylint: disable=import-outside-toplevel
+
+        return file_checksum(self.path)
+
+
+@dataclass
+class ImportStats:
+    """DOF import row counts aggregated across all chunks of the file"""
+    rows_read: int = 0
+    rows_loaded: int = 0
+    rows_rejected: dict[str, int] = field(default_factory=dict)
+    # Obstacles located outside boundary of their country/state (dof.import_location_mismatch)
+    location_mismatches: int = 0
+    source: DOFSource | None = None
+    # File was imported last time, import skipped
+    skipped: bool = False
+
+
+@dataclass
+class MergeStats:
+    """Result of merging imported DOF obstacles into obstacle table"""
+    inserted: int = 0
+    changed: int = 0
+    retired: int = 0
+    unchanged: int = 0
+
+
+@dataclass(frozen=True)
+class NearbyObstacle:
+    """Obstacle found by spatial query (ObstacleIndex), distance in nautical miles, heights in feet"""
+    oas_code: str
+    obst_number: str
+    lon: float
+    lat: float
+    amsl: float
+    agl: float | None
+    distance_nm: float
+
+
+@dataclass(frozen=True)
+class Surface:
+    """Obstacle clearance surface (dof.surface): sloped trapezoid along centerline (true bearing) from origin,
+    starting at start_distance with inner_half_width, widening by divergence per side, rising by slope.
+    Distances and elevation in feet
+    """
+    id: int
+    name: str
+    lon: float
+    lat: float
+    bearing: float
+    elevation: float
+    start_distance: float
+    length: float
+    inner_half_width: float
+    divergence: float
+    slope: float
+
+
+@dataclass
+class StatementTiming:
+    """Execution time of prepared statement (client side: execute and fetch)"""
+    calls: int = 0
+    total_seconds: float = 0
+    last_seconds: float = 0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean execution time"""
+        return self.total_seconds / self.calls if self.calls else 0